@@ -0,0 +1,193 @@
+"""
+Almacenamiento de media direccionado por contenido.
+
+Cada archivo subido se escribe en trozos a un temporal mientras se calcula su
+SHA-256 y luego se mueve a blobs/<2 primeros>/<hash><extensión>. Dos subidas
+de la misma foto terminan en el mismo archivo, y como el nombre depende solo
+del contenido, la URL nunca cambia de contenido y puede cachearse para siempre.
+
+BlobMedia lleva la cuenta de referencias:
+    - _save() asegura la fila del blob, pero no suma: el registro que lo usa
+      aún no está guardado y su transacción puede revertirse;
+    - post_save suma una referencia cuando un campo pasa a apuntar a un blob,
+      dentro de la misma transacción que guarda el registro;
+    - delete() resta una en lugar de borrar (otro registro puede usar el blob);
+    - las señales de este módulo llaman a delete() cuando se borra un registro
+      o se reemplaza su archivo, ya que Django no lo hace por sí solo.
+
+El comando `limpiar_media` borra del disco, por lotes, los blobs sin referencias.
+"""
+
+import hashlib
+import os
+import tempfile
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, models, transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.utils import timezone
+from django.views.static import serve
+
+PREFIJO = "blobs/"
+# Un año, el máximo habitual; "immutable" evita revalidaciones al recargar
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def es_blob(nombre):
+    return bool(nombre) and nombre.startswith(PREFIJO)
+
+
+def _blobs():
+    return apps.get_model("core", "BlobMedia")._base_manager
+
+
+class AlmacenamientoPorContenido(FileSystemStorage):
+    """FileSystemStorage que guarda por hash de contenido y cuenta referencias."""
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre final lo decide el contenido; no hace falta evitar colisiones
+        return name
+
+    def _save(self, name, content):
+        _, extension = os.path.splitext(name)
+        directorio_tmp = os.path.join(self.location, PREFIJO, "tmp")
+        os.makedirs(directorio_tmp, exist_ok=True)
+
+        sha = hashlib.sha256()
+        tamano = 0
+        descriptor, ruta_tmp = tempfile.mkstemp(dir=directorio_tmp)
+        try:
+            with os.fdopen(descriptor, "wb") as destino:
+                if hasattr(content, "seek"):
+                    content.seek(0)
+                for trozo in content.chunks():
+                    sha.update(trozo)
+                    destino.write(trozo)
+                    tamano += len(trozo)
+
+            digest = sha.hexdigest()
+            nombre = f"{PREFIJO}{digest[:2]}/{digest}{extension.lower()}"
+            # Primero la fila y después el archivo: si `limpiar_media` borró el
+            # blob entre medio, el os.replace lo vuelve a dejar en su lugar
+            self._registrar_blob(digest, nombre, tamano)
+            ruta = self.path(nombre)
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            # os.replace es atómico; si el blob ya existía se reemplaza por el mismo contenido
+            os.replace(ruta_tmp, ruta)
+            # mkstemp crea el temporal con 0600; el servidor web debe poder leerlo
+            os.chmod(ruta, self.file_permissions_mode or 0o644)
+        except BaseException:
+            if os.path.exists(ruta_tmp):
+                os.remove(ruta_tmp)
+            raise
+        return nombre
+
+    @staticmethod
+    def _registrar_blob(digest, nombre, tamano):
+        """
+        Crea la fila del blob con cero referencias si no existe. Renovar
+        _actualizado reinicia el período de gracia de `limpiar_media`.
+        """
+        ahora = timezone.now()
+        blobs = _blobs()
+        if blobs.filter(_hash=digest).update(_actualizado=ahora):
+            return
+        try:
+            with transaction.atomic():
+                blobs.create(_hash=digest, _nombre=nombre, _tamano=tamano, _referencias=0, _actualizado=ahora)
+        except IntegrityError:
+            # Otra subida del mismo contenido creó la fila entre medio
+            blobs.filter(_hash=digest).update(_actualizado=ahora)
+
+    def sumar_referencia(self, name):
+        """Un registro más usa el blob; lo llama la señal post_save."""
+        digest = os.path.splitext(os.path.basename(name))[0]
+        blob = _blobs().filter(_hash=digest)
+        if blob.update(_referencias=models.F("_referencias") + 1, _actualizado=timezone.now()):
+            return
+        # Nombre asignado a mano, o fila borrada por `limpiar_media` tras el _save()
+        self._registrar_blob(digest, name, self.size(name) if self.exists(name) else 0)
+        blob.update(_referencias=models.F("_referencias") + 1)
+
+    def delete(self, name):
+        if not es_blob(name):
+            # Archivos anteriores a este almacenamiento: se borran como siempre
+            return super().delete(name)
+        digest = os.path.splitext(os.path.basename(name))[0]
+        _blobs().filter(_hash=digest, _referencias__gt=0).update(
+            _referencias=models.F("_referencias") - 1, _actualizado=timezone.now()
+        )
+
+    def borrar_blob(self, name):
+        """
+        Borra físicamente el archivo (solo lo usa `limpiar_media`, tras confirmar
+        el borrado de la fila). Si una subida del mismo contenido volvió a crear
+        la fila entre medio, el archivo se conserva.
+        """
+        digest = os.path.splitext(os.path.basename(name))[0]
+        if not _blobs().filter(_hash=digest).exists():
+            super().delete(name)
+
+
+def servir_blob(request, path, document_root=None):
+    """Sirve media en desarrollo; los blobs con cabeceras de caché permanente."""
+    response = serve(request, path, document_root=document_root)
+    if es_blob(path):
+        response["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+# ========================
+# SEÑALES
+# ========================
+
+def _campos_archivo(modelo):
+    return [f for f in modelo._meta.concrete_fields if isinstance(f, models.FileField)]
+
+
+def _liberar(campo, nombre):
+    transaction.on_commit(lambda: campo.storage.delete(nombre))
+
+
+def recordar_archivos(sender, instance, **kwargs):
+    """Nombre de archivo con que se cargó el registro, para detectar reemplazos."""
+    instance._archivos_originales = {
+        campo.attname: instance.__dict__.get(campo.attname) for campo in _campos_archivo(sender)
+    }
+
+
+def contar_guardados(sender, instance, created, **kwargs):
+    """
+    Suma una referencia al blob nuevo de cada campo y libera el anterior si se
+    reemplazó. La suma va en la transacción del save: si se revierte, el blob
+    queda sin referencias y `limpiar_media` lo recoge.
+    """
+    originales = getattr(instance, "_archivos_originales", {})
+    for campo in _campos_archivo(sender):
+        anterior = None if created else originales.get(campo.attname)
+        actual = getattr(instance, campo.attname)
+        nombre_actual = actual.name if hasattr(actual, "name") else actual
+        if anterior != nombre_actual:
+            if es_blob(nombre_actual) and isinstance(campo.storage, AlmacenamientoPorContenido):
+                campo.storage.sumar_referencia(nombre_actual)
+            if anterior:
+                _liberar(campo, str(anterior))
+        originales[campo.attname] = nombre_actual
+    instance._archivos_originales = originales
+
+
+def liberar_borrados(sender, instance, **kwargs):
+    for campo in _campos_archivo(sender):
+        archivo = getattr(instance, campo.attname)
+        if archivo:
+            _liberar(campo, archivo.name)
+
+
+def conectar_senales():
+    """Conecta las señales a cada modelo de core que tenga campos de archivo."""
+    for modelo in apps.get_app_config("core").get_models():
+        if _campos_archivo(modelo):
+            post_init.connect(recordar_archivos, sender=modelo, weak=False)
+            post_save.connect(contar_guardados, sender=modelo, weak=False)
+            post_delete.connect(liberar_borrados, sender=modelo, weak=False)
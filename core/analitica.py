@@ -0,0 +1,103 @@
+"""
+Tiempos de resolución de reportes: percentiles p50/p90/p99 de las horas hasta
+'EnProceso' y hasta 'Resuelto', por categoría, por mes y por celda.
+
+Una sola consulta trae, por reporte, la categoría, el mes, la celda y las dos
+duraciones ya restadas en la base (values_list, sin instanciar modelos). El
+resto se hace con NumPy: las duraciones quedan en arreglos de horas y cada
+agrupación es un np.unique + un ordenamiento, sin recorrer reportes en Python.
+
+Los reportes fusionados se excluyen: su "resolución" es la fusión, no la
+atención del incidente. Los anteriores a los campos de fecha por transición
+no tienen duraciones y solo cuentan en `total`.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import DateField, F
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Reporte
+
+PERCENTILES = (50, 90, 99)
+
+
+def _horas(duraciones):
+    """timedelta o None → arreglo de horas con NaN donde no hubo transición."""
+    arreglo = np.array(duraciones, dtype="timedelta64[us]")
+    horas = arreglo.astype(np.float64) / 3_600_000_000
+    horas[np.isnat(arreglo)] = np.nan
+    return horas
+
+
+def _por_grupo(claves, horas):
+    """{clave: {n, p50, p90, p99}} de las horas válidas, agrupadas por clave."""
+    validas = ~np.isnan(horas)
+    claves, horas = claves[validas], horas[validas]
+    if not len(horas):
+        return {}
+    unicas, grupo = np.unique(claves, return_inverse=True)
+    orden = np.argsort(grupo, kind="stable")
+    # Índices donde cambia el grupo en el arreglo ordenado
+    cortes = np.flatnonzero(np.diff(grupo[orden])) + 1
+    resultado = {}
+    for clave, valores in zip(unicas, np.split(horas[orden], cortes)):
+        p50, p90, p99 = np.percentile(valores, PERCENTILES)
+        resultado[str(clave)] = {"n": len(valores), "p50": float(p50), "p90": float(p90), "p99": float(p99)}
+    return resultado
+
+
+def _tabla(claves, a_proceso, a_resuelto, etiquetas=None):
+    unicas, totales = np.unique(claves, return_counts=True)
+    proceso = _por_grupo(claves, a_proceso)
+    resuelto = _por_grupo(claves, a_resuelto)
+    return [
+        {
+            "clave": str(clave),
+            "etiqueta": (etiquetas or {}).get(str(clave), str(clave)),
+            "total": int(total),
+            "en_proceso": proceso.get(str(clave)),
+            "resuelto": resuelto.get(str(clave)),
+        }
+        for clave, total in zip(unicas, totales)
+    ]
+
+
+def tiempos_resolucion(meses=12, precision=6):
+    """
+    Tablas por categoría, mes y celda (prefijo de `precision` caracteres del
+    geohash) de los reportes creados en los últimos `meses` meses.
+    Cada fila: clave, etiqueta, total y, para en_proceso y resuelto,
+    {n, p50, p90, p99} (reportes con esa transición y percentiles en horas) o None.
+    """
+    desde = timezone.now() - timedelta(days=30 * meses)
+    filas = list(
+        Reporte.objects.filter(_fecha__gte=desde, _duplicado_de__isnull=True)
+        .annotate(
+            mes=TruncMonth("_fecha", output_field=DateField()),
+            a_proceso=F("_fecha_en_proceso") - F("_fecha"),
+            a_resuelto=F("_fecha_resuelto") - F("_fecha"),
+        )
+        .order_by()
+        .values_list("_categoria", "mes", "_celda", "a_proceso", "a_resuelto")
+    )
+    if not filas:
+        return {"total": 0, "categorias": [], "meses": [], "celdas": []}
+
+    categorias, meses_, celdas, a_proceso, a_resuelto = zip(*filas)
+    categorias = np.array(categorias)
+    meses_ = np.datetime_as_string(np.array(meses_, dtype="datetime64[M]"))
+    # Un dtype de `precision` caracteres recorta cada geohash a su prefijo
+    celdas = np.array(celdas, dtype=f"U{precision}")
+    a_proceso, a_resuelto = _horas(a_proceso), _horas(a_resuelto)
+
+    con_celda = celdas != ""
+    tabla_celdas = _tabla(celdas[con_celda], a_proceso[con_celda], a_resuelto[con_celda])
+    return {
+        "total": len(filas),
+        "categorias": _tabla(categorias, a_proceso, a_resuelto, dict(Reporte.CATEGORIAS)),
+        "meses": _tabla(meses_, a_proceso, a_resuelto),
+        "celdas": sorted(tabla_celdas, key=lambda f: -f["total"]),
+    }
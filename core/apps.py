@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Registra las señales que mantienen el feed cacheado de publicaciones
+        from . import feed  # noqa: F401
+        # Libera las referencias a blobs de media al borrar o reemplazar archivos
+        from .almacenamiento import conectar_senales
+        conectar_senales()
+        # Descarta los conteos cacheados de los listados paginados al escribir
+        from . import paginacion
+        from .models import Reporte, Multa, BotonPanico
+        paginacion.conectar_senales(Reporte, Multa, BotonPanico)
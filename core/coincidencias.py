@@ -0,0 +1,227 @@
+"""
+Emparejamiento entre objetos perdidos y objetos encontrados.
+
+Cada par (perdido, encontrado) abierto del mismo condominio recibe un puntaje:
+
+    puntaje = PESO_TEXTO · coseno(tfidf_perdido, tfidf_encontrado)
+            + PESO_FECHA · exp(-|días entre ambos| / ESCALA_DIAS)
+
+El texto es título (con doble peso) + descripción. Todo el cálculo se hace con
+matrices de NumPy: la similitud de todos contra todos es un solo producto
+P × Eᵀ sobre filas TF-IDF normalizadas.
+
+Se guardan en CoincidenciaObjeto los TOP_K mejores candidatos de cada objeto.
+Al registrar un objeto nuevo solo se calcula su fila contra los abiertos del
+tipo contrario (actualizar_coincidencias); el comando
+`recalcular_coincidencias` rehace la matriz completa. Las fotos casi idénticas
+se agregan aparte con agregar_por_imagen().
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+
+from .models import ObjetoPerdido, CoincidenciaObjeto
+
+TOP_K = 5
+PUNTAJE_MINIMO = 0.2
+PESO_TEXTO = 0.8
+PESO_FECHA = 0.2
+ESCALA_DIAS = 7.0
+
+PALABRAS_VACIAS = {
+    "con", "sin", "del", "las", "los", "una", "uno", "unos", "unas", "para", "por",
+    "que", "como", "muy", "mas", "pero", "esta", "este", "estaba", "cerca", "color",
+    "mis", "tus", "sus", "perdi", "perdio", "encontre", "encontro",
+}
+
+_RE_PALABRA = re.compile(r"[a-z0-9ñ]+")
+
+
+# ========================
+# TEXTO
+# ========================
+
+def tokenizar(texto):
+    """Minúsculas, sin tildes, sin palabras vacías ni tokens de menos de 3 letras."""
+    texto = unicodedata.normalize("NFKD", texto.lower().replace("ñ", "\0"))
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).replace("\0", "ñ")
+    return [t for t in _RE_PALABRA.findall(texto) if len(t) > 2 and t not in PALABRAS_VACIAS]
+
+
+def _texto(objeto):
+    return f"{objeto._titulo} {objeto._titulo} {objeto._descripcion}"
+
+
+def matriz_tfidf(documentos):
+    """
+    Filas TF-IDF normalizadas (norma L2) de una lista de textos.
+    TF sublineal (1 + log tf) e IDF suavizado, como en la definición habitual.
+    """
+    tokens = [tokenizar(d) for d in documentos]
+    vocabulario = {}
+    filas, columnas = [], []
+    for i, palabras in enumerate(tokens):
+        for palabra in palabras:
+            filas.append(i)
+            columnas.append(vocabulario.setdefault(palabra, len(vocabulario)))
+
+    matriz = np.zeros((len(documentos), max(len(vocabulario), 1)), dtype=np.float32)
+    np.add.at(matriz, (np.array(filas, dtype=np.intp), np.array(columnas, dtype=np.intp)), 1)
+
+    presentes = matriz > 0
+    matriz[presentes] = 1 + np.log(matriz[presentes])
+    df = presentes.sum(axis=0)
+    idf = np.log((1 + len(documentos)) / (1 + df)) + 1
+    matriz *= idf
+
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    normas[normas == 0] = 1
+    return matriz / normas
+
+
+# ========================
+# PUNTAJES
+# ========================
+
+def matriz_puntajes(perdidos, hallados):
+    """Matriz (len(perdidos) × len(hallados)) de puntajes entre 0 y 1."""
+    if not perdidos or not hallados:
+        return np.zeros((len(perdidos), len(hallados)), dtype=np.float32)
+
+    tfidf = matriz_tfidf([_texto(o) for o in perdidos] + [_texto(o) for o in hallados])
+    texto = tfidf[:len(perdidos)] @ tfidf[len(perdidos):].T
+
+    dias_p = np.array([o._fecha.timestamp() for o in perdidos]) / 86400
+    dias_h = np.array([o._fecha.timestamp() for o in hallados]) / 86400
+    cercania = np.exp(-np.abs(dias_p[:, None] - dias_h[None, :]) / ESCALA_DIAS)
+
+    # Sin ninguna palabra en común la fecha por sí sola no es una coincidencia
+    return np.where(texto > 0, PESO_TEXTO * texto + PESO_FECHA * cercania, 0)
+
+
+def _abiertos(condominio_id, tipo):
+    return list(
+        ObjetoPerdido._base_manager
+        .filter(_condominio_id=condominio_id, _tipo=tipo, _encontrado=False)
+        .only("pk", "_titulo", "_descripcion", "_fecha", "_condominio")
+    )
+
+
+def _mejores(puntajes, k):
+    """Índices de los k mayores puntajes sobre el mínimo, de mayor a menor."""
+    if puntajes.size == 0:
+        return []
+    k = min(k, puntajes.size)
+    candidatos = np.argpartition(-puntajes, k - 1)[:k]
+    candidatos = candidatos[np.argsort(-puntajes[candidatos])]
+    return [int(i) for i in candidatos if puntajes[i] >= PUNTAJE_MINIMO]
+
+
+def _guardar(condominio_id, pares):
+    """Inserta o actualiza los pares {(perdido_id, hallado_id): puntaje}."""
+    if not pares:
+        return
+    CoincidenciaObjeto._base_manager.bulk_create(
+        [
+            CoincidenciaObjeto(
+                _perdido_id=p, _hallado_id=h, _puntaje=puntaje, _condominio_id=condominio_id
+            )
+            for (p, h), puntaje in pares.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["_perdido", "_hallado"],
+        update_fields=["_puntaje", "_creado"],
+    )
+
+
+# ========================
+# API
+# ========================
+
+def actualizar_coincidencias(objeto, k=TOP_K):
+    """
+    Calcula solo la fila del objeto recién registrado contra los abiertos del
+    tipo contrario y guarda sus k mejores candidatos. Retorna cuántos guardó.
+    """
+    if objeto._encontrado:
+        return 0
+    contrario = "perdido" if objeto.es_hallazgo else "encontrado"
+    otros = _abiertos(objeto._condominio_id, contrario)
+
+    if objeto.es_hallazgo:
+        fila = matriz_puntajes(otros, [objeto])[:, 0]
+    else:
+        fila = matriz_puntajes([objeto], otros)[0]
+
+    pares = {}
+    for i in _mejores(fila, k):
+        clave = (otros[i].pk, objeto.pk) if objeto.es_hallazgo else (objeto.pk, otros[i].pk)
+        pares[clave] = float(fila[i])
+    with transaction.atomic():
+        _guardar(objeto._condominio_id, pares)
+    return len(pares)
+
+
+def recalcular_condominio(condominio_id, k=TOP_K):
+    """
+    Rehace todas las coincidencias abiertas de un condominio con la matriz
+    completa: los k mejores de cada fila (perdidos) y de cada columna (encontrados).
+    """
+    perdidos = _abiertos(condominio_id, "perdido")
+    hallados = _abiertos(condominio_id, "encontrado")
+    puntajes = matriz_puntajes(perdidos, hallados)
+
+    pares = {}
+    for i in range(len(perdidos)):
+        for j in _mejores(puntajes[i], k):
+            pares[(perdidos[i].pk, hallados[j].pk)] = float(puntajes[i, j])
+    for j in range(len(hallados)):
+        for i in _mejores(puntajes[:, j], k):
+            pares[(perdidos[i].pk, hallados[j].pk)] = float(puntajes[i, j])
+
+    with transaction.atomic():
+        CoincidenciaObjeto._base_manager.filter(_condominio_id=condominio_id).delete()
+        _guardar(condominio_id, pares)
+    return len(pares)
+
+
+def agregar_por_imagen(objeto, similares):
+    """
+    Registra como coincidencia cada objeto abierto del tipo contrario cuya foto
+    es casi idéntica (ver core/imagenes.py). El puntaje baja con la distancia
+    de Hamming y reemplaza al de texto, porque una foto igual es más confiable.
+    """
+    pares = {}
+    for otro, distancia in similares:
+        if otro._encontrado or otro._tipo == objeto._tipo:
+            continue
+        clave = (otro.pk, objeto.pk) if objeto.es_hallazgo else (objeto.pk, otro.pk)
+        pares[clave] = 1 - distancia / 64
+    with transaction.atomic():
+        _guardar(objeto._condominio_id, pares)
+    return len(pares)
+
+
+def coincidencias_de(usuario, k=TOP_K):
+    """
+    {objeto_id: [(candidato, puntaje), ...]} para los objetos abiertos del usuario,
+    con hasta k candidatos abiertos cada uno, de mayor a menor puntaje.
+    """
+    filas = (
+        CoincidenciaObjeto.objects
+        .filter(_perdido___encontrado=False, _hallado___encontrado=False)
+        .filter(Q(_perdido___usuario=usuario) | Q(_hallado___usuario=usuario))
+        .select_related("_perdido___usuario", "_hallado___usuario")
+        .order_by("-_puntaje")
+    )
+    resultado = {}
+    for c in filas:
+        if c._perdido._usuario_id == usuario.pk:
+            resultado.setdefault(c._perdido_id, []).append((c._hallado, c._puntaje))
+        if c._hallado._usuario_id == usuario.pk:
+            resultado.setdefault(c._hallado_id, []).append((c._perdido, c._puntaje))
+    return {pk: candidatos[:k] for pk, candidatos in resultado.items()}
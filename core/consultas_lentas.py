@@ -0,0 +1,234 @@
+"""
+Registro de consultas SQL lentas con su plan de ejecución.
+
+ConsultasLentasMiddleware (core/middleware.py) envuelve cada conexión con
+medir() durante la request. Toda sentencia que tarde más de
+CONSULTAS_LENTAS_MS se escribe como una línea JSON en CONSULTAS_LENTAS_LOG
+(archivo rotativo) con:
+
+    huella    hash del SQL normalizado (literales, parámetros y listas IN
+              reemplazados), así la misma consulta con otros valores se agrupa
+    sql       el SQL normalizado
+    params    los parámetros sin datos personales: los textos se reemplazan por
+              su largo y las sentencias sobre sesiones y usuarios no guardan
+              ninguno (ver _parametros)
+    vista     nombre de la URL de la request (o su ruta, si aún no se resolvió)
+    origen    el frame más interno de core/ que lanzó la consulta
+    plan      EXPLAIN (EXPLAIN QUERY PLAN en SQLite), solo la primera vez que
+              este proceso ve la huella
+
+ranking() lee el log (incluidos los archivos rotados) y agrupa por huella
+para la página de administración.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import traceback
+from contextlib import nullcontext
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+DIRECTORIO_CORE = str(Path(__file__).resolve().parent)
+# Frames de core que envuelven las consultas pero no las originan
+_SIN_ORIGEN = (__file__, str(Path(DIRECTORIO_CORE) / "middleware.py"))
+MAXIMO_PARAMETRO = 200
+MAXIMO_HUELLAS_EXPLICADAS = 10_000
+
+_RE_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_RE_ESPACIOS = re.compile(r"\s+")
+# Tablas con sesiones, contraseñas, correos y datos de contacto
+_RE_TABLAS_SENSIBLES = re.compile(r'\b"?(django_session|auth_\w+|core_usuario\w*|core_perfilusuario)"?', re.I)
+
+_explicadas = set()
+_local = threading.local()
+
+
+# ========================
+# NORMALIZACIÓN
+# ========================
+
+def normalizar(sql):
+    """SQL sin valores concretos: 'a' → ?, 42 → ?, %s → ?, IN (?, ?, ?) → IN (...)."""
+    sql = _RE_TEXTO.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _RE_NUMERO.sub("?", sql)
+    sql = _RE_LISTA.sub("(...)", sql)
+    return _RE_ESPACIOS.sub(" ", sql).strip()
+
+
+def huella(sql_normalizado):
+    return hashlib.sha1(sql_normalizado.encode()).hexdigest()[:12]
+
+
+def _parametro(valor):
+    # Un texto puede ser una clave de sesión, un correo o un nombre: solo su largo
+    if isinstance(valor, (str, bytes, memoryview)):
+        return f"<{type(valor).__name__} de {len(valor)}>"
+    return repr(valor)[:MAXIMO_PARAMETRO]
+
+
+def _parametros(sql, params):
+    if params is None or _RE_TABLAS_SENSIBLES.search(sql):
+        return None
+    if isinstance(params, dict):
+        params = params.values()
+    return [_parametro(p) for p in params]
+
+
+def _origen():
+    """'core/views.py:123 en get_queryset' del frame de core más cercano a la consulta."""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(DIRECTORIO_CORE) and frame.filename not in _SIN_ORIGEN:
+            relativo = frame.filename[len(DIRECTORIO_CORE) - len("core"):]
+            return f"{relativo}:{frame.lineno} en {frame.name}"
+    return None
+
+
+# ========================
+# PLAN DE EJECUCIÓN
+# ========================
+
+def _explicar(connection, sql, params):
+    """
+    Plan de la consulta como lista de líneas, o None si no se pudo obtener.
+    Fuera de SQLite corre en un savepoint: un EXPLAIN fallido no deja abortada
+    la transacción de la request (PostgreSQL rechaza todo lo que siga).
+    """
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    sqlite = connection.vendor == "sqlite"
+    prefijo = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+    _local.explicando = True
+    try:
+        # EXPLAIN QUERY PLAN no ejecuta la consulta ni aborta la transacción si falla
+        savepoint = nullcontext() if sqlite else transaction.atomic(using=connection.alias)
+        with savepoint, connection.cursor() as cursor:
+            cursor.execute(prefijo + sql, params)
+            filas = cursor.fetchall()
+        if sqlite:
+            # (id, padre, no usado, detalle): el detalle basta para leer el plan
+            return [fila[-1] for fila in filas]
+        return [" ".join(str(c) for c in fila) for fila in filas]
+    except Exception as e:
+        return [f"no se pudo obtener el plan: {e}"]
+    finally:
+        _local.explicando = False
+
+
+# ========================
+# LOG
+# ========================
+
+_logger = None
+_lock_logger = threading.Lock()
+
+
+def logger():
+    """Logger con archivo rotativo propio; se crea al registrar la primera consulta."""
+    global _logger
+    with _lock_logger:
+        if _logger is None:
+            ruta = Path(settings.CONSULTAS_LENTAS_LOG)
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            manejador = RotatingFileHandler(
+                ruta, maxBytes=settings.CONSULTAS_LENTAS_BYTES, backupCount=5, encoding="utf-8"
+            )
+            manejador.setFormatter(logging.Formatter("%(message)s"))
+            _logger = logging.getLogger("vizinho.consultas_lentas")
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+            _logger.addHandler(manejador)
+        return _logger
+
+
+def registrar(connection, sql, params, duracion_ms, vista):
+    normalizado = normalizar(sql)
+    clave = huella(normalizado)
+    entrada = {
+        "fecha": timezone.now().isoformat(),
+        "ms": round(duracion_ms, 2),
+        "huella": clave,
+        "sql": normalizado,
+        "params": _parametros(sql, params),
+        "vista": vista,
+        "origen": _origen(),
+        "base": connection.alias,
+    }
+    if clave not in _explicadas and len(_explicadas) < MAXIMO_HUELLAS_EXPLICADAS:
+        _explicadas.add(clave)
+        entrada["plan"] = _explicar(connection, sql, params)
+    logger().info(json.dumps(entrada, ensure_ascii=False, default=str))
+
+
+def medidor(connection, request):
+    """execute_wrapper que registra las sentencias lentas de esta conexión."""
+    umbral = settings.CONSULTAS_LENTAS_MS
+
+    def medir(execute, sql, params, many, context):
+        if getattr(_local, "explicando", False):
+            return execute(sql, params, many, context)
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+            if duracion_ms >= umbral:
+                ruta = request.resolver_match
+                vista = ruta.view_name if ruta is not None else request.path
+                # En executemany params es una lista de filas; el plan no aplica
+                registrar(connection, sql, None if many else params, duracion_ms, vista)
+
+    return medir
+
+
+# ========================
+# RANKING
+# ========================
+
+def ranking(limite=50):
+    """Huellas ordenadas por tiempo total, leyendo el log y sus archivos rotados."""
+    ruta = Path(settings.CONSULTAS_LENTAS_LOG)
+    archivos = [ruta] + [ruta.with_name(f"{ruta.name}.{i}") for i in range(1, 6)]
+    grupos = {}
+    for archivo in archivos:
+        if not archivo.exists():
+            continue
+        with archivo.open(encoding="utf-8") as lineas:
+            for linea in lineas:
+                try:
+                    entrada = json.loads(linea)
+                except ValueError:
+                    continue
+                grupo = grupos.setdefault(entrada["huella"], {
+                    "huella": entrada["huella"], "sql": entrada["sql"], "veces": 0,
+                    "total_ms": 0.0, "maximo_ms": 0.0, "vistas": set(), "origenes": set(),
+                    "plan": None, "ultima": entrada["fecha"], "params": entrada["params"],
+                })
+                grupo["veces"] += 1
+                grupo["total_ms"] += entrada["ms"]
+                if entrada["ms"] >= grupo["maximo_ms"]:
+                    grupo["maximo_ms"] = entrada["ms"]
+                    grupo["params"] = entrada["params"]
+                grupo["vistas"].add(entrada["vista"])
+                if entrada.get("origen"):
+                    grupo["origenes"].add(entrada["origen"])
+                if entrada.get("plan"):
+                    grupo["plan"] = entrada["plan"]
+                grupo["ultima"] = max(grupo["ultima"], entrada["fecha"])
+
+    resultado = sorted(grupos.values(), key=lambda g: -g["total_ms"])[:limite]
+    for grupo in resultado:
+        grupo["promedio_ms"] = grupo["total_ms"] / grupo["veces"]
+        grupo["vistas"] = sorted(grupo["vistas"])
+        grupo["origenes"] = sorted(grupo["origenes"])
+    return resultado
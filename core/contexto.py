@@ -0,0 +1,142 @@
+"""
+Contexto del request en curso compartido con la capa de modelos.
+
+Los managers no tienen acceso al request, así que el condominio activo se guarda
+en una ContextVar: el middleware la fija al inicio de cada request y la limpia al
+final. Al ser ContextVar (y no una variable global o de hilo) funciona igual en
+WSGI, en ASGI y dentro de sync_to_async, que copia el contexto al hilo de trabajo.
+"""
+
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+# Condominio de un request sin acceso a ninguno (anónimo, o usuario al que aún no
+# se le asignó condominio). Ningún condominio tiene id 0, así que los managers
+# filtran por él sin casos especiales y no devuelven filas: se falla cerrado.
+SIN_CONDOMINIO = 0
+
+_condominio_actual = ContextVar("condominio_actual", default=None)
+
+
+def condominio_actual():
+    """
+    Id del condominio activo, SIN_CONDOMINIO, o None si no hay filtro. None solo
+    se usa para superusuarios sin condominio y para comandos (sin request).
+    """
+    return _condominio_actual.get()
+
+
+def activar_condominio(condominio_id):
+    """Fija el condominio activo; retorna el token para restaurar el anterior."""
+    return _condominio_actual.set(condominio_id)
+
+
+def restaurar_condominio(token):
+    _condominio_actual.reset(token)
+
+
+@contextmanager
+def usar_condominio(condominio):
+    """
+    Ejecuta un bloque con el condominio indicado (instancia o id).
+    Útil en comandos y tareas en segundo plano, donde no hay request.
+    """
+    condominio_id = getattr(condominio, "pk", condominio)
+    token = activar_condominio(condominio_id)
+    try:
+        yield
+    finally:
+        restaurar_condominio(token)
+
+
+# ========================
+# RÉPLICA DE LECTURA
+# ========================
+
+# Solo las lecturas marcadas explícitamente (listados, dashboards) van a la réplica
+_lecturas_en_replica = ContextVar("lecturas_en_replica", default=False)
+# Lectura desde la primaria del request en curso. ReplicaMiddleware la abre y la
+# cierra con token/reset; fuera de un request (comandos, hilos) no hay estado y
+# una escritura no deja nada fijado. Es un objeto mutable a propósito:
+# sync_to_async copia el contexto al hilo de trabajo, pero la copia apunta al
+# mismo objeto, así una escritura hecha allí también cuenta para el request.
+_primaria_request = ContextVar("primaria_request", default=None)
+
+
+class _PrimariaRequest:
+    def __init__(self, forzada):
+        self.forzada = forzada
+
+
+def lecturas_en_replica():
+    estado = _primaria_request.get()
+    return _lecturas_en_replica.get() and not (estado is not None and estado.forzada)
+
+
+@contextmanager
+def en_replica():
+    """Envía a la réplica las lecturas del bloque (si hay réplica configurada)."""
+    token = _lecturas_en_replica.set(True)
+    try:
+        yield
+    finally:
+        _lecturas_en_replica.reset(token)
+
+
+def forzar_primaria(valor=True):
+    """Abre el estado de lectura del request; retorna el token para restaurar."""
+    return _primaria_request.set(_PrimariaRequest(valor))
+
+
+def restaurar_primaria(token):
+    _primaria_request.reset(token)
+
+
+def marcar_escritura():
+    """Tras una escritura, el resto del request lee de la primaria."""
+    estado = _primaria_request.get()
+    if estado is not None:
+        estado.forzada = True
+
+
+# ========================
+# MEDIDORES DE SQL
+# ========================
+
+# Los execute_wrapper de Django son por conexión, y las conexiones son por hilo:
+# un wrapper instalado en el hilo del request no ve las consultas que
+# DashboardService._en_paralelo lanza en hilos del pool. Por eso los middlewares
+# registran aquí una fábrica conexión -> wrapper, y el hilo de trabajo (que
+# recibe una copia del contexto) la vuelve a instalar sobre sus propias conexiones.
+_medidores_sql = ContextVar("medidores_sql", default=())
+
+
+@contextmanager
+def medir_sql(fabrica):
+    """
+    Instala fabrica(conexion) como execute_wrapper en todas las conexiones del
+    hilo actual y la deja registrada para los hilos de trabajo del request.
+    """
+    token = _medidores_sql.set(_medidores_sql.get() + (fabrica,))
+    try:
+        with _instalar((fabrica,)):
+            yield
+    finally:
+        _medidores_sql.reset(token)
+
+
+def medidores_en_hilo():
+    """Reinstala en el hilo actual los medidores registrados por el request."""
+    return _instalar(_medidores_sql.get())
+
+
+@contextmanager
+def _instalar(fabricas):
+    with ExitStack() as pila:
+        for fabrica in fabricas:
+            for alias in connections:
+                conexion = connections[alias]
+                pila.enter_context(conexion.execute_wrapper(fabrica(conexion)))
+        yield
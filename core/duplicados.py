@@ -0,0 +1,218 @@
+"""
+Detección de reportes casi duplicados con MinHash + LSH.
+
+Cada reporte abierto se resume en una firma MinHash de NUM_HASHES enteros
+calculada sobre sus shingles (pares de palabras consecutivas, más las palabras
+sueltas) de título + descripción + ubicación. La fracción de posiciones iguales
+entre dos firmas estima la similitud de Jaccard entre ambos textos.
+
+Las firmas se cortan en BANDAS bandas de FILAS valores; dos reportes son
+candidatos si coinciden en al menos una banda completa. Buscar el posible
+duplicado de un texto nuevo cuesta calcular una firma y BANDAS búsquedas en un
+dict, sin recorrer todos los reportes.
+
+El índice vive en memoria por condominio (como el de core/imagenes.py). Cada
+SINCRONIZAR_SEGUNDOS agrega los reportes creados por otros procesos (pk mayor
+al último visto) y cada RECONSTRUIR_SEGUNDOS se reconstruye completo para
+soltar los reportes cerrados, fusionados o editados. Los que crea el propio
+proceso se agregan al instante con registrar().
+"""
+
+import threading
+import time
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from .coincidencias import tokenizar
+from .models import Reporte
+
+NUM_HASHES = 64
+BANDAS = 16
+FILAS = NUM_HASHES // BANDAS
+# Con 16 bandas de 4 filas, pares con Jaccard ≥ ~0.5 son candidatos casi siempre
+UMBRAL = 0.45
+SINCRONIZAR_SEGUNDOS = 2
+RECONSTRUIR_SEGUNDOS = 600
+
+# Con a, x < p el producto cabe en uint64 y el módulo da vueltas de verdad; con un
+# primo mucho mayor que a·x + b el orden de los hashes seguía al de x y casi
+# todas las funciones elegían el mismo shingle mínimo
+_PRIMO = (1 << 31) - 1
+_rng = np.random.default_rng(1808)
+_A = _rng.integers(1, _PRIMO, size=NUM_HASHES, dtype=np.uint64)
+_B = _rng.integers(0, _PRIMO, size=NUM_HASHES, dtype=np.uint64)
+
+
+# ========================
+# FIRMAS
+# ========================
+
+def texto_reporte(titulo, descripcion, ubicacion):
+    return f"{titulo} {descripcion} {ubicacion}"
+
+
+def shingles(texto):
+    palabras = tokenizar(texto)
+    return set(palabras) | {f"{a} {b}" for a, b in zip(palabras, palabras[1:])}
+
+
+def firma(texto):
+    """Firma MinHash (arreglo de NUM_HASHES uint64), o None si el texto no tiene palabras."""
+    conjunto = shingles(texto)
+    if not conjunto:
+        return None
+    # crc32 es estable entre procesos (hash() de Python no lo es)
+    x = np.fromiter((zlib.crc32(s.encode()) % _PRIMO for s in conjunto), dtype=np.uint64, count=len(conjunto))
+    # (a·x + b) mod p para las NUM_HASHES funciones a la vez; a, x < 2³¹ así que no desborda
+    return ((_A[:, None] * x[None, :] + _B[:, None]) % _PRIMO).min(axis=1)
+
+
+def similitud(firma_a, firma_b):
+    """Jaccard estimada entre dos firmas."""
+    return float(np.count_nonzero(firma_a == firma_b)) / NUM_HASHES
+
+
+def _bandas(sig):
+    return [(b, sig[b * FILAS:(b + 1) * FILAS].tobytes()) for b in range(BANDAS)]
+
+
+# ========================
+# ÍNDICE LSH
+# ========================
+
+class IndiceDuplicados:
+    """Firmas y cubetas LSH de los reportes abiertos de un condominio."""
+
+    def __init__(self, condominio_id):
+        self.condominio_id = condominio_id
+        self.firmas = {}
+        self.cubetas = defaultdict(set)
+        self.construido = 0.0
+        self.sincronizado = 0.0
+        self.ultimo = 0
+        self.lock = threading.Lock()
+
+    def agregar(self, pk, sig):
+        if sig is None or pk in self.firmas:
+            return
+        self.firmas[pk] = sig
+        self.ultimo = max(self.ultimo, pk)
+        for clave in _bandas(sig):
+            self.cubetas[clave].add(pk)
+
+    def quitar(self, pk):
+        sig = self.firmas.pop(pk, None)
+        if sig is not None:
+            for clave in _bandas(sig):
+                self.cubetas[clave].discard(pk)
+
+    def _cargar(self, desde_pk=0):
+        abiertos = (
+            Reporte._base_manager
+            .filter(_condominio_id=self.condominio_id, _duplicado_de__isnull=True, pk__gt=desde_pk)
+            .exclude(_estado="Resuelto")
+            .values_list("pk", "_titulo", "_descripcion", "_ubicacion")
+        )
+        for pk, titulo, descripcion, ubicacion in abiertos.iterator():
+            self.agregar(pk, firma(texto_reporte(titulo, descripcion, ubicacion)))
+            self.ultimo = max(self.ultimo, pk)
+
+    def reconstruir(self):
+        self.firmas = {}
+        self.cubetas = defaultdict(set)
+        self.ultimo = 0
+        self._cargar()
+        self.construido = time.monotonic()
+
+    def _vigente(self):
+        ahora = time.monotonic()
+        if ahora - self.construido > RECONSTRUIR_SEGUNDOS:
+            self.reconstruir()
+        elif ahora - self.sincronizado > SINCRONIZAR_SEGUNDOS:
+            self._cargar(desde_pk=self.ultimo)
+        self.sincronizado = ahora
+
+    def buscar(self, sig, umbral=UMBRAL):
+        """[(pk, similitud)] de reportes candidatos sobre el umbral, más parecidos primero."""
+        if sig is None:
+            return []
+        with self.lock:
+            self._vigente()
+            candidatos = set()
+            for clave in _bandas(sig):
+                candidatos |= self.cubetas.get(clave, set())
+            puntajes = [(pk, similitud(sig, self.firmas[pk])) for pk in candidatos]
+        return sorted((p for p in puntajes if p[1] >= umbral), key=lambda p: -p[1])
+
+    def grupos(self, umbral=UMBRAL):
+        """Grupos (listas de pk, de 2 o más) de reportes que se parecen entre sí."""
+        with self.lock:
+            self._vigente()
+            padre = {pk: pk for pk in self.firmas}
+
+            def raiz(pk):
+                while padre[pk] != pk:
+                    padre[pk] = padre[padre[pk]]
+                    pk = padre[pk]
+                return pk
+
+            for cubeta in self.cubetas.values():
+                if len(cubeta) < 2:
+                    continue
+                miembros = sorted(cubeta)
+                for i, a in enumerate(miembros):
+                    for b in miembros[i + 1:]:
+                        if raiz(a) != raiz(b) and similitud(self.firmas[a], self.firmas[b]) >= umbral:
+                            padre[raiz(a)] = raiz(b)
+
+        grupos = defaultdict(list)
+        for pk in padre:
+            grupos[raiz(pk)].append(pk)
+        return [sorted(g) for g in grupos.values() if len(g) > 1]
+
+
+_indices = {}
+_lock_indices = threading.Lock()
+
+
+def indice(condominio_id):
+    with _lock_indices:
+        if condominio_id not in _indices:
+            _indices[condominio_id] = IndiceDuplicados(condominio_id)
+        return _indices[condominio_id]
+
+
+# ========================
+# API
+# ========================
+
+def posibles_duplicados(condominio_id, titulo, descripcion, ubicacion, limite=3):
+    """Reportes abiertos que probablemente describen el mismo incidente."""
+    sig = firma(texto_reporte(titulo, descripcion, ubicacion))
+    encontrados = indice(condominio_id).buscar(sig)[:limite]
+    reportes = Reporte._base_manager.in_bulk([pk for pk, _ in encontrados])
+    resultado = []
+    for pk, valor in encontrados:
+        reporte = reportes.get(pk)
+        # El índice puede ir algunos segundos atrasado respecto de cierres y fusiones
+        if reporte is not None and reporte.estado != "Resuelto" and reporte._duplicado_de_id is None:
+            reporte.similitud = valor
+            resultado.append(reporte)
+    return resultado
+
+
+def registrar(reporte):
+    """Agrega al índice de este proceso un reporte recién creado."""
+    idx = indice(reporte._condominio_id)
+    with idx.lock:
+        idx.agregar(reporte.pk, firma(texto_reporte(reporte._titulo, reporte._descripcion, reporte._ubicacion)))
+
+
+def olvidar(condominio_id, pks):
+    """Quita del índice de este proceso reportes fusionados o cerrados."""
+    idx = indice(condominio_id)
+    with idx.lock:
+        for pk in pks:
+            idx.quitar(pk)
@@ -0,0 +1,109 @@
+"""
+Proyecciones incrementales sobre el registro de eventos (EventoDominio).
+
+Una proyección es un consumidor con nombre que guarda en ProyeccionEventos el
+último id de evento que aplicó. avanzar() lee los eventos siguientes en lotes
+ordenados por id, los pasa a aplicar() y mueve la posición, así los contadores
+y resúmenes se actualizan con lo nuevo en lugar de recorrer las tablas de
+origen. Se avanza con `python manage.py avanzar_proyecciones`.
+
+Cada lote se aplica en la misma transacción que mueve la posición y con la
+fila de la proyección bloqueada: si aplicar() escribe en la base, cada evento
+se aplica exactamente una vez aunque haya dos procesos avanzando. Si escribe
+fuera (un índice de búsqueda externo) puede repetirse el último lote y
+aplicar() debe tolerarlo.
+
+Los ids se asignan al insertar, no al confirmar: una transacción lenta podría
+confirmar un id menor después de que la proyección ya pasó por encima. Por eso
+solo se leen eventos con más de EVENTOS_MARGEN_SEGUNDOS de antigüedad.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import EventoDominio, ProyeccionEventos, ResumenEventos
+
+TAMANO_LOTE = 500
+
+
+class Proyeccion:
+    nombre = None
+    # Tipos de evento que le interesan (None = todos); la posición avanza igual
+    tipos = None
+
+    def aplicar(self, eventos):
+        raise NotImplementedError
+
+    def reiniciar(self):
+        """Borra lo proyectado y vuelve la posición a 0 para reconstruir desde el inicio."""
+        with transaction.atomic():
+            self.borrar()
+            ProyeccionEventos.objects.filter(_nombre=self.nombre).update(_posicion=0)
+
+    def borrar(self):
+        raise NotImplementedError
+
+    def avanzar(self, tamano_lote=TAMANO_LOTE):
+        """Aplica todos los eventos pendientes. Retorna cuántos leyó."""
+        total = 0
+        while True:
+            leidos = self._avanzar_lote(tamano_lote)
+            total += leidos
+            if leidos < tamano_lote:
+                return total
+
+    def _avanzar_lote(self, tamano_lote):
+        corte = timezone.now() - timedelta(seconds=settings.EVENTOS_MARGEN_SEGUNDOS)
+        with transaction.atomic():
+            ProyeccionEventos.objects.get_or_create(_nombre=self.nombre)
+            estado = ProyeccionEventos.objects.select_for_update().get(_nombre=self.nombre)
+            eventos = list(
+                EventoDominio._base_manager
+                .filter(pk__gt=estado._posicion)
+                .order_by("pk")[:tamano_lote]
+            )
+            # Se corta en el primer evento reciente para no saltar ids aún sin confirmar
+            for i, evento in enumerate(eventos):
+                if evento._fecha > corte:
+                    eventos = eventos[:i]
+                    break
+            if not eventos:
+                return 0
+            relevantes = [e for e in eventos if self.tipos is None or e._tipo in self.tipos]
+            if relevantes:
+                self.aplicar(relevantes)
+            estado._posicion = eventos[-1].pk
+            estado.save(update_fields=["_posicion", "_actualizado"])
+        return len(eventos)
+
+    def posicion(self):
+        estado = ProyeccionEventos.objects.filter(_nombre=self.nombre).first()
+        return estado.posicion if estado else 0
+
+
+class ResumenDiario(Proyeccion):
+    """Cuenta los eventos por condominio, día y tipo en ResumenEventos."""
+    nombre = "resumen_diario"
+
+    def borrar(self):
+        ResumenEventos._base_manager.all().delete()
+
+    def aplicar(self, eventos):
+        conteo = Counter(
+            (e._condominio_id, timezone.localdate(e._fecha), e._tipo) for e in eventos
+        )
+        resumenes = ResumenEventos._base_manager
+        for (condominio_id, dia, tipo), n in conteo.items():
+            # La fila de la proyección está bloqueada: nadie más crea estas filas
+            actualizadas = resumenes.filter(
+                _condominio_id=condominio_id, _dia=dia, _tipo=tipo
+            ).update(_total=models.F("_total") + n)
+            if not actualizadas:
+                resumenes.create(_condominio_id=condominio_id, _dia=dia, _tipo=tipo, _total=n)
+
+
+PROYECCIONES = {p.nombre: p for p in (ResumenDiario(),)}
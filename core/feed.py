@@ -0,0 +1,75 @@
+"""
+Feed cacheado de las últimas publicaciones de cada condominio.
+
+Los dashboards muestran las publicaciones recientes con su autor; en lugar de
+consultarlas en cada visita y en cada worker, se guardan ya resueltas en la
+caché compartida (settings.CACHES) con una clave por condominio.
+
+La caché se actualiza al escribir (write-through): al crear, editar o borrar una
+publicación, las señales recalculan el feed de su condominio cuando la
+transacción se confirma. Se recalcula desde la primaria en vez de insertar la
+entrada nueva en la lista cacheada, así dos escrituras simultáneas en distintos
+workers no se pisan.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import metricas
+from .contexto import condominio_actual
+from .models import Publicacion
+
+# Respaldo por si una escritura no pasa por las señales (p. ej. update() masivo)
+DURACION = 60 * 60
+
+
+def _clave(condominio_id):
+    return f"feed:publicaciones:{condominio_id if condominio_id is not None else 'todos'}"
+
+
+def _entrada(publicacion):
+    """Lo que leen las plantillas de dashboard: mismos nombres que el modelo."""
+    return {
+        "id": publicacion.pk,
+        "titulo": publicacion._titulo,
+        "contenido": publicacion._contenido,
+        "fecha": publicacion._fecha,
+        "vecino": {"username": publicacion._vecino.username},
+    }
+
+
+def refrescar(condominio_id):
+    """Recalcula y guarda el feed del condominio (None = todos los condominios)."""
+    publicaciones = Publicacion._base_manager.using(DEFAULT_DB_ALIAS).select_related("_vecino")
+    if condominio_id is not None:
+        publicaciones = publicaciones.filter(_condominio_id=condominio_id)
+    feed = [_entrada(p) for p in publicaciones.order_by("-_fecha")[:settings.FEED_PUBLICACIONES]]
+    cache.set(_clave(condominio_id), feed, DURACION)
+    return feed
+
+
+def publicaciones_recientes(cantidad=5, condominio_id=None):
+    """Últimas publicaciones del condominio activo, desde la caché."""
+    if condominio_id is None:
+        condominio_id = condominio_actual()
+    feed = cache.get(_clave(condominio_id))
+    metricas.CACHE.inc(uso="feed", resultado="acierto" if feed is not None else "fallo")
+    if feed is None:
+        feed = refrescar(condominio_id)
+    return feed[:cantidad]
+
+
+@receiver(post_save, sender=Publicacion)
+@receiver(post_delete, sender=Publicacion)
+def actualizar_feed(sender, instance, **kwargs):
+    condominio_id = instance._condominio_id
+
+    def actualizar():
+        refrescar(condominio_id)
+        # El feed sin filtro (superusuarios) se recalcula cuando alguien lo lea
+        cache.delete(_clave(None))
+
+    transaction.on_commit(actualizar)
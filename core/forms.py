@@ -1,8 +1,10 @@
 from django import forms
 from django.core.exceptions import ValidationError
 
+from .contexto import SIN_CONDOMINIO, condominio_actual
 from .models import (
-    Reporte, PerfilUsuario, Publicacion, Multa, ObjetoPerdido, Usuario, AreaComun, ReservaArea
+    Reporte, PerfilUsuario, Publicacion, Multa, ObjetoPerdido, Usuario, AreaComun, ReservaArea,
+    Condominio
 )
 
 # ========================
@@ -55,11 +57,14 @@ class ReporteForm(forms.ModelForm):
     
     class Meta:
         model = Reporte
-        fields = ["_titulo", "_descripcion", "_ubicacion"]
+        fields = ["_titulo", "_descripcion", "_categoria", "_ubicacion", "_latitud", "_longitud"]
         labels = {
             "_titulo": "Título del reporte",
+            "_categoria": "Categoría",
             "_descripcion": "Descripción detallada del incidente",
-            "_ubicacion": "Ubicación exacta"
+            "_ubicacion": "Ubicación exacta",
+            "_latitud": "Latitud (opcional)",
+            "_longitud": "Longitud (opcional)",
         }
         widgets = {
             "_titulo": forms.TextInput(attrs={
@@ -74,9 +79,30 @@ class ReporteForm(forms.ModelForm):
             "_ubicacion": forms.TextInput(attrs={
                 'class': 'form-control',
                 'placeholder': 'Ej: Calle 5, entre Av. 3 y 4'
-            })
+            }),
+            "_categoria": forms.Select(attrs={'class': 'form-select'}),
+            "_latitud": forms.NumberInput(attrs={'class': 'form-control', 'step': 'any'}),
+            "_longitud": forms.NumberInput(attrs={'class': 'form-control', 'step': 'any'}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Opcional en el formulario: sin elegir, el reporte queda como "otro"
+        self.fields["_categoria"].required = False
+
+    def clean__categoria(self):
+        return self.cleaned_data.get("_categoria") or "otro"
+
+    def clean(self):
+        cleaned = super().clean()
+        lat = cleaned.get("_latitud")
+        lon = cleaned.get("_longitud")
+        if (lat is None) != (lon is None):
+            raise forms.ValidationError("Indica latitud y longitud, o ninguna de las dos")
+        if lat is not None and not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise forms.ValidationError("Coordenadas fuera de rango")
+        return cleaned
+
     def clean__titulo(self):
         """Longitud mínima y máxima para evitar spam/títulos vacíos."""
         titulo = self.cleaned_data["_titulo"]
@@ -183,12 +209,14 @@ class PublicacionForm(forms.ModelForm):
 # ========================
 
 class MultaForm(forms.ModelForm):
+    # Solo viaja el id elegido en el autocompletado (ver BuscarVecinosView):
+    # un HiddenInput no enumera las opciones y la validación es un get() por pk
     vecino = forms.ModelChoiceField(
         queryset=Usuario.objects.filter(_rol="vecino"),
         label="Vecino afectado",
         required=True,
-        widget=forms.Select(attrs={'class': 'form-control'}),
-        empty_label="Selecciona un vecino..."
+        widget=forms.HiddenInput,
+        error_messages={"invalid_choice": "Selecciona un vecino de la lista."},
     )
 
     class Meta:
@@ -213,6 +241,21 @@ class MultaForm(forms.ModelForm):
             }),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # El queryset de clase se construye al importar, sin condominio activo
+        self.fields["vecino"].queryset = Usuario.objects.vecinos()
+        if self.instance.pk:
+            # editar_multa.html no permite cambiar el vecino ni lo envía
+            self.fields["vecino"].initial = self.instance._vecino_id
+            self.fields["vecino"].disabled = True
+
+    def vecino_elegido(self):
+        """Vecino ya validado, para volver a mostrarlo si otro campo tiene errores."""
+        if self.is_bound and "vecino" in getattr(self, "cleaned_data", {}):
+            return self.cleaned_data["vecino"]
+        return None
+
     def save(self, commit=True):
         """Asigna el vecino y fuerza el estado inicial a 'Pendiente'."""
         instance = super().save(commit=False)
@@ -249,13 +292,15 @@ class MultaForm(forms.ModelForm):
 class ObjetoPerdidoForm(forms.ModelForm):
     class Meta:
         model = ObjetoPerdido
-        fields = ["_titulo", "_descripcion", "_imagen"]
+        fields = ["_tipo", "_titulo", "_descripcion", "_imagen"]
         labels = {
+            "_tipo": "¿Lo perdiste o lo encontraste?",
             "_titulo": "¿Qué objeto perdiste?",
             "_descripcion": "Descripción detallada",
             "_imagen": "Fotografía del objeto (opcional)"
         }
         widgets = {
+            "_tipo": forms.Select(attrs={'class': 'form-select'}),
             "_titulo": forms.TextInput(attrs={
                 'class': 'form-control',
                 'placeholder': 'Ej: Llaves con llavero azul'
@@ -275,7 +320,7 @@ class ObjetoPerdidoForm(forms.ModelForm):
         """Título mínimo para evitar ítems imposibles de identificar."""
         titulo = self.cleaned_data["_titulo"]
         if not titulo or titulo.strip() == "":
-            raise ValidationError("Debes especificar qué objeto perdiste")
+            raise ValidationError("Debes especificar de qué objeto se trata")
         titulo = titulo.strip()
         if len(titulo) < 3:
             raise ValidationError("El título debe tener al menos 3 caracteres.")
@@ -320,11 +365,14 @@ class CrearUsuarioForm(forms.ModelForm):
 
     class Meta:
         model = Usuario
-        fields = ["username", "email", "_telefono", "_rol", "password"]
+        fields = ["username", "first_name", "last_name", "email", "_telefono", "_unidad", "_rol", "password"]
         labels = {
             "username": "Nombre de usuario",
+            "first_name": "Nombre",
+            "last_name": "Apellido",
             "email": "Correo electrónico",
             "_telefono": "Teléfono",
+            "_unidad": "Unidad",
             "_rol": "Rol del usuario"
         }
         widgets = {
@@ -336,12 +384,31 @@ class CrearUsuarioForm(forms.ModelForm):
                 'class': 'form-control',
                 'placeholder': 'correo@ejemplo.com'
             }),
+            "first_name": forms.TextInput(attrs={'class': 'form-control'}),
+            "last_name": forms.TextInput(attrs={'class': 'form-control'}),
             "_telefono": forms.TextInput(attrs={
                 'class': 'form-control',
                 'placeholder': '12345678'
             }),
+            "_unidad": forms.TextInput(attrs={
+                'class': 'form-control',
+                'placeholder': 'B-204'
+            }),
             "_rol": forms.Select(attrs={'class': 'form-control'})
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Un admin de condominio siempre crea usuarios en su condominio;
+        # solo un superusuario global elige a qué condominio pertenece. El acceso
+        # global queda reservado a superusuarios (createsuperuser), no a este form.
+        if condominio_actual() is None:
+            self.fields["condominio"] = forms.ModelChoiceField(
+                queryset=Condominio.objects.order_by("_nombre"),
+                label="Condominio",
+                empty_label="Selecciona un condominio",
+                widget=forms.Select(attrs={'class': 'form-control'})
+            )
     
     def clean_username(self):
         """Formato permitido y unicidad para username."""
@@ -394,6 +461,8 @@ class CrearUsuarioForm(forms.ModelForm):
         password_confirm = cleaned_data.get("password_confirm")
         if password and password_confirm and password != password_confirm:
             raise ValidationError("Las contraseñas no coinciden. Por favor verifica.")
+        if condominio_actual() == SIN_CONDOMINIO:
+            raise ValidationError("Tu cuenta no tiene condominio asignado; no puedes crear usuarios.")
         return cleaned_data
 
     def save(self, commit=True):
@@ -403,6 +472,9 @@ class CrearUsuarioForm(forms.ModelForm):
         """
         user = super().save(commit=False)
         user.set_password(self.cleaned_data["password"])
+        user._condominio_id = condominio_actual() or None
+        if self.cleaned_data.get("condominio"):
+            user._condominio = self.cleaned_data["condominio"]
         if commit:
             user.save()
         return user
@@ -495,11 +567,26 @@ class AreaComunForm(forms.ModelForm):
 
 class ReservaAreaForm(forms.ModelForm):
     """Formulario para vecinos: reservar un área común."""
-    area = forms.ModelChoiceField(
-        queryset=AreaComun.objects.filter(_disponible=True),
-        label="Área a reservar",
+    recurrencia = forms.ChoiceField(
+        choices=ReservaArea.RECURRENCIAS,
+        initial="ninguna",
+        required=False,
+        label="Repetir",
         widget=forms.Select(attrs={'class': 'form-select'})
     )
+    intervalo = forms.IntegerField(
+        min_value=1,
+        max_value=52,
+        initial=1,
+        required=False,
+        label="Cada cuántas semanas/días",
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'min': 1})
+    )
+    repetir_hasta = forms.DateField(
+        required=False,
+        label="Repetir hasta",
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'})
+    )
 
     class Meta:
         model = ReservaArea
@@ -518,10 +605,91 @@ class ReservaAreaForm(forms.ModelForm):
             "_motivo": forms.Textarea(attrs={'class': 'form-control', 'rows': 2}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Solo áreas del condominio activo (los querysets de clase no lo conocen)
+        self.fields["_area"].queryset = AreaComun.objects.filter(_disponible=True)
+
+    def clean(self):
+        """Valida la regla de recurrencia; los traslapes de la serie se revisan en bloque."""
+        recurrencia = self.cleaned_data.get("recurrencia")
+        # Antes de cualquier error: el modelo no valida traslapes ni la restricción
+        # única fecha por fecha (crear_serie omite y reporta los choques), y
+        # _post_clean valida el modelo aunque este clean() falle
+        self.instance.validar_en_serie = recurrencia not in (None, "", "ninguna")
+        cleaned_data = super().clean()
+        if self.instance.validar_en_serie:
+            fecha = cleaned_data.get("_fecha")
+            hasta = cleaned_data.get("repetir_hasta")
+            if not hasta:
+                raise ValidationError("Indica hasta qué fecha se repite la reserva.")
+            if fecha and hasta < fecha:
+                raise ValidationError("La fecha final debe ser posterior a la fecha de inicio.")
+            if fecha:
+                total = ReservaArea.contar_ocurrencias(
+                    fecha, recurrencia, cleaned_data.get("intervalo") or 1, hasta
+                )
+                if total > ReservaArea.MAX_OCURRENCIAS:
+                    raise ValidationError(
+                        f"La serie tendría {total} reservas; el máximo es "
+                        f"{ReservaArea.MAX_OCURRENCIAS}. Acorta la fecha final o aumenta el intervalo."
+                    )
+        return cleaned_data
+
+    def es_recurrente(self):
+        return self.cleaned_data.get("recurrencia") not in (None, "", "ninguna")
+
+    def fechas(self):
+        """Todas las fechas de la reserva según la regla de recurrencia."""
+        return ReservaArea.expandir_recurrencia(
+            self.cleaned_data["_fecha"],
+            self.cleaned_data["recurrencia"],
+            self.cleaned_data.get("intervalo") or 1,
+            self.cleaned_data.get("repetir_hasta"),
+        )
+
     def save(self, commit=True):
         """Asigna el área correctamente, sin romper encapsulamiento."""
         instance = super().save(commit=False)
         instance._area = self.cleaned_data["_area"]
         if commit:
             instance.save()
-        return instance
\ No newline at end of file
+        return instance
+
+# ========================
+# FILTROS DE LISTADOS
+# ========================
+
+class FiltroListadoForm(forms.Form):
+    """
+    Filtros por GET de los listados de reportes y multas. Un valor inválido no
+    es un error para el usuario: el filtro se ignora (ver FiltrosListadoMixin).
+    """
+    estado = forms.ChoiceField(required=False)
+    desde = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control form-control-sm', 'type': 'date'}),
+    )
+    hasta = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control form-control-sm', 'type': 'date'}),
+    )
+    vecino = forms.IntegerField(required=False, min_value=1, widget=forms.HiddenInput)
+
+    def __init__(self, *args, estados=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["estado"].choices = [("", "todos")] + list(estados)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        desde, hasta = cleaned_data.get("desde"), cleaned_data.get("hasta")
+        if desde and hasta and hasta < desde:
+            # Se ignora el rango, no los demás filtros: valor() ya no lo devuelve
+            del cleaned_data["desde"], cleaned_data["hasta"]
+            raise ValidationError("La fecha final debe ser posterior a la fecha inicial.")
+        return cleaned_data
+
+    def valor(self, campo):
+        """Valor limpio del filtro, o None si falta o no es válido."""
+        self.is_valid()
+        return self.cleaned_data.get(campo) or None
@@ -0,0 +1,123 @@
+"""
+Geohash mínimo para agrupar reportes por celda sin dependencias espaciales.
+
+Un geohash codifica (lat, lon) en una cadena base32 donde cada carácter extra
+subdivide la celda anterior, así que dos puntos cercanos comparten prefijo.
+Eso permite indexar la celda como texto y resolver "qué hay cerca" o "cuántos
+hay por zona" con LIKE 'prefijo%' y GROUP BY sobre un prefijo, en cualquier base.
+
+Tamaño aproximado de celda por precisión (en el ecuador):
+    5 → 4.9 km × 4.9 km    6 → 1.2 km × 0.61 km    7 → 153 m × 153 m
+    8 → 38 m × 19 m        9 → 4.8 m × 4.8 m
+"""
+
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9
+
+# Alto y ancho (metros) de una celda por precisión; se usa para elegir el prefijo
+_TAMANO_CELDA_M = {
+    1: (5_000_000, 5_000_000), 2: (625_000, 1_250_000), 3: (156_000, 156_000),
+    4: (19_500, 39_100), 5: (4_890, 4_890), 6: (610, 1_220),
+    7: (153, 153), 8: (19, 38), 9: (4.8, 4.8),
+}
+
+RADIO_TIERRA_M = 6_371_000
+
+
+def codificar(lat, lon, precision=PRECISION):
+    """Geohash de (lat, lon) con `precision` caracteres."""
+    lat_min, lat_max = -90.0, 90.0
+    lon_min, lon_max = -180.0, 180.0
+    celda = []
+    bits = valor = 0
+    es_lon = True
+    while len(celda) < precision:
+        if es_lon:
+            medio = (lon_min + lon_max) / 2
+            if lon >= medio:
+                valor = (valor << 1) | 1
+                lon_min = medio
+            else:
+                valor <<= 1
+                lon_max = medio
+        else:
+            medio = (lat_min + lat_max) / 2
+            if lat >= medio:
+                valor = (valor << 1) | 1
+                lat_min = medio
+            else:
+                valor <<= 1
+                lat_max = medio
+        es_lon = not es_lon
+        bits += 1
+        if bits == 5:
+            celda.append(BASE32[valor])
+            bits = valor = 0
+    return "".join(celda)
+
+
+def limites(celda):
+    """(lat_min, lat_max, lon_min, lon_max) de una celda."""
+    lat_min, lat_max = -90.0, 90.0
+    lon_min, lon_max = -180.0, 180.0
+    es_lon = True
+    for caracter in celda:
+        valor = BASE32.index(caracter)
+        for bit in range(4, -1, -1):
+            uno = (valor >> bit) & 1
+            if es_lon:
+                medio = (lon_min + lon_max) / 2
+                lon_min, lon_max = (medio, lon_max) if uno else (lon_min, medio)
+            else:
+                medio = (lat_min + lat_max) / 2
+                lat_min, lat_max = (medio, lat_max) if uno else (lat_min, medio)
+            es_lon = not es_lon
+    return lat_min, lat_max, lon_min, lon_max
+
+
+def centro(celda):
+    """Punto central (lat, lon) de una celda."""
+    lat_min, lat_max, lon_min, lon_max = limites(celda)
+    return (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+
+
+def vecinas(celda):
+    """La celda y sus 8 vecinas de la misma precisión."""
+    lat_min, lat_max, lon_min, lon_max = limites(celda)
+    alto = lat_max - lat_min
+    ancho = lon_max - lon_min
+    lat, lon = (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+    resultado = set()
+    for d_lat in (-alto, 0, alto):
+        for d_lon in (-ancho, 0, ancho):
+            n_lat = lat + d_lat
+            if not -90 <= n_lat <= 90:
+                continue
+            n_lon = (lon + d_lon + 180) % 360 - 180
+            resultado.add(codificar(n_lat, n_lon, len(celda)))
+    return sorted(resultado)
+
+
+def precision_para_radio(radio_m):
+    """Mayor precisión cuya celda cubre el radio, para que celda + vecinas lo contengan."""
+    for precision in range(PRECISION, 0, -1):
+        if min(_TAMANO_CELDA_M[precision]) >= radio_m:
+            return precision
+    return 1
+
+
+def prefijos_cercanos(lat, lon, radio_m):
+    """Prefijos de celda que cubren todos los puntos a menos de `radio_m` de (lat, lon)."""
+    precision = precision_para_radio(radio_m)
+    return vecinas(codificar(lat, lon, precision))
+
+
+def distancia_m(lat1, lon1, lat2, lon2):
+    """Distancia haversine en metros."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    d_lat = p2 - p1
+    d_lon = math.radians(lon2 - lon1)
+    a = math.sin(d_lat / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(d_lon / 2) ** 2
+    return 2 * RADIO_TIERRA_M * math.asin(math.sqrt(a))
@@ -0,0 +1,122 @@
+"""
+Hash perceptual de las fotos de objetos perdidos y búsqueda de fotos casi idénticas.
+
+dhash(): la imagen se reduce a 9×8 en escala de grises y cada bit indica si un
+píxel es más claro que su vecino de la derecha. Dos fotos del mismo objeto
+(recomprimidas, redimensionadas o con otro brillo) quedan a pocos bits de
+distancia de Hamming. El valor se guarda en ObjetoPerdido._phash como entero
+de 64 bits con signo (BigIntegerField).
+
+Para la búsqueda se mantiene en memoria, por condominio, un arreglo NumPy con
+los hashes: la distancia contra todos es un XOR y un conteo de bits vectorizado.
+El índice se sincroniza con una consulta de conteo/máximo por búsqueda y solo
+carga las filas nuevas.
+"""
+
+import threading
+
+import numpy as np
+from django.db.models import Count, Max
+from PIL import Image, ImageOps
+
+from .models import ObjetoPerdido
+
+DISTANCIA_MAXIMA = 10
+
+
+# ========================
+# HASH
+# ========================
+
+def a_firmado(valor):
+    """Entero sin signo de 64 bits → con signo, para BigIntegerField."""
+    return valor - (1 << 64) if valor >= (1 << 63) else valor
+
+
+def dhash(archivo):
+    """dHash de 64 bits (con signo) de una imagen, o None si no se puede leer."""
+    try:
+        with Image.open(archivo) as imagen:
+            imagen = ImageOps.exif_transpose(imagen).convert("L")
+            pixeles = np.asarray(imagen.resize((9, 8), Image.Resampling.LANCZOS), dtype=np.int16)
+    except OSError:
+        return None
+    finally:
+        if hasattr(archivo, "seek"):
+            archivo.seek(0)
+    bits = (pixeles[:, 1:] > pixeles[:, :-1]).ravel()
+    return a_firmado(int(np.packbits(bits).view(">u8")[0]))
+
+
+# ========================
+# ÍNDICE EN MEMORIA
+# ========================
+
+class IndiceImagenes:
+    """Hashes de un condominio como arreglos paralelos (pk, hash)."""
+
+    def __init__(self, condominio_id):
+        self.condominio_id = condominio_id
+        self.pks = np.empty(0, dtype=np.int64)
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.ultimo = 0
+        self.lock = threading.Lock()
+
+    def _queryset(self):
+        return ObjetoPerdido._base_manager.filter(
+            _condominio_id=self.condominio_id, _phash__isnull=False
+        )
+
+    def sincronizar(self):
+        """Agrega las filas nuevas; si se borró algo, recarga todo."""
+        estado = self._queryset().aggregate(total=Count("pk"), ultimo=Max("pk"))
+        if estado["total"] == len(self.pks) and (estado["ultimo"] or 0) == self.ultimo:
+            return
+        nuevos = list(self._queryset().filter(pk__gt=self.ultimo).values_list("pk", "_phash"))
+        if len(self.pks) + len(nuevos) != estado["total"]:
+            self.pks = np.empty(0, dtype=np.int64)
+            self.hashes = np.empty(0, dtype=np.uint64)
+            nuevos = list(self._queryset().values_list("pk", "_phash"))
+        if nuevos:
+            pks, hashes = zip(*nuevos)
+            self.pks = np.concatenate([self.pks, np.array(pks, dtype=np.int64)])
+            self.hashes = np.concatenate(
+                [self.hashes, np.array(hashes, dtype=np.int64).view(np.uint64)]
+            )
+        self.ultimo = estado["ultimo"] or 0
+
+    def buscar(self, phash, distancia_maxima=DISTANCIA_MAXIMA):
+        """[(pk, distancia)] a distancia de Hamming ≤ distancia_maxima, más cercanos primero."""
+        with self.lock:
+            self.sincronizar()
+            pks, hashes = self.pks, self.hashes
+        objetivo = np.array([phash], dtype=np.int64).view(np.uint64)[0]
+        distancias = np.bitwise_count(hashes ^ objetivo)
+        cerca = np.flatnonzero(distancias <= distancia_maxima)
+        cerca = cerca[np.argsort(distancias[cerca], kind="stable")]
+        return [(int(pks[i]), int(distancias[i])) for i in cerca]
+
+
+_indices = {}
+_lock_indices = threading.Lock()
+
+
+def indice(condominio_id):
+    with _lock_indices:
+        if condominio_id not in _indices:
+            _indices[condominio_id] = IndiceImagenes(condominio_id)
+        return _indices[condominio_id]
+
+
+def imagenes_similares(objeto, distancia_maxima=DISTANCIA_MAXIMA):
+    """[(objeto, distancia)] con foto casi idéntica a la de `objeto` (sin incluirlo)."""
+    if objeto._phash is None:
+        return []
+    encontrados = [
+        (pk, d) for pk, d in indice(objeto._condominio_id).buscar(objeto._phash, distancia_maxima)
+        if pk != objeto.pk
+    ]
+    objetos = ObjetoPerdido._base_manager.select_related("_usuario").in_bulk(
+        [pk for pk, _ in encontrados]
+    )
+    return [(objetos[pk], d) for pk, d in encontrados if pk in objetos]
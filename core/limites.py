@@ -0,0 +1,188 @@
+"""
+Límites de frecuencia con cubos de fichas (token bucket).
+
+Cada Limite define un cubo de `capacidad` fichas que se rellena a razón de
+capacidad / periodo fichas por segundo. Cada request consume una ficha; si el
+cubo está vacío la vista responde de inmediato, antes del trabajo costoso
+(el hash de la contraseña en el login).
+
+El botón de pánico no tiene límite: una pulsación rechazada podría ser una
+emergencia real. Las pulsaciones repetidas ya se suman a la alerta activa
+(BotonPanicoManager.activar).
+Así se permiten ráfagas cortas de hasta `capacidad` requests pero no un ritmo
+sostenido mayor al configurado.
+
+El cubo se identifica por límite + clave; la clave sale del request según `por`:
+    "ip"        dirección del cliente
+    "usuario"   usuario autenticado (o la IP si es anónimo)
+    "endpoint"  un solo cubo compartido por todos
+    callable    función request → str (p. ej. el username que se intenta usar)
+
+El estado vive en memoria del proceso (AlmacenLocal) o, con
+LIMITES_ALMACEN = "cache", en la caché de Django (compartida entre workers si
+es Redis). Ver LimiteMixin en core/views.py.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+# ========================
+# ALMACENES
+# ========================
+
+class AlmacenLocal:
+    """Cubos en un dict del proceso. Cada worker lleva su propia cuenta."""
+
+    MAXIMO_CUBOS = 50_000
+
+    def __init__(self):
+        self.cubos = {}
+        self.lock = threading.Lock()
+
+    def consumir(self, clave, capacidad, ritmo, ahora):
+        with self.lock:
+            fichas, ultimo = self.cubos.get(clave, (capacidad, ahora))
+            fichas = min(capacidad, fichas + (ahora - ultimo) * ritmo)
+            permitido = fichas >= 1
+            if permitido:
+                fichas -= 1
+            if len(self.cubos) >= self.MAXIMO_CUBOS and clave not in self.cubos:
+                self._podar(ahora, capacidad, ritmo)
+            self.cubos[clave] = (fichas, ahora)
+            return permitido, fichas
+
+    def _podar(self, ahora, capacidad, ritmo):
+        # Un cubo que ya se habría rellenado por completo equivale a no tenerlo
+        self.cubos = {
+            clave: (fichas, ultimo) for clave, (fichas, ultimo) in self.cubos.items()
+            if fichas + (ahora - ultimo) * ritmo < capacidad
+        }
+
+    def limpiar(self):
+        with self.lock:
+            self.cubos.clear()
+
+
+class AlmacenCache:
+    """
+    Cubos en la caché de Django. Leer y escribir no es atómico: dos workers
+    pueden gastar la misma ficha en el mismo instante, lo que solo deja pasar
+    alguna request de más en el borde del límite.
+    """
+
+    def consumir(self, clave, capacidad, ritmo, ahora):
+        clave = f"limite:{clave}"
+        fichas, ultimo = cache.get(clave) or (capacidad, ahora)
+        fichas = min(capacidad, fichas + (ahora - ultimo) * ritmo)
+        permitido = fichas >= 1
+        if permitido:
+            fichas -= 1
+        # Pasado el tiempo de rellenar el cubo la entrada ya no aporta nada
+        cache.set(clave, (fichas, ahora), timeout=int(capacidad / ritmo) + 1)
+        return permitido, fichas
+
+
+_local = AlmacenLocal()
+_cache = AlmacenCache()
+
+
+def almacen():
+    return _cache if getattr(settings, "LIMITES_ALMACEN", "local") == "cache" else _local
+
+
+# ========================
+# LÍMITES
+# ========================
+
+def ip_cliente(request):
+    """
+    REMOTE_ADDR, o el último salto de X-Forwarded-For si LIMITES_PROXY_CONFIABLE
+    (la app detrás de un proxy propio: el último valor lo agrega ese proxy).
+    """
+    if getattr(settings, "LIMITES_PROXY_CONFIABLE", False):
+        reenviado = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        if reenviado:
+            return reenviado.split(",")[-1].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+class Limite:
+    def __init__(self, nombre, capacidad, periodo, por="ip"):
+        self.nombre = nombre
+        self.capacidad = capacidad
+        self.periodo = periodo
+        self.por = por
+
+    @property
+    def ritmo(self):
+        """Fichas que se recuperan por segundo."""
+        return self.capacidad / self.periodo
+
+    def clave(self, request):
+        if callable(self.por):
+            valor = self.por(request)
+        elif self.por == "usuario" and request.user.is_authenticated:
+            valor = f"u{request.user.pk}"
+        elif self.por == "endpoint":
+            valor = "*"
+        else:
+            valor = ip_cliente(request)
+        return f"{self.nombre}:{valor}"
+
+    def consumir(self, request):
+        """0 si la request puede seguir; si no, segundos hasta la próxima ficha."""
+        if not getattr(settings, "LIMITES_ACTIVOS", True):
+            return 0
+        # Reloj de pared y no monotonic: el almacén en caché se comparte entre procesos
+        permitido, fichas = almacen().consumir(self.clave(request), self.capacidad, self.ritmo, time.time())
+        if permitido:
+            return 0
+        return (1 - fichas) / self.ritmo
+
+
+def _username_intentado(request):
+    # Resumido: lo que llega por POST puede tener caracteres no válidos en una clave de caché
+    username = request.POST.get("username", "").strip().lower()
+    return "n:" + hashlib.sha1(username.encode()).hexdigest()[:16]
+
+
+_aviso_proxy = threading.Event()
+
+
+def _ip_login(request):
+    """
+    IP del cliente. Si llega X-Forwarded-For pero LIMITES_PROXY_CONFIABLE está
+    apagado, todos los clientes comparten la IP del proxy y un solo atacante
+    agotaría el cubo de todos: en ese caso el cubo es por (IP, username) y se
+    avisa una vez en el log para que se configure VIZINHO_PROXY_CONFIABLE.
+    """
+    ip = ip_cliente(request)
+    if getattr(settings, "LIMITES_PROXY_CONFIABLE", False) or "HTTP_X_FORWARDED_FOR" not in request.META:
+        return ip
+    if not _aviso_proxy.is_set():
+        _aviso_proxy.set()
+        logger.warning(
+            "Login detrás de un proxy (X-Forwarded-For) con VIZINHO_PROXY_CONFIABLE apagado: "
+            "el límite por IP se aplica por IP y username. Activa VIZINHO_PROXY_CONFIABLE=1 "
+            "si el proxy es propio."
+        )
+    return f"{ip}:{_username_intentado(request)}"
+
+
+def _ip_y_username(request):
+    return f"{ip_cliente(request)}:{_username_intentado(request)}"
+
+
+# Por IP frena las ráfagas de un cliente; por (IP, username), el adivinar la
+# clave de una cuenta. No hay cubo solo por username: cualquiera podría
+# agotarlo escribiendo el nombre de otro y dejarlo sin poder entrar
+LOGIN_POR_IP = Limite("login_ip", capacidad=10, periodo=60, por=_ip_login)
+LOGIN_POR_USUARIO = Limite("login_usuario", capacidad=5, periodo=60, por=_ip_y_username)
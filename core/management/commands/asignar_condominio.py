@@ -0,0 +1,60 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from core.models import Condominio, ContenidoDeCondominio, Usuario
+
+
+class Command(BaseCommand):
+    help = (
+        "Asigna un condominio a los usuarios y registros que no lo tienen "
+        "(instalaciones anteriores a multi-condominio). Sin condominio, un usuario "
+        "que no es superusuario no ve nada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--condominio", type=int,
+                            help="Id del condominio a asignar (por defecto el primero, o uno nuevo)")
+        parser.add_argument("--nombre", default="Condominio principal",
+                            help="Nombre del condominio a crear si no existe ninguno")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            condominio = self._condominio(options)
+            self.stdout.write(f"Asignando a {condominio}")
+
+            # Los superusuarios sin condominio conservan el acceso global
+            usuarios = Usuario._base_manager.filter(_condominio__isnull=True, is_superuser=False)
+            self.stdout.write(f"  usuarios: {usuarios.update(_condominio=condominio)}")
+
+            for modelo in apps.get_app_config("core").get_models():
+                if not issubclass(modelo, ContenidoDeCondominio):
+                    continue
+                pendientes = modelo._base_manager.filter(_condominio__isnull=True)
+                del_propietario = 0
+                if modelo.campo_propietario:
+                    # Primero el condominio del dueño, igual que ContenidoDeCondominio.save()
+                    campo = modelo._meta.get_field(modelo.campo_propietario)
+                    dueno = Usuario._base_manager.filter(
+                        pk=OuterRef(campo.attname), _condominio__isnull=False
+                    ).values("_condominio")[:1]
+                    del_propietario = pendientes.filter(
+                        **{f"{campo.attname}__in": Usuario._base_manager.filter(_condominio__isnull=False)}
+                    ).update(_condominio=Subquery(dueno))
+                resto = pendientes.update(_condominio=condominio)
+                if del_propietario or resto:
+                    self.stdout.write(f"  {modelo._meta.verbose_name_plural}: {del_propietario + resto}")
+
+        self.stdout.write(self.style.SUCCESS("Condominios asignados"))
+
+    def _condominio(self, options):
+        if options["condominio"] is not None:
+            try:
+                return Condominio.objects.get(pk=options["condominio"])
+            except Condominio.DoesNotExist:
+                raise CommandError(f"No existe el condominio {options['condominio']}")
+        condominio = Condominio.objects.order_by("pk").first()
+        if condominio is None:
+            condominio = Condominio.objects.create(_nombre=options["nombre"], _ubicacion="")
+        return condominio
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.eventos import PROYECCIONES, TAMANO_LOTE
+
+
+class Command(BaseCommand):
+    help = "Aplica a las proyecciones los eventos de dominio registrados desde su última posición."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=TAMANO_LOTE,
+                            help="Eventos a aplicar por transacción")
+        parser.add_argument("--proyeccion", choices=sorted(PROYECCIONES),
+                            help="Avanza solo esta proyección")
+        parser.add_argument("--reconstruir", action="store_true",
+                            help="Borra lo proyectado y vuelve a aplicar todo el registro")
+        parser.add_argument("--continuo", type=float, metavar="SEGUNDOS",
+                            help="Sigue avanzando cada SEGUNDOS hasta que se interrumpa")
+
+    def handle(self, *args, **options):
+        proyecciones = (
+            [PROYECCIONES[options["proyeccion"]]] if options["proyeccion"] else list(PROYECCIONES.values())
+        )
+        if options["reconstruir"]:
+            for proyeccion in proyecciones:
+                proyeccion.reiniciar()
+                self.stdout.write(f"{proyeccion.nombre}: reiniciada")
+
+        while True:
+            for proyeccion in proyecciones:
+                aplicados = proyeccion.avanzar(options["lote"])
+                if aplicados or not options["continuo"]:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{proyeccion.nombre}: {aplicados} eventos aplicados (posición {proyeccion.posicion()})"
+                    ))
+            if not options["continuo"]:
+                return
+            time.sleep(options["continuo"])
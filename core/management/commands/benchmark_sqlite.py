@@ -0,0 +1,195 @@
+"""
+Benchmark de concurrencia de SQLite con y sin los ajustes de producción.
+
+Copia la base actual a dos archivos temporales y lanza varios procesos que
+mezclan lecturas (conteos y listados como los de los dashboards) con
+transacciones de escritura (alertas de pánico, pagos de multas, reservas).
+Compara dos modos:
+
+    - sin ajustes: journal clásico, synchronous=FULL, transacciones DEFERRED
+      (la configuración por defecto de Django);
+    - con ajustes: settings.SQLITE_PRAGMAS y transacciones IMMEDIATE.
+
+Conviene correrlo sobre datos de `generar_datos`:
+
+    python manage.py benchmark_sqlite --procesos 8 --duracion 10
+"""
+
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Reporte, Multa, BotonPanico, ReservaArea, Publicacion, AreaComun, Usuario
+
+
+def _percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def _trabajador(ruta, pragmas, modo_tx, sql, ids, duracion, proporcion_escritura, semilla, cola):
+    """Proceso independiente: una conexión propia, como un worker de gunicorn."""
+    rng = random.Random(semilla)
+    conexion = sqlite3.connect(ruta, timeout=5, isolation_level=None)
+    for clave, valor in pragmas.items():
+        conexion.execute(f"PRAGMA {clave}={valor}")
+
+    lecturas = escrituras = bloqueos = 0
+    latencias = []
+    fin = time.perf_counter() + duracion
+    while time.perf_counter() < fin:
+        inicio = time.perf_counter()
+        try:
+            if rng.random() < proporcion_escritura:
+                # Lee y luego escribe dentro de la misma transacción, como
+                # Multa.pagar() o ReservaArea.clean() seguido del INSERT
+                conexion.execute(f"BEGIN {modo_tx}")
+                try:
+                    tipo = rng.choice(("panico", "pago", "reserva"))
+                    if tipo == "panico":
+                        conexion.execute(sql["leer_alertas"], (rng.choice(ids["usuarios"]),)).fetchall()
+                        conexion.execute(sql["insertar_alerta"], (rng.choice(ids["usuarios"]),))
+                    elif tipo == "pago":
+                        multa = rng.choice(ids["multas"])
+                        conexion.execute(sql["leer_multa"], (multa,)).fetchone()
+                        conexion.execute(sql["pagar_multa"], (multa,))
+                    else:
+                        conexion.execute(sql["leer_reservas"], (rng.choice(ids["areas"]),)).fetchall()
+                        conexion.execute(sql["tocar_reserva"], (rng.choice(ids["areas"]),))
+                    conexion.execute("COMMIT")
+                except BaseException:
+                    conexion.execute("ROLLBACK")
+                    raise
+                escrituras += 1
+                latencias.append((time.perf_counter() - inicio) * 1000)
+            else:
+                consulta = rng.choice(("contar_reportes", "listar_publicaciones", "sumar_multas"))
+                conexion.execute(sql[consulta]).fetchall()
+                lecturas += 1
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            bloqueos += 1
+    conexion.close()
+    cola.put((lecturas, escrituras, bloqueos, latencias))
+
+
+class Command(BaseCommand):
+    help = "Mide throughput mixto lectura/escritura de SQLite con y sin ajustes de producción."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--procesos", type=int, default=4)
+        parser.add_argument("--duracion", type=float, default=5)
+        parser.add_argument("--escrituras", type=float, default=0.2,
+                            help="Proporción de operaciones que escriben (0-1)")
+
+    def handle(self, *args, **opts):
+        base = settings.DATABASES["default"]
+        if base["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("El benchmark solo aplica a SQLite")
+
+        sql = self._consultas()
+        ids = self._ids(str(base["NAME"]))
+        if not all(ids.values()):
+            raise CommandError("Faltan datos: corre primero `python manage.py generar_datos`")
+
+        modos = [
+            ("sin ajustes", {"journal_mode": "DELETE", "synchronous": "FULL"}, "DEFERRED"),
+            ("con ajustes", settings.SQLITE_PRAGMAS, "IMMEDIATE"),
+        ]
+        self.stdout.write(
+            f"{opts['procesos']} procesos, {opts['duracion']:.0f}s, "
+            f"{opts['escrituras']:.0%} escrituras\n"
+        )
+        self.stdout.write(f"{'modo':<14}{'ops/s':>10}{'lect/s':>10}{'escr/s':>10}"
+                          f"{'bloqueos':>10}{'p50 escr':>10}{'p99 escr':>10}")
+        with tempfile.TemporaryDirectory() as directorio:
+            for nombre, pragmas, modo_tx in modos:
+                ruta = os.path.join(directorio, f"{modo_tx}.sqlite3")
+                self._copiar(str(base["NAME"]), ruta)
+                self._imprimir(nombre, self._medir(ruta, pragmas, modo_tx, sql, ids, opts), opts["duracion"])
+
+    def _consultas(self):
+        reporte = Reporte._meta.db_table
+        multa = Multa._meta.db_table
+        alerta = BotonPanico._meta.db_table
+        reserva = ReservaArea._meta.db_table
+        publicacion = Publicacion._meta.db_table
+        return {
+            "contar_reportes": f"SELECT _estado, COUNT(*) FROM {reporte} GROUP BY _estado",
+            "listar_publicaciones": f"SELECT id, _titulo FROM {publicacion} ORDER BY _fecha DESC LIMIT 5",
+            "sumar_multas": f"SELECT SUM(_monto) FROM {multa} WHERE _estado = 'Pendiente'",
+            "leer_alertas": f"SELECT id FROM {alerta} WHERE _usuario_id = ? AND _activo = 1",
+            "insertar_alerta": (
+                f"INSERT INTO {alerta} (_usuario_id, _mensaje, _fecha, _activo) "
+                f"VALUES (?, 'Benchmark', datetime('now'), 1)"
+            ),
+            "leer_multa": f"SELECT _estado FROM {multa} WHERE id = ?",
+            "pagar_multa": f"UPDATE {multa} SET _estado = 'Pagada', _fecha_pago = datetime('now') WHERE id = ?",
+            "leer_reservas": f"SELECT _hora_inicio, _hora_fin FROM {reserva} WHERE _area_id = ? LIMIT 50",
+            "tocar_reserva": (
+                f"UPDATE {reserva} SET _motivo = _motivo WHERE id = "
+                f"(SELECT id FROM {reserva} WHERE _area_id = ? LIMIT 1)"
+            ),
+        }
+
+    @staticmethod
+    def _ids(ruta):
+        conexion = sqlite3.connect(ruta)
+        try:
+            def columna(sql):
+                return [fila[0] for fila in conexion.execute(sql)]
+            return {
+                "usuarios": columna(f"SELECT id FROM {Usuario._meta.db_table} LIMIT 2000"),
+                "multas": columna(f"SELECT id FROM {Multa._meta.db_table} LIMIT 5000"),
+                "areas": columna(f"SELECT id FROM {AreaComun._meta.db_table}"),
+            }
+        finally:
+            conexion.close()
+
+    @staticmethod
+    def _copiar(origen, destino):
+        fuente = sqlite3.connect(origen)
+        copia = sqlite3.connect(destino)
+        try:
+            fuente.backup(copia)
+            copia.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            copia.close()
+            fuente.close()
+
+    @staticmethod
+    def _medir(ruta, pragmas, modo_tx, sql, ids, opts):
+        cola = multiprocessing.Queue()
+        procesos = [
+            multiprocessing.Process(
+                target=_trabajador,
+                args=(ruta, pragmas, modo_tx, sql, ids, opts["duracion"],
+                      opts["escrituras"], i, cola),
+            )
+            for i in range(opts["procesos"])
+        ]
+        for p in procesos:
+            p.start()
+        resultados = [cola.get() for _ in procesos]
+        for p in procesos:
+            p.join()
+        return resultados
+
+    def _imprimir(self, nombre, resultados, duracion):
+        lecturas = sum(r[0] for r in resultados)
+        escrituras = sum(r[1] for r in resultados)
+        bloqueos = sum(r[2] for r in resultados)
+        latencias = sorted(ms for r in resultados for ms in r[3])
+        self.stdout.write(
+            f"{nombre:<14}{(lecturas + escrituras) / duracion:>10.0f}{lecturas / duracion:>10.0f}"
+            f"{escrituras / duracion:>10.0f}{bloqueos:>10}"
+            f"{_percentil(latencias, 50):>9.1f}ms{_percentil(latencias, 99):>8.1f}ms"
+        )
@@ -0,0 +1,310 @@
+"""
+Genera una comunidad sintética para pruebas de escala.
+
+Crea condominios, vecinos con perfil y años de historial (reportes, multas
+pagadas y pendientes, publicaciones, alertas de pánico, objetos perdidos y
+reservas sin traslapes). La actividad sigue una distribución de Pareto: unos
+pocos vecinos generan la mayor parte del contenido, como en producción.
+
+Todo se inserta con bulk_create por lotes y con una semilla fija, así dos
+corridas con los mismos parámetros producen exactamente los mismos datos:
+
+    python manage.py generar_datos --condominios 10 --vecinos 500 --anios 5
+"""
+
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, time as dtime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import (
+    Condominio, Usuario, PerfilUsuario, Publicacion, Reporte, Multa,
+    BotonPanico, ObjetoPerdido, AreaComun, ReservaArea
+)
+
+
+# Volumen medio por vecino y por año; la distribución real es sesgada
+POR_VECINO_ANIO = {
+    "reportes": 4,
+    "multas": 1.5,
+    "publicaciones": 3,
+    "alertas": 0.2,
+    "objetos": 0.5,
+}
+
+TEMAS_REPORTE = [
+    ("Bache en la calle", "Calle {n}", "mantenimiento"),
+    ("Lámpara fundida", "Poste {n} de la avenida principal", "alumbrado"),
+    ("Basura acumulada", "Contenedor del bloque {n}", "limpieza"),
+    ("Fuga de agua", "Jardín del edificio {n}", "agua"),
+    ("Ruido excesivo", "Apartamento {n}", "ruido"),
+    ("Portón dañado", "Entrada {n}", "seguridad"),
+]
+MOTIVOS_MULTA = [
+    "Estacionamiento en área prohibida",
+    "Mascota sin correa en áreas comunes",
+    "Ruido después de las 22:00 horas",
+    "Basura fuera del horario de recolección",
+    "Uso indebido del salón social",
+]
+OBJETOS = ["Llaves", "Billetera", "Gato", "Perro", "Celular", "Bicicleta", "Mochila", "Lentes"]
+COLORES = ["negro", "azul", "rojo", "gris", "blanco", "café", "verde"]
+AREAS = [("Piscina", 20), ("Salón social", 60), ("Gimnasio", 10), ("Cancha", 12), ("Terraza", 30)]
+
+
+@contextmanager
+def fechas_manuales(*modelos):
+    """
+    Desactiva auto_now/auto_now_add mientras dura el bloque para poder
+    insertar fechas históricas (bulk_create las sobrescribiría con now()).
+    """
+    campos = [
+        f for m in modelos for f in m._meta.concrete_fields
+        if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)
+    ]
+    originales = [(f, f.auto_now, f.auto_now_add) for f in campos]
+    for f in campos:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in originales:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Genera datos sintéticos representativos para pruebas de rendimiento."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--condominios", type=int, default=5)
+        parser.add_argument("--vecinos", type=int, default=200,
+                            help="Vecinos por condominio")
+        parser.add_argument("--anios", type=int, default=3,
+                            help="Años de historial a generar")
+        parser.add_argument("--semilla", type=int, default=1808)
+        parser.add_argument("--lote", type=int, default=5000,
+                            help="Filas por bulk_create")
+        parser.add_argument("--clave", default="vizinho123",
+                            help="Contraseña común de los usuarios generados")
+
+    def handle(self, *args, **opts):
+        self.rng = random.Random(opts["semilla"])
+        self.lote = opts["lote"]
+        self.ahora = timezone.now().replace(microsecond=0)
+        self.inicio = self.ahora - timedelta(days=365 * opts["anios"])
+        self.totales = {}
+        # Un solo hash para todos: hashear por usuario tomaría minutos
+        clave = make_password(opts["clave"])
+
+        t0 = time.perf_counter()
+        with fechas_manuales(Usuario, Publicacion, Reporte, Multa, BotonPanico,
+                             ObjetoPerdido, ReservaArea):
+            for c in range(opts["condominios"]):
+                self._generar_condominio(c, opts["vecinos"], opts["anios"], clave)
+
+        total = sum(self.totales.values())
+        duracion = time.perf_counter() - t0
+        for modelo, n in self.totales.items():
+            self.stdout.write(f"  {modelo:<16}{n:>10}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} filas en {duracion:.1f}s ({total / max(duracion, 1e-9):.0f} filas/s)"
+        ))
+
+    # ===== UTILIDADES =====
+
+    def _insertar(self, modelo, objetos):
+        """Inserta un iterable de objetos en lotes; retorna los objetos con pk."""
+        creados = []
+        objetos = iter(objetos)
+        # bulk_create no pasa por save(), así que el condominio se asigna aquí
+        por_condominio = any(f.name == "_condominio" for f in modelo._meta.concrete_fields)
+        while True:
+            lote = list(itertools.islice(objetos, self.lote))
+            if not lote:
+                break
+            if por_condominio:
+                for obj in lote:
+                    obj._condominio_id = self.condominio_id
+            if modelo is Usuario:
+                for obj in lote:
+                    obj.actualizar_busqueda()
+            with transaction.atomic():
+                creados.extend(modelo.objects.bulk_create(lote, batch_size=self.lote))
+        nombre = modelo.__name__
+        self.totales[nombre] = self.totales.get(nombre, 0) + len(creados)
+        return creados
+
+    def _fecha(self, desde=None):
+        desde = desde or self.inicio
+        segundos = int((self.ahora - desde).total_seconds())
+        return desde + timedelta(seconds=self.rng.randint(0, max(segundos, 1)))
+
+    def _repartir(self, vecinos, pesos, media_anual, anios):
+        """Reparte N elementos entre vecinos según su peso de actividad."""
+        total = int(len(vecinos) * media_anual * anios)
+        return self.rng.choices(vecinos, weights=pesos, k=total)
+
+    # ===== GENERACIÓN =====
+
+    def _generar_condominio(self, c, n_vecinos, anios, clave):
+        rng = self.rng
+        self.condominio_id = Condominio.objects.create(
+            _nombre=f"Condominio {c + 1:03d}",
+            _ubicacion=f"Zona {rng.randint(1, 25)}, Ciudad de Guatemala",
+            _reglas="Reglamento generado para pruebas de escala.",
+        ).pk
+        self.totales["Condominio"] = self.totales.get("Condominio", 0) + 1
+
+        admin = Usuario(
+            username=f"admin{c + 1:03d}", password=clave, _rol="admin",
+            email=f"admin{c + 1:03d}@vizinho.test", date_joined=self.inicio,
+        )
+        vecinos = self._insertar(Usuario, itertools.chain([admin], (
+            Usuario(
+                username=f"vecino{c + 1:03d}_{i:05d}",
+                password=clave,
+                email=f"vecino{c + 1:03d}_{i:05d}@vizinho.test",
+                first_name=f"Vecino {i}",
+                _unidad=f"{'ABCD'[i % 4]}-{i // 4 + 101}",
+                _telefono=f"5{rng.randint(1000000, 9999999)}",
+                date_joined=self._fecha(),
+            )
+            for i in range(n_vecinos)
+        )))
+        # Desde aquí se trabaja con ids: asignar FKs por id evita el descriptor relacionado
+        admin, vecinos = vecinos[0].pk, [u.pk for u in vecinos[1:]]
+        # post_save no se dispara con bulk_create, así que los perfiles se crean aquí
+        self._insertar(PerfilUsuario, (PerfilUsuario(_usuario_id=u) for u in [admin, *vecinos]))
+
+        # Actividad sesgada: pocos vecinos muy activos, muchos casi inactivos
+        pesos = [rng.paretovariate(1.2) for _ in vecinos]
+
+        self._insertar(Reporte, (
+            self._reporte(u) for u in self._repartir(vecinos, pesos, POR_VECINO_ANIO["reportes"], anios)
+        ))
+        self._insertar(Multa, (
+            self._multa(u) for u in self._repartir(vecinos, pesos, POR_VECINO_ANIO["multas"], anios)
+        ))
+        self._insertar(Publicacion, (
+            Publicacion(
+                _titulo=f"Aviso a la comunidad #{rng.randint(1, 99999)}",
+                _contenido="Publicación generada para pruebas de escala de Vizinho.",
+                _fecha=self._fecha(),
+                _vecino_id=u,
+            )
+            for u in self._repartir(vecinos, pesos, POR_VECINO_ANIO["publicaciones"], anios)
+        ))
+        self._insertar(BotonPanico, (
+            self._alerta(u, admin) for u in self._repartir(vecinos, pesos, POR_VECINO_ANIO["alertas"], anios)
+        ))
+        self._insertar(ObjetoPerdido, (
+            self._objeto(u) for u in self._repartir(vecinos, pesos, POR_VECINO_ANIO["objetos"], anios)
+        ))
+
+        areas = self._insertar(AreaComun, (
+            AreaComun(
+                _nombre=nombre,
+                _descripcion=f"{nombre} del condominio {c + 1:03d}",
+                _capacidad=capacidad,
+            )
+            for nombre, capacidad in AREAS
+        ))
+        self._insertar(ReservaArea, self._reservas(areas, vecinos, pesos))
+
+    def _reporte(self, vecino):
+        titulo, lugar, categoria = self.rng.choice(TEMAS_REPORTE)
+        fecha = self._fecha()
+        antiguedad = (self.ahora - fecha).days
+        # Los reportes viejos casi siempre están resueltos
+        if antiguedad > 60 or self.rng.random() < 0.3:
+            estado = "Resuelto"
+        else:
+            estado = self.rng.choice(["Recibido", "EnProceso"])
+        # Tiempos de atención con cola larga (lognormal, en horas), sin pasar de ahora
+        en_proceso = resuelto = None
+        if estado in ("EnProceso", "Resuelto"):
+            en_proceso = min(fecha + timedelta(hours=self.rng.lognormvariate(2.5, 1)), self.ahora)
+        if estado == "Resuelto":
+            resuelto = min(en_proceso + timedelta(hours=self.rng.lognormvariate(3.5, 1)), self.ahora)
+        return Reporte(
+            _titulo=titulo,
+            _descripcion=f"{titulo} reportado por un vecino, requiere atención.",
+            _categoria=categoria,
+            _ubicacion=lugar.format(n=self.rng.randint(1, 40)),
+            _estado=estado,
+            _fecha=fecha,
+            _fecha_en_proceso=en_proceso,
+            _fecha_resuelto=resuelto,
+            _vecino_id=vecino,
+        )
+
+    def _multa(self, vecino):
+        fecha = self._fecha()
+        pagada = self.rng.random() < 0.75
+        return Multa(
+            _monto=round(self.rng.choice([50, 100, 150, 250, 500]) * self.rng.uniform(0.8, 1.2), 2),
+            _motivo=self.rng.choice(MOTIVOS_MULTA),
+            _estado="Pagada" if pagada else "Pendiente",
+            _fecha=fecha,
+            _fecha_pago=min(fecha + timedelta(days=self.rng.randint(0, 45)), self.ahora) if pagada else None,
+            _vecino_id=vecino,
+        )
+
+    def _alerta(self, vecino, admin):
+        fecha = self._fecha()
+        activa = (self.ahora - fecha).days < 2 and self.rng.random() < 0.5
+        return BotonPanico(
+            _usuario_id=vecino,
+            _fecha=fecha,
+            _activo=activa,
+            _fecha_desactivacion=None if activa else fecha + timedelta(minutes=self.rng.randint(5, 240)),
+            _desactivado_por_id=None if activa else admin,
+        )
+
+    def _objeto(self, vecino):
+        fecha = self._fecha()
+        encontrado = self.rng.random() < 0.6
+        nombre = self.rng.choice(OBJETOS)
+        color = self.rng.choice(COLORES)
+        return ObjetoPerdido(
+            _titulo=f"{nombre} {color}",
+            _descripcion=f"Se perdió {nombre.lower()} de color {color} cerca de las áreas comunes.",
+            _fecha=fecha,
+            _usuario_id=vecino,
+            _encontrado=encontrado,
+            _fecha_encuentro=fecha + timedelta(days=self.rng.randint(0, 20)) if encontrado else None,
+        )
+
+    def _reservas(self, areas, vecinos, pesos):
+        """Reservas diarias sin traslape: bloques consecutivos dentro de 07:00-22:00."""
+        acumulados = list(itertools.accumulate(pesos))
+        dia = self.inicio.date()
+        while dia <= self.ahora.date():
+            fin_de_semana = dia.weekday() >= 5
+            for area in areas:
+                hora = 7
+                for _ in range(self.rng.randint(0, 4 if fin_de_semana else 2)):
+                    hora += self.rng.randint(0, 3)
+                    duracion = self.rng.randint(1, 3)
+                    if hora + duracion > 22:
+                        break
+                    creado = timezone.make_aware(datetime.combine(dia, dtime(hora))) - timedelta(
+                        days=self.rng.randint(1, 30)
+                    )
+                    yield ReservaArea(
+                        _area_id=area.pk,
+                        _usuario_id=self.rng.choices(vecinos, cum_weights=acumulados)[0],
+                        _fecha=dia,
+                        _hora_inicio=dtime(hora),
+                        _hora_fin=dtime(hora + duracion),
+                        _motivo="Reserva generada",
+                        _creado=creado,
+                    )
+                    hora += duracion
+            dia += timedelta(days=1)
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from core.imagenes import dhash
+from core.models import ObjetoPerdido
+
+
+class Command(BaseCommand):
+    help = "Calcula el hash perceptual de las fotos de objetos que aún no lo tienen."
+
+    def handle(self, *args, **options):
+        pendientes = (
+            ObjetoPerdido._base_manager
+            .filter(_phash__isnull=True)
+            .exclude(_imagen="")
+            .exclude(_imagen__isnull=True)
+            .only("pk", "_imagen")
+        )
+        calculados = fallidos = 0
+        for objeto in pendientes.iterator():
+            try:
+                with objeto._imagen.open("rb") as archivo:
+                    phash = dhash(archivo)
+            except FileNotFoundError:
+                phash = None
+            if phash is None:
+                fallidos += 1
+                continue
+            ObjetoPerdido._base_manager.filter(pk=objeto.pk).update(_phash=phash)
+            calculados += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{calculados} fotos indexadas"))
+        if fallidos:
+            self.stdout.write(self.style.WARNING(f"{fallidos} fotos no se pudieron leer"))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Usuario
+
+TAMANO_LOTE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula las columnas de búsqueda normalizadas de los usuarios "
+        "(usuarios creados antes de esas columnas o con bulk_create)."
+    )
+
+    def handle(self, *args, **options):
+        campos = list(Usuario.CAMPOS_BUSQUEDA)
+        copias = list(Usuario.CAMPOS_BUSQUEDA.values())
+        usuarios = Usuario._base_manager.only("pk", *campos, *copias).order_by("pk")
+        lote, actualizados = [], 0
+        for usuario in usuarios.iterator(chunk_size=TAMANO_LOTE):
+            antes = [getattr(usuario, c) for c in copias]
+            usuario.actualizar_busqueda()
+            if [getattr(usuario, c) for c in copias] != antes:
+                lote.append(usuario)
+            if len(lote) >= TAMANO_LOTE:
+                actualizados += self._guardar(lote, copias)
+                lote = []
+        actualizados += self._guardar(lote, copias)
+        self.stdout.write(self.style.SUCCESS(f"{actualizados} usuarios indexados"))
+
+    def _guardar(self, lote, copias):
+        with transaction.atomic():
+            Usuario._base_manager.bulk_update(lote, copias)
+        return len(lote)
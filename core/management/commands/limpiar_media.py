@@ -0,0 +1,85 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.utils import timezone
+
+from core.almacenamiento import es_blob
+from core.models import BlobMedia
+
+
+class Command(BaseCommand):
+    help = "Borra del disco, por lotes, los blobs de media que ya no tienen referencias."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=200)
+        parser.add_argument(
+            "--gracia-dias", type=float, default=getattr(settings, "MEDIA_GRACIA_DIAS", 1),
+            help="Solo borra blobs sin referencias desde hace al menos estos días",
+        )
+        parser.add_argument(
+            "--recontar", action="store_true",
+            help="Recalcula las referencias recorriendo todos los campos de archivo antes de limpiar",
+        )
+
+    def handle(self, *args, **options):
+        if options["recontar"]:
+            self._recontar()
+
+        limite = timezone.now() - timedelta(days=options["gracia_dias"])
+        huerfanos = BlobMedia.objects.filter(_referencias__lte=0, _actualizado__lt=limite)
+        borrados = liberados = 0
+        ultimo = 0
+        while True:
+            lote = list(
+                huerfanos.filter(pk__gt=ultimo).order_by("pk").values_list("pk", flat=True)[:options["lote"]]
+            )
+            if not lote:
+                break
+            ultimo = lote[-1]
+            with transaction.atomic():
+                # La condición se vuelve a evaluar con la fila bloqueada: una subida
+                # simultánea del mismo contenido pudo sumar una referencia o renovarla
+                blobs = list(BlobMedia.objects.select_for_update().filter(
+                    pk__in=lote, _referencias__lte=0, _actualizado__lt=limite
+                ))
+                BlobMedia.objects.filter(pk__in=[blob.pk for blob in blobs]).delete()
+                # Los archivos, solo si el borrado de las filas se confirma
+                nombres = [blob.nombre for blob in blobs]
+                transaction.on_commit(lambda nombres=nombres: self._borrar_archivos(nombres))
+            borrados += len(blobs)
+            liberados += sum(blob.tamano for blob in blobs)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{borrados} blobs borrados ({liberados / 1024 / 1024:.1f} MB liberados)"
+        ))
+
+    @staticmethod
+    def _borrar_archivos(nombres):
+        for nombre in nombres:
+            default_storage.borrar_blob(nombre)
+
+    def _recontar(self):
+        """Referencias reales: cuántas filas de cada FileField apuntan a cada blob."""
+        conteo = Counter()
+        for modelo in apps.get_app_config("core").get_models():
+            for campo in modelo._meta.concrete_fields:
+                if not isinstance(campo, models.FileField):
+                    continue
+                nombres = modelo._base_manager.filter(**{f"{campo.attname}__startswith": "blobs/"})
+                for nombre in nombres.values_list(campo.attname, flat=True).iterator():
+                    if es_blob(nombre):
+                        conteo[nombre] += 1
+
+        ahora = timezone.now()
+        corregidos = 0
+        for blob in BlobMedia.objects.iterator():
+            reales = conteo.get(blob.nombre, 0)
+            if reales != blob.referencias:
+                BlobMedia.objects.filter(pk=blob.pk).update(_referencias=reales, _actualizado=ahora)
+                corregidos += 1
+        self.stdout.write(f"{corregidos} blobs con referencias corregidas")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.models import PurgaUsuario
+from core.purga import ejecutar_purga, TAMANO_LOTE
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta las purgas de usuarios pendientes o interrumpidas "
+        "(por ejemplo, si el servidor se reinició a mitad de una purga)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=TAMANO_LOTE,
+                            help="Filas a borrar por transacción")
+        parser.add_argument("--fallidas", action="store_true",
+                            help="Reintenta también las purgas que terminaron con error")
+
+    def handle(self, *args, **options):
+        estados = ["Pendiente", "EnProceso"] + (["Fallida"] if options["fallidas"] else [])
+        pendientes = PurgaUsuario._base_manager.filter(_estado__in=estados).order_by("_creado")
+
+        for purga in pendientes:
+            self.stdout.write(f"Purgando {purga.username}...")
+            purga = ejecutar_purga(purga.pk, tamano_lote=options["lote"])
+            resumen = ", ".join(f"{k}: {v}" for k, v in purga.progreso.items()) or "sin contenido"
+            if purga.estado == "Completada":
+                self.stdout.write(self.style.SUCCESS(f"  {purga.username} eliminado ({resumen})"))
+            else:
+                self.stdout.write(self.style.ERROR(f"  {purga.username} falló: {purga.error}"))
@@ -0,0 +1,347 @@
+"""
+Prueba de carga contra un servidor local de Vizinho.
+
+Simula N vecinos concurrentes que inician sesión por LoginView (con CSRF) y
+recorren una mezcla ponderada de las rutas de core/urls.py. Al final muestra
+percentiles de latencia y throughput por ruta, guarda el resultado en JSON y lo
+compara con la corrida anterior.
+
+Solo usa la biblioteca estándar, así que puede correr contra cualquier servidor:
+
+    VIZINHO_LIMITES=0 python manage.py runserver &
+    python manage.py prueba_carga --usuarios 50 --duracion 60 \\
+        --credenciales vecino1:clave123,vecino2:clave123
+
+Todos los vecinos virtuales salen de la misma IP: con los límites de
+frecuencia activos (core/limites.py) la mayoría de los logins recibiría 429.
+"""
+
+import http.cookiejar
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+
+RE_CSRF = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+RE_PAGAR = re.compile(r'/multas/(\d+)/pagar/')
+RE_AREA = re.compile(r'<select name="_area"[^>]*>(.*?)</select>', re.S)
+RE_OPCION = re.compile(r'<option value="(\d+)"')
+
+# Vocabulario de los reportes sintéticos. Con textos al azar de estas palabras
+# dos reportes casi nunca pasan el umbral de duplicados (core/duplicados.py):
+# un texto fijo haría que CrearReporte respondiera casi siempre con la pantalla
+# de "¿es el mismo incidente?" en lugar de crear el reporte.
+PALABRAS_REPORTE = (
+    "fuga agua luz foco pasillo portón ascensor basura ruido perro estacionamiento "
+    "escalera piscina jardín cerca timbre cámara reja techo goteo puerta bomba "
+    "cable poste bache grieta humo olor plaga rata mosquito vidrio ventana buzón "
+    "tubería drenaje alcantarilla grafiti banca juego columpio árbol rama hoja "
+    "lámpara interruptor enchufe medidor tanque cisterna motor alarma sensor"
+).split()
+
+
+# ========================
+# MODELO DE TRÁFICO
+# ========================
+
+# (nombre de la URL, peso relativo). Los pesos aproximan el uso real:
+# la mayoría de visitas son lecturas del dashboard y las listas.
+MEZCLA_TRAFICO = [
+    ("dashboard", 30),
+    ("lista_reportes", 14),
+    ("lista_multas", 10),
+    ("lista_publicaciones", 12),
+    ("lista_objetos_perdidos", 6),
+    ("historial_panico", 4),
+    ("lista_areas", 5),
+    ("crear_reporte", 8),
+    ("pagar_multa", 4),
+    ("activar_panico", 2),
+    ("crear_reserva", 5),
+]
+
+
+class RespuestaHTTP:
+    def __init__(self, estado, cuerpo, url, ms=0.0, destino=""):
+        self.estado = estado
+        self.cuerpo = cuerpo
+        self.url = url
+        # Latencia solo de esta petición, sin los GET previos de la acción
+        self.ms = ms
+        # Cabecera Location de una redirección
+        self.destino = destino
+
+
+class SinRedirecciones(urllib.request.HTTPRedirectHandler):
+    """Devuelve el 3xx tal cual (urllib lo entrega como HTTPError)."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class VecinoVirtual:
+    """Un usuario simulado con su propia sesión (cookies) y su propio RNG."""
+
+    def __init__(self, base_url, username, password, semilla, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.rng = random.Random(semilla)
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        # Sin seguir redirecciones: la latencia de un POST no incluye el GET de destino
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), SinRedirecciones
+        )
+
+    # ===== HTTP =====
+
+    def _csrf(self):
+        for cookie in self.cookies:
+            if cookie.name == settings.CSRF_COOKIE_NAME:
+                return cookie.value
+        return ""
+
+    def pedir(self, ruta, datos=None):
+        url = self.base_url + ruta
+        cuerpo = None
+        cabeceras = {"Referer": url}
+        if datos is not None:
+            datos = dict(datos, csrfmiddlewaretoken=self._csrf())
+            cuerpo = urllib.parse.urlencode(datos).encode()
+            cabeceras["X-CSRFToken"] = datos["csrfmiddlewaretoken"]
+        peticion = urllib.request.Request(url, data=cuerpo, headers=cabeceras)
+        inicio = time.perf_counter()
+        try:
+            with self.opener.open(peticion, timeout=self.timeout) as r:
+                contenido = r.read().decode("utf-8", "replace")
+                return RespuestaHTTP(r.status, contenido, r.geturl(), self._ms(inicio))
+        except urllib.error.HTTPError as e:
+            return RespuestaHTTP(e.code, "", url, self._ms(inicio), e.headers.get("Location", ""))
+
+    @staticmethod
+    def _ms(inicio):
+        return (time.perf_counter() - inicio) * 1000
+
+    def iniciar_sesion(self):
+        ruta = reverse("login")
+        self.pedir(ruta)
+        r = self.pedir(ruta, {"username": self.username, "password": self.password})
+        # LoginView redirige al dashboard si las credenciales son válidas
+        return r.estado == 302 and not urllib.parse.urlsplit(r.destino).path.endswith(ruta)
+
+    # ===== ACCIONES =====
+
+    def ejecutar(self, nombre):
+        """Ejecuta la acción asociada a la URL `nombre`; None si no aplica."""
+        accion = getattr(self, f"_accion_{nombre}", None)
+        if accion:
+            return accion()
+        return self.pedir(reverse(nombre))
+
+    def _accion_crear_reporte(self):
+        palabras = self.rng.sample(PALABRAS_REPORTE, 12)
+        return self.pedir(reverse("crear_reporte"), {
+            "_titulo": " ".join(palabras[:3]).capitalize(),
+            "_descripcion": " ".join(palabras[3:]).capitalize() + ".",
+            "_ubicacion": f"Calle {self.rng.randint(1, 10_000)}",
+        })
+
+    def _accion_pagar_multa(self):
+        lista = self.pedir(reverse("lista_multas"))
+        pendientes = RE_PAGAR.findall(lista.cuerpo)
+        if not pendientes:
+            return None
+        pk = self.rng.choice(pendientes)
+        return self.pedir(reverse("pagar_multa", args=[pk]), {})
+
+    def _accion_activar_panico(self):
+        return self.pedir(reverse("activar_panico"), {})
+
+    def _accion_crear_reserva(self):
+        formulario = self.pedir(reverse("crear_reserva"))
+        select = RE_AREA.search(formulario.cuerpo)
+        areas = RE_OPCION.findall(select.group(1)) if select else []
+        if not areas:
+            return None
+        dia = date.today() + timedelta(days=self.rng.randint(1, 90))
+        hora = self.rng.randint(7, 20)
+        return self.pedir(reverse("crear_reserva"), {
+            "_area": self.rng.choice(areas),
+            "_fecha": dia.isoformat(),
+            "_hora_inicio": f"{hora:02d}:00",
+            "_hora_fin": f"{hora + 1:02d}:00",
+            "_motivo": "Prueba de carga",
+        })
+
+
+# ========================
+# ESTADÍSTICAS
+# ========================
+
+def percentil(ordenados, p):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not ordenados:
+        return 0.0
+    k = max(0, min(len(ordenados) - 1, math.ceil(p / 100 * len(ordenados)) - 1))
+    return ordenados[k]
+
+
+def resumir(muestras, duracion):
+    resumen = {}
+    for nombre, datos in sorted(muestras.items()):
+        latencias = sorted(ms for ms, _ in datos)
+        errores = sum(1 for _, estado in datos if estado >= 400)
+        resumen[nombre] = {
+            "peticiones": len(datos),
+            "errores": errores,
+            "rps": round(len(datos) / duracion, 2),
+            "media_ms": round(sum(latencias) / len(latencias), 2),
+            "p50_ms": round(percentil(latencias, 50), 2),
+            "p90_ms": round(percentil(latencias, 90), 2),
+            "p95_ms": round(percentil(latencias, 95), 2),
+            "p99_ms": round(percentil(latencias, 99), 2),
+            "max_ms": round(latencias[-1], 2),
+        }
+    return resumen
+
+
+# ========================
+# COMANDO
+# ========================
+
+class Command(BaseCommand):
+    help = "Prueba de carga con vecinos virtuales concurrentes contra un servidor local."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000",
+                            help="URL base del servidor")
+        parser.add_argument("--usuarios", type=int, default=50,
+                            help="Vecinos virtuales concurrentes")
+        parser.add_argument("--duracion", type=float, default=30,
+                            help="Segundos de carga sostenida")
+        parser.add_argument("--credenciales", required=True,
+                            help="Lista usuario:clave separada por comas (se reparten en ronda)")
+        parser.add_argument("--pausa", type=float, default=0.5,
+                            help="Pausa media entre acciones de un vecino (segundos)")
+        parser.add_argument("--semilla", type=int, default=42)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--salida", default=str(Path(settings.BASE_DIR) / "prueba_carga"),
+                            help="Directorio donde se guardan los resultados")
+
+    def handle(self, *args, **opts):
+        credenciales = [c.split(":", 1) for c in opts["credenciales"].split(",") if ":" in c]
+        if not credenciales:
+            raise CommandError("Formato de --credenciales inválido (usuario:clave)")
+
+        nombres = [n for n, _ in MEZCLA_TRAFICO]
+        pesos = [p for _, p in MEZCLA_TRAFICO]
+        muestras = defaultdict(list)
+        candado = threading.Lock()
+        fallos_login = []
+
+        def trabajar(i):
+            username, password = credenciales[i % len(credenciales)]
+            vecino = VecinoVirtual(opts["url"], username, password,
+                                   opts["semilla"] + i, opts["timeout"])
+            inicio = time.perf_counter()
+            if not vecino.iniciar_sesion():
+                fallos_login.append(username)
+                return
+            with candado:
+                muestras["login"].append(((time.perf_counter() - inicio) * 1000, 200))
+
+            while time.perf_counter() < fin:
+                nombre = vecino.rng.choices(nombres, pesos)[0]
+                inicio = time.perf_counter()
+                try:
+                    r = vecino.ejecutar(nombre)
+                except (urllib.error.URLError, OSError):
+                    r = RespuestaHTTP(599, "", "", (time.perf_counter() - inicio) * 1000)
+                if r is not None:
+                    with candado:
+                        muestras[nombre].append((r.ms, r.estado))
+                time.sleep(vecino.rng.expovariate(1 / opts["pausa"]) if opts["pausa"] else 0)
+
+        self.stdout.write(
+            f"{opts['usuarios']} vecinos durante {opts['duracion']:.0f}s contra {opts['url']}..."
+        )
+        inicio_total = time.perf_counter()
+        fin = inicio_total + opts["duracion"]
+        hilos = [threading.Thread(target=trabajar, args=(i,), daemon=True)
+                 for i in range(opts["usuarios"])]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        duracion = time.perf_counter() - inicio_total
+
+        if fallos_login:
+            self.stdout.write(self.style.WARNING(
+                f"{len(fallos_login)} vecinos no pudieron iniciar sesión ({', '.join(sorted(set(fallos_login)))})"
+            ))
+        if not muestras:
+            raise CommandError("No se registró ninguna petición")
+
+        resumen = resumir(muestras, duracion)
+        anterior = self._ultima_corrida(Path(opts["salida"]))
+        self._imprimir(resumen, anterior)
+        ruta = self._guardar(Path(opts["salida"]), opts, duracion, resumen)
+        self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {ruta}"))
+
+    # ===== PERSISTENCIA =====
+
+    def _ultima_corrida(self, directorio):
+        archivos = sorted(directorio.glob("corrida-*.json"))
+        if not archivos:
+            return None
+        return json.loads(archivos[-1].read_text())["rutas"]
+
+    def _guardar(self, directorio, opts, duracion, resumen):
+        directorio.mkdir(parents=True, exist_ok=True)
+        ruta = directorio / time.strftime("corrida-%Y%m%d-%H%M%S.json")
+        ruta.write_text(json.dumps({
+            "url": opts["url"],
+            "usuarios": opts["usuarios"],
+            "duracion_s": round(duracion, 2),
+            "mezcla": dict(MEZCLA_TRAFICO),
+            "rutas": resumen,
+        }, indent=2))
+        return ruta
+
+    # ===== REPORTE =====
+
+    def _imprimir(self, resumen, anterior):
+        encabezado = f"{'ruta':<24}{'n':>7}{'err':>5}{'rps':>8}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}"
+        if anterior:
+            encabezado += f"{'Δp50':>9}{'Δp95':>9}{'Δrps':>8}"
+        self.stdout.write(encabezado)
+        self.stdout.write("-" * len(encabezado))
+        for nombre, r in resumen.items():
+            linea = (f"{nombre:<24}{r['peticiones']:>7}{r['errores']:>5}{r['rps']:>8.1f}"
+                     f"{r['p50_ms']:>9.1f}{r['p90_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+            previo = (anterior or {}).get(nombre)
+            if previo:
+                linea += (f"{self._delta(r['p50_ms'], previo['p50_ms']):>9}"
+                          f"{self._delta(r['p95_ms'], previo['p95_ms']):>9}"
+                          f"{self._delta(r['rps'], previo['rps']):>8}")
+            self.stdout.write(linea)
+
+    @staticmethod
+    def _delta(actual, previo):
+        if not previo:
+            return "-"
+        return f"{(actual - previo) / previo * 100:+.0f}%"
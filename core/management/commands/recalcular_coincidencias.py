@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.coincidencias import recalcular_condominio, TOP_K
+from core.models import Condominio
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula desde cero las coincidencias entre objetos perdidos y encontrados "
+        "(matriz completa por condominio)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=TOP_K,
+                            help="Candidatos a guardar por objeto")
+
+    def handle(self, *args, **options):
+        condominios = list(Condominio.objects.values_list("pk", "_nombre"))
+        # Objetos sin condominio (instalaciones anteriores a multi-condominio)
+        condominios.append((None, "sin condominio"))
+        for pk, nombre in condominios:
+            total = recalcular_condominio(pk, k=options["top"])
+            self.stdout.write(f"{nombre}: {total} coincidencias")
+        self.stdout.write(self.style.SUCCESS("Coincidencias recalculadas"))
@@ -0,0 +1,59 @@
+"""
+Copia la base SQLite primaria sobre la réplica local.
+
+Es el reemplazo local de la replicación real: usa la API de backup de SQLite
+(copia consistente aunque haya escrituras en curso) sobre un archivo temporal
+y luego lo renombra de forma atómica, así los lectores nunca ven una copia a medias.
+
+    VIZINHO_REPLICA_DB=db_replica.sqlite3 python manage.py sincronizar_replica --cada 5
+"""
+
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.routers import ALIAS_REPLICA
+
+
+class Command(BaseCommand):
+    help = "Sincroniza la réplica SQLite local copiando la base primaria."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cada", type=float, default=0,
+                            help="Repetir cada N segundos (0 = una sola vez)")
+
+    def handle(self, *args, **opts):
+        bases = settings.DATABASES
+        if ALIAS_REPLICA not in bases:
+            raise CommandError("No hay réplica configurada (define VIZINHO_REPLICA_DB)")
+        for alias in ("default", ALIAS_REPLICA):
+            if bases[alias]["ENGINE"] != "django.db.backends.sqlite3":
+                raise CommandError(f"'{alias}' no es SQLite; usa la replicación del motor")
+
+        origen = str(bases["default"]["NAME"])
+        destino = str(bases[ALIAS_REPLICA]["NAME"])
+        while True:
+            inicio = time.perf_counter()
+            self._copiar(origen, destino)
+            self.stdout.write(f"Réplica sincronizada en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+            if not opts["cada"]:
+                break
+            time.sleep(opts["cada"])
+
+    @staticmethod
+    def _copiar(origen, destino):
+        temporal = f"{destino}.tmp"
+        fuente = sqlite3.connect(origen)
+        copia = sqlite3.connect(temporal)
+        try:
+            fuente.backup(copia)
+            # La primaria usa WAL; la copia vuelve a journal clásico para que
+            # el reemplazo atómico sea un único archivo
+            copia.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            copia.close()
+            fuente.close()
+        os.replace(temporal, destino)
@@ -0,0 +1,364 @@
+"""
+Métricas de Vizinho en formato de texto de Prometheus.
+
+Cada proceso (worker) lleva su propio registro en memoria: incrementar un
+contador u observar un valor en un histograma es una suma en un dict bajo un
+lock, sin E/S. Para que /metrics muestre el total de todos los workers, cada
+proceso vuelca su registro a METRICAS_DIR/<pid>-<inicio_ns>.json como mucho cada
+METRICAS_VOLCADO_SEGUNDOS (y al terminar), y la vista suma todos los archivos.
+Los archivos de procesos terminados se compactan en acumulado.json: así los
+contadores no retroceden cuando un worker se reinicia ni cuando se reusa su pid.
+
+Las métricas HTTP las registra MetricasMiddleware (core/middleware.py) con la
+etiqueta `vista` = nombre de la URL en core/urls.py. Las de negocio se
+incrementan desde los modelos (alertas de pánico, multas pagadas, reservas
+rechazadas por traslape).
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin compactación (en desarrollo hay un solo proceso)
+    fcntl = None
+
+# Segundos; cubren desde una vista cacheada hasta un dashboard lento
+CUBETAS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+# ========================
+# REGISTRO
+# ========================
+
+class Registro:
+    """Valores de todas las métricas de este proceso."""
+
+    def __init__(self):
+        self.metricas = {}
+        self.contadores = {}
+        self.histogramas = {}
+        self.lock = threading.Lock()
+        self.volcado = 0.0
+        self.pid = None
+        self.inicio_ns = 0
+
+    def registrar(self, metrica):
+        self.metricas[metrica.nombre] = metrica
+        return metrica
+
+    def sumar(self, nombre, etiquetas, valor):
+        clave = (nombre, etiquetas)
+        with self.lock:
+            self.contadores[clave] = self.contadores.get(clave, 0) + valor
+
+    def observar(self, nombre, etiquetas, cubetas, valor):
+        clave = (nombre, etiquetas)
+        indice = bisect_left(cubetas, valor)
+        with self.lock:
+            datos = self.histogramas.get(clave)
+            if datos is None:
+                # Conteo por cubeta (+Inf al final), suma y total
+                datos = self.histogramas[clave] = [[0] * (len(cubetas) + 1), 0.0, 0]
+            datos[0][indice] += 1
+            datos[1] += valor
+            datos[2] += 1
+
+    def instantanea(self):
+        with self.lock:
+            return {
+                "contadores": [[n, list(e), v] for (n, e), v in self.contadores.items()],
+                "histogramas": [
+                    [n, list(e), list(d[0]), d[1], d[2]] for (n, e), d in self.histogramas.items()
+                ],
+            }
+
+    # ===== AGREGACIÓN ENTRE WORKERS =====
+
+    def archivo(self):
+        """
+        Nombre del archivo de este proceso. El instante de inicio distingue a un
+        proceso nuevo que reusa el pid de uno terminado; se recalcula tras un
+        fork (gunicorn --preload importa el módulo en el proceso maestro).
+        """
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.inicio_ns = time.time_ns()
+        return f"{self.pid}-{self.inicio_ns}.json"
+
+    def volcar(self, forzar=False):
+        """Escribe el registro en METRICAS_DIR/<pid>-<inicio_ns>.json (atómico con os.replace)."""
+        directorio = directorio_metricas()
+        if directorio is None:
+            return
+        ahora = time.monotonic()
+        if not forzar and ahora - self.volcado < settings.METRICAS_VOLCADO_SEGUNDOS:
+            return
+        self.volcado = ahora
+        directorio.mkdir(parents=True, exist_ok=True)
+        destino = directorio / self.archivo()
+        temporal = directorio / f".{destino.stem}.tmp"
+        temporal.write_text(json.dumps(self.instantanea()))
+        os.replace(temporal, destino)
+
+
+def directorio_metricas():
+    directorio = getattr(settings, "METRICAS_DIR", None)
+    return Path(directorio) if directorio else None
+
+
+registro = Registro()
+
+
+def _volcar_al_salir():
+    # Los comandos de manage.py no registran nada y no deben dejar archivos
+    if not registro.contadores and not registro.histogramas:
+        return
+    try:
+        registro.volcar(forzar=True)
+    except Exception:
+        pass
+
+
+atexit.register(_volcar_al_salir)
+
+
+# ========================
+# TIPOS DE MÉTRICA
+# ========================
+
+class Contador:
+    tipo = "counter"
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        registro.registrar(self)
+
+    def inc(self, valor=1, **etiquetas):
+        registro.sumar(self.nombre, tuple(str(etiquetas[e]) for e in self.etiquetas), valor)
+
+
+class Histograma:
+    tipo = "histogram"
+
+    def __init__(self, nombre, ayuda, etiquetas=(), cubetas=CUBETAS_SEGUNDOS):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.cubetas = tuple(cubetas)
+        registro.registrar(self)
+
+    def observar(self, valor, **etiquetas):
+        registro.observar(
+            self.nombre, tuple(str(etiquetas[e]) for e in self.etiquetas), self.cubetas, valor
+        )
+
+
+# ===== HTTP =====
+REQUESTS = Contador(
+    "vizinho_http_requests_total", "Requests atendidas.", ("vista", "metodo", "estado")
+)
+DURACION = Histograma(
+    "vizinho_http_duracion_segundos", "Duración de la request.", ("vista", "metodo")
+)
+DURACION_DB = Histograma(
+    "vizinho_db_duracion_segundos", "Tiempo en consultas SQL por request.", ("vista",)
+)
+CONSULTAS_DB = Contador(
+    "vizinho_db_consultas_total", "Consultas SQL ejecutadas.", ("vista",)
+)
+CACHE = Contador(
+    "vizinho_cache_lecturas_total", "Lecturas de caché por resultado.", ("uso", "resultado")
+)
+
+# ===== NEGOCIO =====
+ALERTAS_PANICO = Contador(
+    "vizinho_alertas_panico_total", "Pulsaciones del botón de pánico.", ("resultado",)
+)
+MULTAS_PAGADAS = Contador("vizinho_multas_pagadas_total", "Multas pagadas.")
+RESERVAS_RECHAZADAS = Contador(
+    "vizinho_reservas_rechazadas_total", "Reservas rechazadas por traslape de horario."
+)
+
+
+# ========================
+# EXPOSICIÓN
+# ========================
+
+def _sumar_instantaneas(instantaneas):
+    contadores, histogramas = {}, {}
+    for datos in instantaneas:
+        for nombre, etiquetas, valor in datos["contadores"]:
+            clave = (nombre, tuple(etiquetas))
+            contadores[clave] = contadores.get(clave, 0) + valor
+        for nombre, etiquetas, cubetas, suma, total in datos["histogramas"]:
+            clave = (nombre, tuple(etiquetas))
+            actual = histogramas.setdefault(clave, [[0] * len(cubetas), 0.0, 0])
+            actual[0] = [a + b for a, b in zip(actual[0], cubetas)]
+            actual[1] += suma
+            actual[2] += total
+    return contadores, histogramas
+
+
+def _leer(archivo):
+    try:
+        return json.loads(archivo.read_text())
+    except (OSError, ValueError):
+        # Un worker pudo borrarlo o estar escribiéndolo; se lee en el próximo scrape
+        return None
+
+
+def agregado():
+    """Valores sumados de todos los workers (o solo de este, sin METRICAS_DIR)."""
+    directorio = directorio_metricas()
+    if directorio is None:
+        return _sumar_instantaneas([registro.instantanea()])
+
+    registro.volcar(forzar=True)
+    compactar(directorio)
+    acumulado = _leer(directorio / ACUMULADO)
+    # Un archivo ya sumado al acumulado puede seguir ahí si otro proceso aún no lo borró
+    absorbidos = set(acumulado["absorbidos"]) if acumulado else set()
+    instantaneas = [acumulado] if acumulado else []
+    for archivo in _archivos_de_procesos(directorio):
+        if archivo.name in absorbidos:
+            continue
+        datos = _leer(archivo)
+        if datos is not None:
+            instantaneas.append(datos)
+    return _sumar_instantaneas(instantaneas)
+
+
+# ===== COMPACTACIÓN =====
+
+ACUMULADO = "acumulado.json"
+
+
+def _archivos_de_procesos(directorio):
+    return (archivo for archivo in directorio.glob("*.json") if archivo.name != ACUMULADO)
+
+
+def _vivo(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Existe, pero es de otro usuario
+        return True
+    return True
+
+
+def _terminados(directorio):
+    """
+    Archivos de procesos terminados: su pid ya no existe, o lo reusa un proceso
+    más nuevo que ya escribió su propio archivo.
+    """
+    por_pid = {}
+    for archivo in _archivos_de_procesos(directorio):
+        # <pid>.json es el formato anterior, sin instante de inicio
+        pid, _, inicio = archivo.stem.partition("-")
+        if pid.isdigit() and (inicio.isdigit() or not inicio):
+            por_pid.setdefault(int(pid), []).append((int(inicio or 0), archivo))
+    terminados = []
+    for pid, archivos in por_pid.items():
+        archivos.sort()
+        if pid == os.getpid() or _vivo(pid):
+            # El más reciente es el del proceso vivo
+            archivos = archivos[:-1]
+        terminados.extend(archivo for _, archivo in archivos)
+    return terminados
+
+
+def compactar(directorio):
+    """
+    Suma los archivos de procesos terminados a acumulado.json y los borra. El
+    acumulado guarda qué archivos ya absorbió: si el proceso muere entre
+    escribirlo y borrar los archivos, la próxima compactación no los suma dos veces.
+    Un solo proceso compacta a la vez (flock); los demás leen sin esperar.
+    """
+    if fcntl is None:
+        return
+    with open(directorio / ".compactar.lock", "a") as cerrojo:
+        try:
+            fcntl.flock(cerrojo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return
+        terminados = _terminados(directorio)
+        if not terminados:
+            return
+        anterior = _leer(directorio / ACUMULADO) or {"contadores": [], "histogramas": [], "absorbidos": []}
+        absorbidos = set(anterior["absorbidos"])
+        nuevos = []
+        for archivo in terminados:
+            if archivo.name in absorbidos:
+                continue
+            datos = _leer(archivo)
+            if datos is not None:
+                nuevos.append(datos)
+        contadores, histogramas = _sumar_instantaneas([anterior, *nuevos])
+        acumulado = {
+            "contadores": [[n, list(e), v] for (n, e), v in contadores.items()],
+            "histogramas": [[n, list(e), *d] for (n, e), d in histogramas.items()],
+            "absorbidos": [archivo.name for archivo in terminados],
+        }
+        temporal = directorio / ".acumulado.tmp"
+        temporal.write_text(json.dumps(acumulado))
+        os.replace(temporal, directorio / ACUMULADO)
+        for archivo in terminados:
+            archivo.unlink(missing_ok=True)
+
+
+def _escapar(valor):
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas(nombres, valores, extra=()):
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)] + list(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def exponer(medidores=()):
+    """
+    Texto de exposición de Prometheus (versión 0.0.4).
+    `medidores` son (nombre, ayuda, valor) calculados al momento del scrape.
+    """
+    contadores, histogramas = agregado()
+    lineas = []
+    for metrica in registro.metricas.values():
+        lineas.append(f"# HELP {metrica.nombre} {metrica.ayuda}")
+        lineas.append(f"# TYPE {metrica.nombre} {metrica.tipo}")
+        if metrica.tipo == "counter":
+            for (nombre, valores), valor in sorted(contadores.items()):
+                if nombre == metrica.nombre:
+                    lineas.append(f"{nombre}{_etiquetas(metrica.etiquetas, valores)} {_numero(valor)}")
+            continue
+        for (nombre, valores), (cubetas, suma, total) in sorted(histogramas.items()):
+            if nombre != metrica.nombre:
+                continue
+            acumulado = 0
+            limites = [_numero(float(c)) for c in metrica.cubetas] + ["+Inf"]
+            for limite, conteo in zip(limites, cubetas):
+                acumulado += conteo
+                etiquetas = _etiquetas(metrica.etiquetas, valores, [f'le="{limite}"'])
+                lineas.append(f"{nombre}_bucket{etiquetas} {acumulado}")
+            lineas.append(f"{nombre}_sum{_etiquetas(metrica.etiquetas, valores)} {_numero(suma)}")
+            lineas.append(f"{nombre}_count{_etiquetas(metrica.etiquetas, valores)} {total}")
+    for nombre, ayuda, valor in medidores:
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} gauge")
+        lineas.append(f"{nombre} {_numero(valor)}")
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,177 @@
+"""
+Middlewares propios de Vizinho.
+Se registran en MIDDLEWARE (vizinho/settings.py) después de AuthenticationMiddleware,
+ya que dependen de request.user. MetricasMiddleware va primero para medir la
+request completa.
+"""
+
+import random
+import threading
+import time
+
+from django.conf import settings
+
+from . import consultas_lentas, metricas, perfilador
+
+from .contexto import (
+    SIN_CONDOMINIO, activar_condominio, restaurar_condominio, forzar_primaria, restaurar_primaria,
+    medir_sql,
+)
+
+
+class CondominioMiddleware:
+    """
+    Activa el condominio del usuario autenticado durante todo el request.
+    Los managers por condominio (ver PorCondominioManager) filtran con este valor,
+    así cada administrador solo ve y modifica su propio condominio.
+    Solo un superusuario sin condominio asignado queda sin filtro y ve todo; los
+    anónimos y los usuarios sin condominio reciben SIN_CONDOMINIO y no ven nada.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        condominio_id = SIN_CONDOMINIO
+        if request.user.is_authenticated:
+            if request.user.condominio_id is not None:
+                condominio_id = request.user.condominio_id
+            elif request.user.is_superuser:
+                condominio_id = None
+
+        token = activar_condominio(condominio_id)
+        try:
+            return self.get_response(request)
+        finally:
+            restaurar_condominio(token)
+
+
+class ReplicaMiddleware:
+    """
+    Read-your-writes con réplica de lectura.
+    Después de un request que escribe (POST, PUT, PATCH, DELETE) se guarda una
+    cookie con el instante hasta el cual ese navegador debe leer de la primaria.
+    Mientras no venza, los listados y dashboards ignoran la réplica.
+    """
+
+    COOKIE = "vizinho_primaria"
+    METODOS_SEGUROS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.ventana = getattr(settings, "REPLICA_VENTANA_PRIMARIA", 5)
+
+    def __call__(self, request):
+        try:
+            hasta = float(request.COOKIES.get(self.COOKIE, 0))
+        except ValueError:
+            hasta = 0
+
+        token = forzar_primaria(time.time() < hasta)
+        try:
+            response = self.get_response(request)
+        finally:
+            restaurar_primaria(token)
+
+        if request.method not in self.METODOS_SEGUROS:
+            response.set_cookie(
+                self.COOKIE,
+                f"{time.time() + self.ventana:.3f}",
+                max_age=self.ventana,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class MetricasMiddleware:
+    """
+    Registra por vista (nombre de URL), método y estado: cantidad de requests,
+    duración, tiempo en SQL y número de consultas (ver core/metricas.py).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # [consultas, segundos]; una lista para poder sumar desde el wrapper.
+        # El lock cubre las consultas que el dashboard async lanza en otros hilos
+        sql = [0, 0.0]
+        lock = threading.Lock()
+
+        def medir(execute, *args):
+            inicio = time.perf_counter()
+            try:
+                return execute(*args)
+            finally:
+                duracion = time.perf_counter() - inicio
+                with lock:
+                    sql[0] += 1
+                    sql[1] += duracion
+
+        inicio = time.perf_counter()
+        with medir_sql(lambda conexion: medir):
+            response = self.get_response(request)
+        duracion = time.perf_counter() - inicio
+
+        ruta = request.resolver_match
+        vista = ruta.url_name if ruta is not None and ruta.url_name else "sin_ruta"
+        metricas.REQUESTS.inc(vista=vista, metodo=request.method, estado=response.status_code)
+        metricas.DURACION.observar(duracion, vista=vista, metodo=request.method)
+        metricas.DURACION_DB.observar(sql[1], vista=vista)
+        metricas.CONSULTAS_DB.inc(sql[0], vista=vista)
+        metricas.registro.volcar()
+        return response
+
+
+class ConsultasLentasMiddleware:
+    """
+    Registra las consultas que superan settings.CONSULTAS_LENTAS_MS junto con
+    la vista que las lanzó (ver core/consultas_lentas.py). None lo desactiva.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.CONSULTAS_LENTAS_MS is None:
+            return self.get_response(request)
+        with medir_sql(lambda conexion: consultas_lentas.medidor(conexion, request)):
+            return self.get_response(request)
+
+
+class PerfiladorMiddleware:
+    """
+    Perfila con core/perfilador.py las requests marcadas: las de un
+    superusuario que envía la cabecera X-Vizinho-Perfil o tiene la cookie
+    vizinho_perfil, y una fracción PERFILADOR_MUESTRA de todas las demás.
+    La respuesta lleva el id del perfil en la cabecera X-Vizinho-Perfil.
+    """
+
+    COOKIE = "vizinho_perfil"
+    CABECERA = "HTTP_X_VIZINHO_PERFIL"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _marcada(self, request):
+        if request.user.is_authenticated and request.user.is_superuser:
+            if request.META.get(self.CABECERA) or request.COOKIES.get(self.COOKIE):
+                return True
+        return random.random() < settings.PERFILADOR_MUESTRA
+
+    def __call__(self, request):
+        if not self._marcada(request):
+            return self.get_response(request)
+
+        muestreador = perfilador.Muestreador(threading.get_ident(), PerfiladorMiddleware.__call__.__code__)
+        muestreador.iniciar()
+        try:
+            response = self.get_response(request)
+            # Una TemplateResponse se renderiza más adelante; se fuerza aquí para medirla
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        finally:
+            muestreador.detener()
+        response["X-Vizinho-Perfil"] = perfilador.guardar(muestreador, request, response)
+        return response
@@ -16,20 +16,106 @@ intercambiablemente sin romper la funcionalidad esperada. Esto es importante par
 y facilitar futuras extensiones o modificaciones en los modelos.
 """
 
-from django.db import models
-from django.contrib.auth.models import AbstractUser
+import asyncio
+import unicodedata
+import uuid
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import models, close_old_connections, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import Substr
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from . import geohash, metricas, paginacion
+from .contexto import condominio_actual, en_replica, medidores_en_hilo
+
 
 # ========================
 # CUSTOM MANAGERS
 # ========================
 
-class ReporteManager(models.Manager):    
+class PorCondominioManager(models.Manager):
+    """
+    Manager base multi-condominio: filtra automáticamente por el condominio
+    activo del request (ver core/contexto.py y CondominioMiddleware).
+    Sin condominio activo (superusuario global, comandos) no aplica filtro; con
+    SIN_CONDOMINIO el filtro no coincide con ninguna fila.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        condominio_id = condominio_actual()
+        if condominio_id is not None:
+            queryset = queryset.filter(_condominio_id=condominio_id)
+        return queryset
+
+    def de_todos_los_condominios(self):
+        """Escape explícito del filtro, para tareas globales."""
+        return super().get_queryset()
+
+
+def normalizar_busqueda(texto):
+    """
+    Minúsculas y sin tildes ("Ñuñez" → "nunez"). Se hace en Python al guardar y
+    al buscar, no con LOWER() en la base: el LOWER de SQLite solo pasa a
+    minúsculas las letras ASCII y "ñu" no encontraría "Ñuñez".
+    """
+    texto = unicodedata.normalize("NFKD", (texto or "").casefold())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+class UsuarioManager(UserManager):
+    """
+    Los usuarios NO se filtran automáticamente: la autenticación y la sesión
+    necesitan encontrarlos antes de conocer su condominio. Las consultas de
+    listados usan vecinos() que sí respeta el condominio activo.
+    """
+
+    def del_condominio_actual(self):
+        queryset = self.get_queryset()
+        condominio_id = condominio_actual()
+        if condominio_id is not None:
+            queryset = queryset.filter(_condominio_id=condominio_id)
+        return queryset
+
+    def vecinos(self):
+        return self.del_condominio_actual().filter(_rol="vecino")
+
+    def buscar_vecinos(self, texto, limite=20):
+        """
+        Vecinos del condominio activo cuyo username, nombre, apellido o unidad
+        empieza con `texto`, sin distinguir mayúsculas ni tildes. Retorna hasta
+        `limite` ordenados por username.
+
+        Cada columna se busca por separado como un rango sobre el índice de su
+        copia normalizada (Usuario.CAMPOS_BUSQUEDA): con un OR, SQLite prefiere
+        recorrer el índice de username para el ORDER BY y revisa todos los
+        vecinos del condominio.
+        """
+        prefijo = normalizar_busqueda(texto.strip())
+        if not prefijo:
+            return []
+        # Todo texto que empieza con el prefijo queda entre prefijo y prefijo + U+FFFF
+        hasta = prefijo + "\uffff"
+        encontrados = {}
+        for campo in self.model.CAMPOS_BUSQUEDA.values():
+            coincidencias = (
+                self.vecinos()
+                .filter(**{f"{campo}__gte": prefijo, f"{campo}__lt": hasta})
+                .order_by(campo)[:limite]
+            )
+            for vecino in coincidencias:
+                encontrados[vecino.pk] = vecino
+        return sorted(encontrados.values(), key=lambda v: v.username)[:limite]
+
+
+class ReporteManager(PorCondominioManager):    
     """Manager especializado para filtrar reportes por estado o usuario."""
     
     def pendientes(self):
@@ -45,8 +131,121 @@ class ReporteManager(models.Manager):
         """Filtra reportes asociados a un usuario específico."""
         return self.filter(_vecino=usuario)
 
+    def transicionar(self, ids, destino, usuario=None):
+        """
+        Aplica a varios reportes la misma regla de estados que marcar_en_proceso()
+        y marcar_resuelto(), con un único UPDATE condicional sobre _estado.
+        Los reportes cuyo estado actual no permite la transición se omiten.
+        Los eventos de los actualizados se insertan en un solo lote.
 
-class MultaManager(models.Manager):
+        Retorna {pk: (resultado, estado_anterior)} con resultado
+        "actualizado", "omitido" o "no_encontrado".
+        """
+        origenes = Reporte.TRANSICIONES[destino]
+        ids = {int(pk) for pk in ids}
+        with transaction.atomic():
+            # Bloquea las filas (PostgreSQL) para que el resultado reportado coincida con el UPDATE
+            filas = list(
+                self.select_for_update().filter(pk__in=ids).values_list("pk", "_estado", "_condominio_id")
+            )
+            anteriores = {pk: estado for pk, estado, _ in filas}
+            self.filter(pk__in=ids, _estado__in=origenes).update(
+                _estado=destino, **{Reporte.FECHAS[destino]: timezone.now()}
+            )
+            EventoDominio.objects.registrar_lote(Reporte.EVENTOS[destino], self.model, [
+                (pk, condominio_id, {"desde": estado})
+                for pk, estado, condominio_id in filas if estado in origenes
+            ], actor=usuario)
+        # update() no dispara señales: los conteos por estado quedan obsoletos
+        for condominio_id in {cid for _, _, cid in filas}:
+            paginacion.invalidar(self.model, condominio_id)
+
+        resultados = {}
+        for pk in sorted(ids):
+            estado = anteriores.get(pk)
+            if estado is None:
+                resultados[pk] = ("no_encontrado", None)
+            elif estado in origenes:
+                resultados[pk] = ("actualizado", estado)
+            else:
+                resultados[pk] = ("omitido", estado)
+        return resultados
+
+    def fusionar(self, ids, usuario=None):
+        """
+        Fusiona reportes que describen el mismo incidente. El más antiguo queda
+        como principal; el resto pasa a 'Resuelto' apuntando a él y sus apoyos
+        (más uno por cada reporte fusionado) se suman al principal.
+        Retorna (principal, fusionados) o (None, 0) si hay menos de dos abiertos.
+        """
+        with transaction.atomic():
+            abiertos = list(
+                self.select_for_update()
+                .filter(pk__in=ids, _duplicado_de__isnull=True)
+                .exclude(_estado="Resuelto")
+                .order_by("_fecha", "pk")
+            )
+            if len(abiertos) < 2:
+                return None, 0
+            principal, resto = abiertos[0], abiertos[1:]
+            apoyos = sum(r._apoyos + 1 for r in resto)
+            self.filter(pk__in=[r.pk for r in resto]).update(
+                _duplicado_de=principal, _estado="Resuelto", _fecha_resuelto=timezone.now()
+            )
+            self.filter(pk=principal.pk).update(_apoyos=models.F("_apoyos") + apoyos)
+            EventoDominio.objects.registrar_lote("reporte_fusionado", self.model, [
+                (r.pk, r._condominio_id, {"desde": r._estado, "principal": principal.pk})
+                for r in resto
+            ], actor=usuario)
+            principal.refresh_from_db(fields=["_apoyos"])
+        paginacion.invalidar(self.model, principal._condominio_id)
+        return principal, len(resto)
+
+    def cercanos(self, lat, lon, radio_m=100):
+        """
+        Reportes a menos de `radio_m` metros de (lat, lon), ordenados por distancia.
+        Primero se filtra por prefijos de celda (índice sobre _celda) y solo a
+        esos candidatos se les calcula la distancia exacta.
+        """
+        filtro = Q()
+        for prefijo in geohash.prefijos_cercanos(lat, lon, radio_m):
+            # Rango en vez de LIKE: SQLite no usa el índice con LIKE 'prefijo%'
+            filtro |= Q(_celda__gte=prefijo, _celda__lt=prefijo + "~")
+
+        cercanos = []
+        for reporte in self.filter(filtro).select_related("_vecino"):
+            distancia = geohash.distancia_m(lat, lon, reporte._latitud, reporte._longitud)
+            if distancia <= radio_m:
+                reporte.distancia_m = distancia
+                cercanos.append(reporte)
+        return sorted(cercanos, key=lambda r: r.distancia_m)
+
+    def mapa_calor(self, precision=7):
+        """
+        Conteo de reportes por celda (prefijo de `precision` caracteres) y estado,
+        resuelto con un único GROUP BY. Retorna una fila por celda con su centro.
+        """
+        filas = (
+            self.exclude(_celda="")
+            .annotate(celda=Substr("_celda", 1, precision))
+            .values("celda", "_estado")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        celdas = {}
+        for fila in filas:
+            celda = celdas.get(fila["celda"])
+            if celda is None:
+                lat, lon = geohash.centro(fila["celda"])
+                celda = celdas[fila["celda"]] = {
+                    "celda": fila["celda"], "lat": lat, "lon": lon, "total": 0, "estados": {},
+                }
+            celda["estados"][fila["_estado"]] = fila["total"]
+            celda["total"] += fila["total"]
+        return sorted(celdas.values(), key=lambda c: -c["total"])
+
+
+class MultaManager(PorCondominioManager):
     """Manager con operaciones agregadas de negocio (pendientes, pagadas, totales)."""    
     
     def pendientes(self):
@@ -70,6 +269,143 @@ class MultaManager(models.Manager):
         return resultado['total'] or 0
 
 
+class ReservaAreaManager(PorCondominioManager):
+    """Detección de traslapes y creación de reservas recurrentes en bloque."""
+
+    def traslapadas(self, area, fechas, hora_inicio, hora_fin, excluir_pk=None):
+        """
+        Retorna el conjunto de fechas (de `fechas`) en las que ya existe una reserva
+        del área que se cruza con el horario. Una sola consulta para todas las fechas.
+        """
+        reservas = self.filter(
+            _area=area,
+            _fecha__in=list(fechas),
+            _hora_inicio__lt=hora_fin,
+            _hora_fin__gt=hora_inicio,
+        )
+        if excluir_pk is not None:
+            reservas = reservas.exclude(pk=excluir_pk)
+        return set(reservas.values_list("_fecha", flat=True))
+
+    def crear_serie(self, plantilla, fechas):
+        """
+        Crea una reserva por fecha copiando la plantilla (área, usuario, horario, motivo).
+        Las fechas que chocan se omiten. Retorna (reservas_creadas, fechas_en_conflicto).
+
+        Una reserva concurrente en el mismo horario puede insertarse entre la
+        consulta de traslapes y el INSERT: ignore_conflicts la salta en lugar de
+        fallar con IntegrityError y la fecha cuenta como conflicto.
+        """
+        fechas = sorted(set(fechas))
+        serie = uuid.uuid4()
+        with transaction.atomic():
+            conflictos = self.traslapadas(
+                plantilla._area_id, fechas, plantilla._hora_inicio, plantilla._hora_fin
+            )
+            nuevas = [
+                ReservaArea(
+                    _area_id=plantilla._area_id,
+                    _usuario_id=plantilla._usuario_id,
+                    _fecha=fecha,
+                    _hora_inicio=plantilla._hora_inicio,
+                    _hora_fin=plantilla._hora_fin,
+                    _motivo=plantilla._motivo,
+                    _serie=serie,
+                    # bulk_create no pasa por save()
+                    _condominio_id=plantilla._condominio_id or plantilla._condominio_por_defecto(),
+                )
+                for fecha in fechas if fecha not in conflictos
+            ]
+            self.bulk_create(nuevas, ignore_conflicts=True)
+            # Con ignore_conflicts no se asignan pk: las creadas se leen por su serie
+            creadas = list(self.model._base_manager.filter(_serie=serie).order_by("_fecha"))
+            conflictos |= set(fechas) - {reserva._fecha for reserva in creadas}
+        if conflictos:
+            metricas.RESERVAS_RECHAZADAS.inc(len(conflictos))
+        return creadas, sorted(conflictos)
+
+
+class BotonPanicoManager(PorCondominioManager):
+    """Activación de alertas con antirrebote por usuario."""
+
+    def activar(self, usuario, ventana_segundos):
+        """
+        Crea la alerta del usuario, salvo que ya tenga una activa creada hace
+        menos de `ventana_segundos`: en ese caso la pulsación se suma a esa
+        alerta. Retorna (alerta, creada).
+        """
+        desde = timezone.now() - timedelta(seconds=ventana_segundos)
+        with transaction.atomic():
+            # Bloquear la fila del usuario serializa sus pulsaciones simultáneas
+            Usuario._base_manager.select_for_update().filter(pk=usuario.pk).exists()
+            alerta = (
+                self.model._base_manager
+                .filter(_usuario=usuario, _activo=True, _fecha__gte=desde)
+                .order_by("-_fecha")
+                .first()
+            )
+            if alerta is None:
+                metricas.ALERTAS_PANICO.inc(resultado="creada")
+                return self.create(_usuario=usuario), True
+            metricas.ALERTAS_PANICO.inc(resultado="agrupada")
+            self.model._base_manager.filter(pk=alerta.pk).update(
+                _pulsaciones=models.F("_pulsaciones") + 1
+            )
+            alerta._pulsaciones += 1
+            return alerta, False
+
+
+class EventoDominioManager(PorCondominioManager):
+    """
+    Escritura del registro de eventos. Se llama dentro de la transacción que
+    cambia el estado: el evento existe si y solo si el cambio se confirmó.
+    """
+
+    def _evento(self, tipo, modelo, objeto_id, condominio_id, actor, datos, fecha):
+        return self.model(
+            _tipo=tipo,
+            _modelo=modelo._meta.label_lower,
+            _objeto_id=objeto_id,
+            _condominio_id=condominio_id,
+            # Acepta el usuario o directamente su id
+            _actor_id=getattr(actor, "pk", actor),
+            _datos=datos or {},
+            _fecha=fecha,
+        )
+
+    def registrar(self, tipo, objeto, actor=None, **datos):
+        evento = self._evento(
+            tipo, type(objeto), objeto.pk, objeto._condominio_id, actor, datos, timezone.now()
+        )
+        evento.save()
+        return evento
+
+    def registrar_lote(self, tipo, modelo, filas, actor=None):
+        """
+        Eventos de una operación masiva con un solo INSERT.
+        `filas` son tuplas (pk, condominio_id, datos).
+        """
+        ahora = timezone.now()
+        return self.bulk_create([
+            self._evento(tipo, modelo, pk, condominio_id, actor, datos, ahora)
+            for pk, condominio_id, datos in filas
+        ])
+
+
+class ResumenEventosManager(PorCondominioManager):
+    """Lecturas del resumen diario que mantiene la proyección de eventos."""
+
+    def ultimos_dias(self, dias):
+        """{tipo: total} de los últimos `dias` días (hoy incluido)."""
+        desde = timezone.localdate() - timedelta(days=dias - 1)
+        return dict(
+            self.filter(_dia__gte=desde)
+            .order_by()
+            .values_list("_tipo")
+            .annotate(total=models.Sum("_total"))
+        )
+
+
 # ========================
 # USUARIO BASE
 # ========================
@@ -84,6 +420,56 @@ class Usuario(AbstractUser):
 
     _telefono = models.CharField(max_length=20, null=True, blank=True)
     _rol = models.CharField(max_length=20, choices=ROLES, default="vecino")
+    # Departamento o casa dentro del condominio (p. ej. "B-204")
+    _unidad = models.CharField(max_length=20, blank=True, default="")
+    # Null solo para superusuarios globales (administran todos los condominios)
+    _condominio = models.ForeignKey(
+        "Condominio",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="usuarios"
+    )
+    # Copias normalizadas (normalizar_busqueda) para UsuarioManager.buscar_vecinos;
+    # las llena save(). bulk_create y update() deben llamar a actualizar_busqueda()
+    _busqueda_username = models.CharField(max_length=150, blank=True, default="", editable=False)
+    _busqueda_nombre = models.CharField(max_length=150, blank=True, default="", editable=False)
+    _busqueda_apellido = models.CharField(max_length=150, blank=True, default="", editable=False)
+    _busqueda_unidad = models.CharField(max_length=20, blank=True, default="", editable=False)
+
+    CAMPOS_BUSQUEDA = {
+        "username": "_busqueda_username",
+        "first_name": "_busqueda_nombre",
+        "last_name": "_busqueda_apellido",
+        "_unidad": "_busqueda_unidad",
+    }
+
+    objects = UsuarioManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=["_condominio", "_rol", "username"]),
+            # Búsqueda por prefijo sin mayúsculas ni tildes (UsuarioManager.buscar_vecinos)
+            models.Index(fields=["_condominio", "_rol", "_busqueda_username"], name="usuario_busqueda_username"),
+            models.Index(fields=["_condominio", "_rol", "_busqueda_nombre"], name="usuario_busqueda_nombre"),
+            models.Index(fields=["_condominio", "_rol", "_busqueda_apellido"], name="usuario_busqueda_apellido"),
+            models.Index(fields=["_condominio", "_rol", "_busqueda_unidad"], name="usuario_busqueda_unidad"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.actualizar_busqueda()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            # Si cambia una columna buscable, su copia normalizada se guarda con ella
+            kwargs["update_fields"] = {
+                *update_fields,
+                *(self.CAMPOS_BUSQUEDA[c] for c in update_fields if c in self.CAMPOS_BUSQUEDA),
+            }
+        super().save(*args, **kwargs)
+
+    def actualizar_busqueda(self):
+        for campo, copia in self.CAMPOS_BUSQUEDA.items():
+            setattr(self, copia, normalizar_busqueda(getattr(self, campo)))
 
     # ===== PROPERTIES CON VALIDACIÓN =====
     
@@ -98,6 +484,18 @@ class Usuario(AbstractUser):
             raise ValidationError("El teléfono debe tener al menos 8 dígitos")
         self._telefono = value
 
+    @property
+    def unidad(self):
+        return self._unidad
+
+    @property
+    def condominio(self):
+        return self._condominio
+
+    @property
+    def condominio_id(self):
+        return self._condominio_id
+
     @property
     def rol(self):
         return self._rol
@@ -126,12 +524,21 @@ class Usuario(AbstractUser):
         if self.es_administrador():
             return True
         
-        if hasattr(objeto, '_vecino'):
-            return objeto._vecino == self
-        elif hasattr(objeto, '_usuario'):
-            return objeto._usuario == self
+        # Se comparan ids: acceder a objeto._vecino cargaría el usuario desde la base
+        if hasattr(objeto, '_vecino_id'):
+            return objeto._vecino_id == self.pk
+        elif hasattr(objeto, '_usuario_id'):
+            return objeto._usuario_id == self.pk
         
         return False
+    
+    def desactivar(self):
+        """
+        Deshabilita la cuenta de inmediato (no puede volver a iniciar sesión).
+        El borrado real del usuario y su contenido lo hace la purga en segundo plano.
+        """
+        self.is_active = False
+        self.save(update_fields=["is_active"])
 
     def __str__(self):
         # Se usa get__rol_display() debido al prefijo del campo privado
@@ -149,15 +556,72 @@ class Condominio(models.Model):
     _ubicacion = models.CharField(max_length=200)
     _reglas = models.TextField(null=True, blank=True)
 
+    @property
+    def nombre(self):
+        return self._nombre
+
+    @property
+    def ubicacion(self):
+        return self._ubicacion
+
+    @property
+    def reglas(self):
+        return self._reglas
+
     def __str__(self):
         return f"Condominio: {self._nombre}"
 
 
+class ContenidoDeCondominio(models.Model):
+    """
+    Base abstracta para todo lo que pertenece a un condominio.
+    Aporta la FK, el manager filtrado y asigna el condominio al guardar:
+    primero el del dueño del registro y, si no hay, el condominio activo.
+    Los índices compuestos de cada modelo empiezan por _condominio para que
+    el costo de las consultas no crezca al agregar condominios.
+    """
+
+    # Campo que apunta al dueño del registro (si lo tiene)
+    campo_propietario = None
+    # Si es False se permite guardar sin condominio (p. ej. datos de cuentas globales)
+    condominio_obligatorio = True
+
+    _condominio = models.ForeignKey(
+        Condominio,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+    )
+
+    objects = PorCondominioManager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self._condominio_id is None:
+            self._condominio_id = self._condominio_por_defecto()
+        if self._condominio_id is None and self.condominio_obligatorio:
+            # Sin esto, lo que crea un superusuario global quedaría fuera de todo condominio
+            raise ValidationError(f"{self._meta.verbose_name} requiere un condominio.")
+        super().save(*args, **kwargs)
+
+    def _condominio_por_defecto(self):
+        if self.campo_propietario:
+            propietario = getattr(self, self.campo_propietario, None)
+            if propietario is not None and propietario.condominio_id is not None:
+                return propietario.condominio_id
+        # SIN_CONDOMINIO (0) no es un condominio asignable
+        return condominio_actual() or None
+
+
 # ========================
 # PUBLICACION
 # ========================
 
-class Publicacion(models.Model):
+class Publicacion(ContenidoDeCondominio):
+    campo_propietario = "_vecino"
+
     _titulo = models.CharField(max_length=200)
     _contenido = models.TextField()
     _fecha = models.DateTimeField(auto_now_add=True)
@@ -166,6 +630,9 @@ class Publicacion(models.Model):
     class Meta:
         ordering = ['-_fecha']
         verbose_name_plural = "Publicaciones"
+        indexes = [
+            models.Index(fields=["_condominio", "-_fecha"]),
+        ]
     
     @property
     def titulo(self):
@@ -195,21 +662,82 @@ class Publicacion(models.Model):
 # REPORTE
 # ========================
 
-class Reporte(models.Model):    
+class Reporte(ContenidoDeCondominio):
+    campo_propietario = "_vecino"
+
     ESTADOS = [
         ("Recibido", "Recibido"),
         ("EnProceso", "En proceso"),
         ("Resuelto", "Resuelto"),
     ]
 
+    CATEGORIAS = [
+        ("mantenimiento", "Mantenimiento"),
+        ("alumbrado", "Alumbrado"),
+        ("agua", "Agua y drenaje"),
+        ("limpieza", "Limpieza"),
+        ("seguridad", "Seguridad"),
+        ("ruido", "Ruido y convivencia"),
+        ("otro", "Otro"),
+    ]
+
     _titulo = models.CharField(max_length=200)
     _descripcion = models.TextField()
+    _categoria = models.CharField(max_length=20, choices=CATEGORIAS, default="otro")
     _estado = models.CharField(max_length=20, choices=ESTADOS, default="Recibido")
     _fecha = models.DateTimeField(auto_now_add=True)
+    # Momento de cada transición (ver _transicionar y ReporteManager.transicionar)
+    _fecha_en_proceso = models.DateTimeField(null=True, blank=True, editable=False)
+    _fecha_resuelto = models.DateTimeField(null=True, blank=True, editable=False)
     _ubicacion = models.CharField(max_length=200)
     _vecino = models.ForeignKey(Usuario, on_delete=models.CASCADE, related_name="reportes")
+    # Coordenadas opcionales; _celda es su geohash y se calcula al guardar
+    _latitud = models.FloatField(null=True, blank=True)
+    _longitud = models.FloatField(null=True, blank=True)
+    _celda = models.CharField(max_length=geohash.PRECISION, blank=True, default="", editable=False)
+    # Vecinos que dijeron "a mí también me pasa" en vez de crear otro reporte
+    _apoyos = models.PositiveIntegerField(default=0, editable=False)
+    _apoyado_por = models.ManyToManyField(Usuario, related_name="reportes_apoyados", blank=True)
+    _duplicado_de = models.ForeignKey(
+        "self", on_delete=models.SET_NULL, null=True, blank=True, related_name="duplicados"
+    )
+
+    # Estado destino -> estados desde los que se puede llegar
+    TRANSICIONES = {
+        "EnProceso": ("Recibido",),
+        "Resuelto": ("Recibido", "EnProceso"),
+    }
+    # Estado destino -> tipo de EventoDominio que registra la transición
+    EVENTOS = {
+        "EnProceso": "reporte_en_proceso",
+        "Resuelto": "reporte_resuelto",
+    }
+    # Estado destino -> campo con la fecha en que se llegó a él
+    FECHAS = {
+        "EnProceso": "_fecha_en_proceso",
+        "Resuelto": "_fecha_resuelto",
+    }
 
     objects = ReporteManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["_condominio", "_estado", "-_fecha"]),
+            models.Index(fields=["_condominio", "_vecino", "-_fecha"]),
+            models.Index(fields=["_condominio", "_celda"]),
+            # Rango de fechas de la analítica de tiempos de resolución
+            models.Index(fields=["_condominio", "_fecha"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._latitud is not None and self._longitud is not None:
+            self._celda = geohash.codificar(self._latitud, self._longitud)
+        else:
+            self._celda = ""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"_latitud", "_longitud"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"_celda"}
+        super().save(*args, **kwargs)
     
     @property
     def titulo(self):
@@ -230,28 +758,82 @@ class Reporte(models.Model):
     @property
     def ubicacion(self):
         return self._ubicacion
+
+    @property
+    def categoria(self):
+        return self._categoria
+
+    @property
+    def fecha_en_proceso(self):
+        return self._fecha_en_proceso
+
+    @property
+    def fecha_resuelto(self):
+        return self._fecha_resuelto
     
     @property
     def vecino(self):
         return self._vecino
+
+    @property
+    def vecino_id(self):
+        return self._vecino_id
+
+    @property
+    def latitud(self):
+        return self._latitud
+
+    @property
+    def longitud(self):
+        return self._longitud
+
+    @property
+    def celda(self):
+        return self._celda
+
+    @property
+    def apoyos(self):
+        return self._apoyos
+
+    @property
+    def duplicado_de(self):
+        return self._duplicado_de
+
+    def apoyar(self, usuario):
+        """Suma el apoyo del usuario (una vez por usuario). Retorna False si ya lo había hecho."""
+        if usuario.pk == self._vecino_id:
+            return False
+        with transaction.atomic():
+            if self._apoyado_por.filter(pk=usuario.pk).exists():
+                return False
+            self._apoyado_por.add(usuario)
+            Reporte.objects.filter(pk=self.pk).update(_apoyos=models.F("_apoyos") + 1)
+        self.refresh_from_db(fields=["_apoyos"])
+        return True
     
-    def marcar_en_proceso(self):
+    def marcar_en_proceso(self, usuario=None):
         """Cambia estado de 'Recibido' a 'EnProceso'. Lanza excepción si no aplica."""
-        if self._estado != "Recibido":
+        if self._estado not in self.TRANSICIONES["EnProceso"]:
             raise ValidationError("Solo reportes recibidos pueden pasar a proceso")
-        self._estado = "EnProceso"
-        self.save()
+        self._transicionar("EnProceso", usuario)
     
-    def marcar_resuelto(self):
+    def marcar_resuelto(self, usuario=None):
         """Marca el reporte como resuelto con validación de estado previo."""
-        if self._estado == "Resuelto":
+        if self._estado not in self.TRANSICIONES["Resuelto"]:
             raise ValidationError("Este reporte ya está resuelto")
-        self._estado = "Resuelto"
-        self.save()
+        self._transicionar("Resuelto", usuario)
+
+    def _transicionar(self, destino, usuario):
+        anterior = self._estado
+        self._estado = destino
+        setattr(self, self.FECHAS[destino], timezone.now())
+        with transaction.atomic():
+            self.save(update_fields=["_estado", self.FECHAS[destino]])
+            EventoDominio.objects.registrar(self.EVENTOS[destino], self, usuario, desde=anterior)
     
     def puede_editar_usuario(self, usuario):
         """Solo el autor o un administrador pueden editarlo."""
-        return self._vecino == usuario or usuario.es_administrador()
+        return self._vecino_id == usuario.pk or usuario.es_administrador()
 
     def __str__(self):
         return f"Reporte: {self._titulo} ({self.get_estado_display()})"
@@ -304,7 +886,9 @@ def crear_perfil_usuario(sender, instance, created, **kwargs):
 # MULTAS
 # ========================
 
-class Multa(models.Model):    
+class Multa(ContenidoDeCondominio):
+    campo_propietario = "_vecino"
+
     ESTADOS = [
         ("Pendiente", "Pendiente"),
         ("Pagada", "Pagada"),
@@ -319,6 +903,12 @@ class Multa(models.Model):
 
     objects = MultaManager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["_condominio", "_estado", "-_fecha"]),
+            models.Index(fields=["_condominio", "_vecino", "_estado"]),
+        ]
+
     @property
     def monto(self):
         return self._monto
@@ -351,12 +941,21 @@ class Multa(models.Model):
         
         self._estado = "Pagada"
         self._fecha_pago = timezone.now()
-        self.save()
-        self._post_pago(metodo_pago, transaccion_id)
+        with transaction.atomic():
+            self.save()
+            self._post_pago(metodo_pago, transaccion_id)
+
+    def _post_pago(self, metodo_pago, transaccion_id):
+        """Efectos posteriores a un pago confirmado, en la misma transacción del pago."""
+        EventoDominio.objects.registrar(
+            "multa_pagada", self, self._vecino_id,
+            monto=self._monto, metodo=metodo_pago, transaccion=transaccion_id,
+        )
+        metricas.MULTAS_PAGADAS.inc()
     
     def puede_pagar_usuario(self, usuario):
         """Solo el dueño de la multa puede pagarla y si está pendiente."""
-        return self._vecino == usuario and self.esta_pendiente
+        return self._vecino_id == usuario.pk and self.esta_pendiente
 
     def __str__(self):
         return f"Multa de {self._vecino.username}: {self._motivo} ({self.get_estado_display()})"
@@ -366,11 +965,15 @@ class Multa(models.Model):
 # BOTÓN DE PÁNICO
 # ========================
 
-class BotonPanico(models.Model):    
+class BotonPanico(ContenidoDeCondominio):
+    campo_propietario = "_usuario"
+
     _usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE, related_name="alertas_panico")
     _mensaje = models.CharField(max_length=255, default="Alerta de pánico activada")
     _fecha = models.DateTimeField(auto_now_add=True)
     _activo = models.BooleanField(default=True)
+    # Pulsaciones repetidas agrupadas en esta alerta (ver BotonPanicoManager.activar)
+    _pulsaciones = models.PositiveIntegerField(default=1)
     _fecha_desactivacion = models.DateTimeField(null=True, blank=True) 
     _desactivado_por = models.ForeignKey(
         Usuario,
@@ -396,9 +999,18 @@ class BotonPanico(models.Model):
     def activo(self):
         return self._activo
 
+    @property
+    def pulsaciones(self):
+        return self._pulsaciones
+
+    objects = BotonPanicoManager()
+
     class Meta:
         ordering = ['-_fecha']
         verbose_name_plural = "Botones de Pánico"
+        indexes = [
+            models.Index(fields=["_condominio", "_activo", "-_fecha"]),
+        ]
 
     def desactivar(self, usuario_admin=None):
         if not self._activo:
@@ -410,7 +1022,11 @@ class BotonPanico(models.Model):
         self._activo = False
         self._fecha_desactivacion = timezone.now()
         self._desactivado_por = usuario_admin
-        self.save()
+        with transaction.atomic():
+            self.save()
+            EventoDominio.objects.registrar(
+                "alerta_desactivada", self, usuario_admin, pulsaciones=self._pulsaciones
+            )
 
     def __str__(self):
         estado = "ACTIVA" if self._activo else "Desactivada"
@@ -421,10 +1037,22 @@ class BotonPanico(models.Model):
 # OBJETOS PERDIDOS
 # ========================
 
-class ObjetoPerdido(models.Model):    
+class ObjetoPerdido(ContenidoDeCondominio):
+    campo_propietario = "_usuario"
+
+    # Un mismo modelo para lo que alguien perdió y lo que alguien encontró;
+    # _encontrado marca el caso como cerrado (devuelto a su dueño)
+    TIPOS = [
+        ("perdido", "Perdido"),
+        ("encontrado", "Encontrado"),
+    ]
+
+    _tipo = models.CharField(max_length=12, choices=TIPOS, default="perdido")
     _titulo = models.CharField(max_length=100)
     _descripcion = models.TextField()
     _imagen = models.ImageField(upload_to="objetos_perdidos/", null=True, blank=True)
+    # dHash de 64 bits de _imagen (ver core/imagenes.py)
+    _phash = models.BigIntegerField(null=True, blank=True, editable=False)
     _fecha = models.DateTimeField(auto_now_add=True)
     _usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="objetos_perdidos")
     _encontrado = models.BooleanField(default=False)
@@ -454,9 +1082,21 @@ class ObjetoPerdido(models.Model):
     def encontrado(self):
         return self._encontrado
 
+    @property
+    def tipo(self):
+        return self._tipo
+
+    @property
+    def es_hallazgo(self):
+        return self._tipo == "encontrado"
+
     class Meta:
         ordering = ['-_fecha']
         verbose_name_plural = "Objetos Perdidos"
+        indexes = [
+            models.Index(fields=["_condominio", "_encontrado", "-_fecha"]),
+            models.Index(fields=["_condominio", "_tipo", "_encontrado"]),
+        ]
 
     def marcar_encontrado(self, usuario=None):
         if self._encontrado:
@@ -464,60 +1104,165 @@ class ObjetoPerdido(models.Model):
         
         self._encontrado = True
         self._fecha_encuentro = timezone.now()
-        self.save()
+        with transaction.atomic():
+            self.save()
+            EventoDominio.objects.registrar("objeto_encontrado", self, usuario, clase=self._tipo)
 
     def __str__(self):
         estado = "✓ Encontrado" if self._encontrado else "Perdido"
         return f"[{estado}] {self._titulo} - {self._usuario.username}"
 
 
+class CoincidenciaObjeto(ContenidoDeCondominio):
+    """
+    Posible coincidencia entre un objeto perdido y uno encontrado.
+    La calcula core/coincidencias.py y se muestra a ambos dueños.
+    """
+
+    _perdido = models.ForeignKey(
+        ObjetoPerdido, on_delete=models.CASCADE, related_name="coincidencias_como_perdido"
+    )
+    _hallado = models.ForeignKey(
+        ObjetoPerdido, on_delete=models.CASCADE, related_name="coincidencias_como_hallado"
+    )
+    _puntaje = models.FloatField()
+    _creado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["_perdido", "_hallado"], name="unique_coincidencia_objeto"),
+        ]
+        indexes = [
+            models.Index(fields=["_perdido", "-_puntaje"]),
+            models.Index(fields=["_hallado", "-_puntaje"]),
+        ]
+
+    @property
+    def perdido(self):
+        return self._perdido
+
+    @property
+    def hallado(self):
+        return self._hallado
+
+    @property
+    def puntaje(self):
+        return self._puntaje
+
+    def __str__(self):
+        return f"{self._perdido_id} ↔ {self._hallado_id} ({self._puntaje:.2f})"
+
+
 # ========================
 # SERVICIO DE DASHBOARD
 # ========================
 
 class DashboardService:
-    """Servicio auxiliar para agregar datos al contexto de los dashboards."""
-    
+    """
+    Servicio auxiliar para agregar datos al contexto de los dashboards.
+    Son solo lecturas, por eso se ejecutan contra la réplica cuando existe;
+    los querysets se evalúan aquí para que no se resuelvan fuera de en_replica().
+
+    Cada dashboard se describe como un dict clave -> consulta independiente.
+    La versión síncrona (WSGI) las ejecuta una tras otra; la asíncrona (ASGI)
+    las lanza en paralelo, cada una en su propio hilo y conexión, así la
+    latencia queda acotada por la consulta más lenta y no por la suma.
+    """
+
     @staticmethod
-    def obtener_estadisticas_admin():
-        # Obtiene stats globales del sistema. SOLO ADMINS.
+    def _publicaciones_recientes():
+        # Feed cacheado con el autor ya resuelto (ver core/feed.py)
+        from .feed import publicaciones_recientes
+        return publicaciones_recientes(5)
 
+    @staticmethod
+    def consultas_admin():
+        # Obtiene stats globales del sistema. SOLO ADMINS.
         return {
-            "reportes_pendientes": Reporte.objects.pendientes().count(),
-            "reportes_en_proceso": Reporte.objects.en_proceso().count(),
-            "multas_pendientes": Multa.objects.pendientes().count(),
-            "monto_multas_pendientes": Multa.objects.pendientes().aggregate(
+            "reportes_pendientes": Reporte.objects.pendientes().count,
+            "reportes_en_proceso": Reporte.objects.en_proceso().count,
+            "multas_pendientes": Multa.objects.pendientes().count,
+            "monto_multas_pendientes": lambda: Multa.objects.pendientes().aggregate(
                 total=models.Sum('_monto')
             )['total'] or 0,
-            "publicaciones_recientes": Publicacion.objects.all()[:5],
-            "alertas_activas": BotonPanico.objects.filter(_activo=True).count(),
-            "objetos_perdidos_activos": ObjetoPerdido.objects.filter(_encontrado=False).count(),
+            "publicaciones_recientes": DashboardService._publicaciones_recientes,
+            "alertas_activas": BotonPanico.objects.filter(_activo=True).count,
+            "objetos_perdidos_activos": ObjetoPerdido.objects.filter(_tipo="perdido", _encontrado=False).count,
+            # Del resumen que mantiene la proyección de eventos (core/eventos.py)
+            "actividad_semana": lambda: ResumenEventos.objects.ultimos_dias(7),
         }
-    
+
     @staticmethod
-    def obtener_resumen_vecino(usuario):
+    def consultas_vecino(usuario):
         # Resume stats personales de cada vecino
-        
         return {
-            "mis_reportes": Reporte.objects.del_usuario(usuario).count(),
-            "reportes_pendientes": Reporte.objects.del_usuario(usuario).filter(_estado="Recibido").count(),
-            "mis_multas": Multa.objects.del_usuario(usuario).count(),
-            "multas_pendientes": Multa.objects.del_usuario(usuario).filter(_estado="Pendiente").count(),
-            "total_multas_pendientes": Multa.objects.total_pendiente_usuario(usuario),
-            "ultimas_publicaciones": Publicacion.objects.all()[:5],
+            "mis_reportes": Reporte.objects.del_usuario(usuario).count,
+            "reportes_pendientes": Reporte.objects.del_usuario(usuario).filter(_estado="Recibido").count,
+            "mis_multas": Multa.objects.del_usuario(usuario).count,
+            "multas_pendientes": Multa.objects.del_usuario(usuario).filter(_estado="Pendiente").count,
+            "total_multas_pendientes": lambda: Multa.objects.total_pendiente_usuario(usuario),
+            "ultimas_publicaciones": DashboardService._publicaciones_recientes,
         }
 
+    # ===== WSGI: secuencial =====
+
+    @staticmethod
+    @en_replica()
+    def obtener_estadisticas_admin():
+        return {clave: consulta() for clave, consulta in DashboardService.consultas_admin().items()}
+
+    @staticmethod
+    @en_replica()
+    def obtener_resumen_vecino(usuario):
+        return {clave: consulta() for clave, consulta in DashboardService.consultas_vecino(usuario).items()}
+
+    # ===== ASGI: concurrente =====
+
+    @staticmethod
+    async def aobtener_estadisticas_admin():
+        with en_replica():
+            return await DashboardService._en_paralelo(DashboardService.consultas_admin())
+
+    @staticmethod
+    async def aobtener_resumen_vecino(usuario):
+        with en_replica():
+            return await DashboardService._en_paralelo(DashboardService.consultas_vecino(usuario))
+
+    @staticmethod
+    async def _en_paralelo(consultas):
+        """
+        thread_sensitive=False da a cada consulta un hilo del pool y, por lo tanto,
+        su propia conexión (las conexiones de Django son por hilo). El contexto
+        (condominio activo, réplica, medidores de SQL) se copia a cada hilo.
+        """
+        claves = list(consultas)
+        resultados = await asyncio.gather(*(
+            sync_to_async(DashboardService._ejecutar_aislada, thread_sensitive=False)(consultas[clave])
+            for clave in claves
+        ))
+        return dict(zip(claves, resultados))
+
+    @staticmethod
+    def _ejecutar_aislada(consulta):
+        try:
+            # Métricas y consultas lentas miden también las conexiones de este hilo
+            with medidores_en_hilo():
+                return consulta()
+        finally:
+            # Respeta CONN_MAX_AGE: cierra la conexión del hilo solo si ya expiró
+            close_old_connections()
+
 
 # ========================
 # ÁREA COMÚN
 # ========================
-class AreaComun(models.Model):
+class AreaComun(ContenidoDeCondominio):
     """
     Representa un espacio compartido del condominio (ej. piscina, salón social, parque).
     Solo los administradores pueden crear o modificar áreas comunes.
     """
 
-    _nombre = models.CharField(max_length=100, unique=True)
+    _nombre = models.CharField(max_length=100)
     _descripcion = models.TextField()
     _capacidad = models.PositiveIntegerField(default=1)
     _disponible = models.BooleanField(default=True)
@@ -526,6 +1271,13 @@ class AreaComun(models.Model):
     class Meta:
         ordering = ['_nombre']
         verbose_name_plural = "Áreas Comunes"
+        constraints = [
+            # El nombre es único dentro de cada condominio, no globalmente
+            models.UniqueConstraint(
+                fields=["_condominio", "_nombre"],
+                name="unique_area_por_condominio"
+            )
+        ]
 
     # === Properties ===
     @property
@@ -576,10 +1328,11 @@ class AreaComun(models.Model):
 # ========================
 # RESERVA DE ÁREA
 # ========================
-class ReservaArea(models.Model):
+class ReservaArea(ContenidoDeCondominio):
     """
     Registro de reservas hechas por vecinos sobre un área común.
     """
+    campo_propietario = "_usuario"
 
     _area = models.ForeignKey(AreaComun, on_delete=models.CASCADE, related_name="reservas")
     _usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="reservas_areas")
@@ -588,6 +1341,18 @@ class ReservaArea(models.Model):
     _hora_fin = models.TimeField()
     _motivo = models.CharField(max_length=255)
     _creado = models.DateTimeField(auto_now_add=True)
+    # Reservas creadas juntas por una regla de recurrencia comparten serie
+    _serie = models.UUIDField(null=True, blank=True, db_index=True)
+
+    objects = ReservaAreaManager()
+
+    RECURRENCIAS = [
+        ("ninguna", "No se repite"),
+        ("semanal", "Cada N semanas"),
+        ("dias", "Cada N días"),
+    ]
+    # Tope de ocurrencias por serie (dos años de reservas semanales); ReservaAreaForm rechaza las que lo superan
+    MAX_OCURRENCIAS = 104
 
     class Meta:
         ordering = ['-_creado']
@@ -598,6 +1363,9 @@ class ReservaArea(models.Model):
                 name="unique_reserva_por_horario"
             )
         ]
+        indexes = [
+            models.Index(fields=["_condominio", "_fecha"]),
+        ]
 
     # === Properties ===
     @property
@@ -624,19 +1392,295 @@ class ReservaArea(models.Model):
     def motivo(self):
         return self._motivo
 
-    def clean(self):
-        """Valida que no se crucen horarios de reserva."""
-        solapadas = ReservaArea.objects.filter(
-            _area=self._area,
-            _fecha=self._fecha
-        ).exclude(pk=self.pk)
+    @property
+    def serie(self):
+        return self._serie
+
+    @staticmethod
+    def _paso(recurrencia, intervalo):
+        return timedelta(weeks=intervalo) if recurrencia == "semanal" else timedelta(days=intervalo)
+
+    @staticmethod
+    def contar_ocurrencias(fecha, recurrencia="ninguna", intervalo=1, hasta=None):
+        """Cuántas fechas tendría la serie, sin generarlas."""
+        if recurrencia == "ninguna" or hasta is None:
+            return 1
+        if hasta < fecha:
+            return 0
+        return (hasta - fecha) // ReservaArea._paso(recurrencia, intervalo) + 1
 
-        for reserva in solapadas:
-            if (self._hora_inicio < reserva._hora_fin and self._hora_fin > reserva._hora_inicio):
-                raise ValidationError("Ya existe una reserva en ese horario.")
+    @staticmethod
+    def expandir_recurrencia(fecha, recurrencia="ninguna", intervalo=1, hasta=None):
+        """
+        Lista de fechas de la serie, desde `fecha` hasta `hasta` inclusive.
+        Una serie de más de MAX_OCURRENCIAS fechas es un error (ValueError), no
+        se recorta: ReservaAreaForm la rechaza antes con contar_ocurrencias().
+        """
+        total = ReservaArea.contar_ocurrencias(fecha, recurrencia, intervalo, hasta)
+        if total > ReservaArea.MAX_OCURRENCIAS:
+            raise ValueError(
+                f"La serie tiene {total} fechas; el máximo es {ReservaArea.MAX_OCURRENCIAS}."
+            )
+        paso = ReservaArea._paso(recurrencia, intervalo)
+        return [fecha + paso * i for i in range(total)]
 
+    def clean(self):
+        """Valida que no se crucen horarios de reserva."""
         if self._hora_inicio >= self._hora_fin:
             raise ValidationError("La hora de inicio debe ser anterior a la hora de fin.")
 
+        # Las series validan todas sus fechas en bloque (ver ReservaAreaManager.crear_serie)
+        if getattr(self, "validar_en_serie", False):
+            return
+
+        if ReservaArea.objects.traslapadas(
+            self._area_id, [self._fecha], self._hora_inicio, self._hora_fin, excluir_pk=self.pk
+        ):
+            metricas.RESERVAS_RECHAZADAS.inc()
+            raise ValidationError("Ya existe una reserva en ese horario.")
+
+    def validate_constraints(self, exclude=None):
+        # En una serie, una fecha ya reservada en el mismo horario es un choque
+        # más que crear_serie omite y reporta, no un error del formulario
+        if getattr(self, "validar_en_serie", False):
+            return
+        super().validate_constraints(exclude=exclude)
+
     def _str_(self):
-        return f"Reserva de {self._area._nombre} por {self._usuario.username} ({self._fecha})"
\ No newline at end of file
+        return f"Reserva de {self._area._nombre} por {self._usuario.username} ({self._fecha})"
+
+
+# ========================
+# PURGA DE USUARIOS
+# ========================
+class PurgaUsuario(ContenidoDeCondominio):
+    """
+    Solicitud de borrado diferido de un usuario y todo su contenido.
+    El usuario se desactiva al crear la solicitud y las filas dependientes se
+    eliminan tabla por tabla en lotes pequeños (ver core/purga.py), así ninguna
+    transacción bloquea las tablas mientras se borran años de historial.
+    Pertenece al condominio del usuario purgado: cada administrador solo ve las
+    de su condominio, y las de cuentas sin condominio solo un superusuario.
+    """
+    condominio_obligatorio = False
+
+    ESTADOS = [
+        ("Pendiente", "Pendiente"),
+        ("EnProceso", "En proceso"),
+        ("Completada", "Completada"),
+        ("Fallida", "Fallida"),
+    ]
+
+    # No es FK: el usuario deja de existir al terminar la purga
+    _id_usuario = models.BigIntegerField(db_index=True)
+    _username = models.CharField(max_length=150)
+    _estado = models.CharField(max_length=20, choices=ESTADOS, default="Pendiente")
+    _progreso = models.JSONField(default=dict, blank=True)
+    _error = models.TextField(null=True, blank=True)
+    _solicitado_por = models.ForeignKey(
+        Usuario,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="purgas_solicitadas"
+    )
+    _creado = models.DateTimeField(auto_now_add=True)
+    _actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-_creado']
+        verbose_name_plural = "Purgas de Usuarios"
+
+    @property
+    def id_usuario(self):
+        return self._id_usuario
+
+    @property
+    def username(self):
+        return self._username
+
+    @property
+    def estado(self):
+        return self._estado
+
+    @property
+    def progreso(self):
+        return self._progreso
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def terminada(self):
+        return self._estado in ("Completada", "Fallida")
+
+    def __str__(self):
+        return f"Purga de {self._username} ({self.get__estado_display()})"
+
+
+# ========================
+# ARCHIVOS DE MEDIA
+# ========================
+
+class BlobMedia(models.Model):
+    """
+    Un archivo de media guardado por contenido (ver core/almacenamiento.py).
+    _referencias cuenta cuántos campos de archivo apuntan a él; cuando llega a
+    cero el comando `limpiar_media` lo borra del disco.
+    """
+
+    _hash = models.CharField(max_length=64, unique=True)
+    _nombre = models.CharField(max_length=100)
+    _tamano = models.BigIntegerField()
+    _referencias = models.IntegerField(default=0)
+    _actualizado = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name_plural = "Blobs de media"
+        indexes = [
+            models.Index(fields=["_referencias", "_actualizado"]),
+        ]
+
+    @property
+    def hash(self):
+        return self._hash
+
+    @property
+    def nombre(self):
+        return self._nombre
+
+    @property
+    def tamano(self):
+        return self._tamano
+
+    @property
+    def referencias(self):
+        return self._referencias
+
+    def __str__(self):
+        return f"{self._nombre} ({self._referencias} referencias)"
+
+
+# ========================
+# EVENTOS DE DOMINIO
+# ========================
+
+class EventoDominio(ContenidoDeCondominio):
+    """
+    Registro de solo inserción de los cambios de estado (reporte en proceso o
+    resuelto, multa pagada, alerta desactivada, objeto encontrado). Los métodos
+    de los modelos lo escriben en la misma transacción que el cambio; las
+    operaciones masivas, con un bulk_create.
+
+    El id es la posición en el registro: las proyecciones de core/eventos.py
+    guardan el último id aplicado y leen solo lo nuevo.
+    """
+    # Copia el condominio del objeto que cambió, aunque sea un registro anterior sin condominio
+    condominio_obligatorio = False
+
+    TIPOS = [
+        ("reporte_en_proceso", "Reporte en proceso"),
+        ("reporte_resuelto", "Reporte resuelto"),
+        ("reporte_fusionado", "Reporte fusionado"),
+        ("multa_pagada", "Multa pagada"),
+        ("alerta_desactivada", "Alerta desactivada"),
+        ("objeto_encontrado", "Objeto encontrado"),
+    ]
+
+    _tipo = models.CharField(max_length=40, choices=TIPOS)
+    # Registro afectado: app_label.modelo + pk (sin FK, el evento sobrevive al borrado)
+    _modelo = models.CharField(max_length=50)
+    _objeto_id = models.BigIntegerField()
+    _actor = models.ForeignKey(
+        Usuario, on_delete=models.SET_NULL, null=True, blank=True, related_name="eventos"
+    )
+    _datos = models.JSONField(default=dict, blank=True)
+    _fecha = models.DateTimeField(default=timezone.now)
+
+    objects = EventoDominioManager()
+
+    class Meta:
+        verbose_name_plural = "Eventos de dominio"
+        indexes = [
+            models.Index(fields=["_modelo", "_objeto_id"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Los eventos de dominio no se modifican")
+        super().save(*args, **kwargs)
+
+    @property
+    def tipo(self):
+        return self._tipo
+
+    @property
+    def objeto_id(self):
+        return self._objeto_id
+
+    @property
+    def datos(self):
+        return self._datos
+
+    @property
+    def fecha(self):
+        return self._fecha
+
+    def __str__(self):
+        return f"#{self.pk} {self.get__tipo_display()} ({self._modelo} {self._objeto_id})"
+
+
+class ProyeccionEventos(models.Model):
+    """Posición (último id de EventoDominio aplicado) de cada proyección."""
+
+    _nombre = models.CharField(max_length=50, unique=True)
+    _posicion = models.BigIntegerField(default=0)
+    _actualizado = models.DateTimeField(auto_now=True)
+
+    @property
+    def nombre(self):
+        return self._nombre
+
+    @property
+    def posicion(self):
+        return self._posicion
+
+    @property
+    def actualizado(self):
+        return self._actualizado
+
+    def __str__(self):
+        return f"Proyección {self._nombre} en #{self._posicion}"
+
+
+class ResumenEventos(ContenidoDeCondominio):
+    """Eventos por condominio, día y tipo; lo mantiene la proyección ResumenDiario."""
+    condominio_obligatorio = False
+
+    _dia = models.DateField()
+    _tipo = models.CharField(max_length=40, choices=EventoDominio.TIPOS)
+    _total = models.PositiveIntegerField(default=0)
+
+    objects = ResumenEventosManager()
+
+    class Meta:
+        verbose_name_plural = "Resúmenes de eventos"
+        constraints = [
+            models.UniqueConstraint(fields=["_condominio", "_dia", "_tipo"], name="resumen_eventos_unico"),
+        ]
+
+    @property
+    def dia(self):
+        return self._dia
+
+    @property
+    def tipo(self):
+        return self._tipo
+
+    @property
+    def total(self):
+        return self._total
+
+    def __str__(self):
+        return f"{self._dia} {self._tipo}: {self._total}"
@@ -0,0 +1,161 @@
+"""
+Paginador con conteo cacheado y modo estimado para los listados.
+
+Django pagina con un COUNT(*) sobre el queryset filtrado en cada página; para
+un administrador eso es la tabla completa del condominio. PaginadorCacheado:
+
+    - Guarda el conteo en la caché con una clave que sale del SQL del conteo
+      (filtros, condominio y usuario incluidos, así cada rol tiene el suyo) y
+      de una generación por modelo y condominio. Las señales de este módulo
+      suben la generación al crear, editar o borrar, así el conteo cacheado
+      no sobrevive a una escritura; CONTEO_CACHE_SEGUNDOS cubre los update()
+      masivos que no pasan por señales. Solo con CONTEO_CACHE_COMPARTIDA
+      (Redis): con una caché por proceso la generación no se comparte entre
+      workers y sin ella se cuenta en cada request.
+
+    - Cuenta como mucho PAGINACION_CONTEO_MAXIMO filas (COUNT sobre una
+      subconsulta con LIMIT). Si hay más, el total queda "estimado": no hay
+      num_pages ni última página, las plantillas muestran "más de N", la
+      navegación sigue página a página y cada página sabe si hay siguiente
+      trayendo una fila extra.
+
+conteo_por() comparte la misma caché para los conteos agrupados (facetas por
+estado de los listados).
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Count
+from django.db.models.signals import post_save, post_delete
+from django.utils.functional import cached_property
+
+from .contexto import condominio_actual
+
+
+def _cacheado(clave, calcular):
+    """Valor de la caché o calcular(); sin caché compartida siempre se calcula."""
+    if not settings.CONTEO_CACHE_COMPARTIDA:
+        return calcular()
+    valor = cache.get(clave)
+    if valor is None:
+        valor = calcular()
+        cache.set(clave, valor, settings.CONTEO_CACHE_SEGUNDOS)
+    return valor
+
+
+def _clave_generacion(modelo, condominio_id):
+    return f"conteo:gen:{modelo._meta.label_lower}:{condominio_id if condominio_id is not None else 'todos'}"
+
+
+def generacion(modelo, condominio_id):
+    return cache.get(_clave_generacion(modelo, condominio_id), 0)
+
+
+def invalidar(modelo, condominio_id):
+    """Descarta los conteos cacheados del modelo en el condominio (y los globales)."""
+    if not settings.CONTEO_CACHE_COMPARTIDA:
+        return
+    for cid in {condominio_id, None}:
+        clave = _clave_generacion(modelo, cid)
+        try:
+            cache.incr(clave)
+        except ValueError:
+            # incr() falla si la clave todavía no existe
+            cache.set(clave, 1, None)
+
+
+def _clave(queryset, uso):
+    """Clave de caché de un conteo: SQL del queryset + generación de su modelo."""
+    modelo = queryset.model
+    sql, params = queryset.query.sql_with_params()
+    resumen = hashlib.sha1(f"{uso}|{sql}|{params!r}".encode()).hexdigest()
+    return f"conteo:{modelo._meta.label_lower}:{generacion(modelo, condominio_actual())}:{resumen}"
+
+
+def conteo_por(queryset, campo):
+    """
+    {valor: filas} del queryset agrupado por `campo`, con un solo GROUP BY.
+    Se cachea igual que el total del paginador.
+    """
+    queryset = queryset.order_by().values_list(campo).annotate(filas=Count("pk"))
+    return _cacheado(_clave(queryset, "grupos"), lambda: dict(queryset))
+
+
+class PaginaEstimada(Page):
+    """Página de un total estimado: has_next() sale de la fila extra leída."""
+
+    def __init__(self, object_list, number, paginator, hay_mas):
+        super().__init__(object_list, number, paginator)
+        self.hay_mas = hay_mas
+
+    def has_next(self):
+        return self.hay_mas
+
+
+class PaginadorCacheado(Paginator):
+
+    @cached_property
+    def _conteo(self):
+        """(total, estimado). Con estimado=True el total es el máximo contado."""
+        queryset = self.object_list.order_by()
+        maximo = settings.PAGINACION_CONTEO_MAXIMO
+
+        def contar():
+            total = queryset[:maximo + 1].count()
+            return (min(total, maximo), total > maximo)
+
+        return _cacheado(_clave(queryset, "total"), contar)
+
+    @property
+    def estimado(self):
+        return self._conteo[1]
+
+    @cached_property
+    def count(self):
+        return self._conteo[0]
+
+    @cached_property
+    def num_pages(self):
+        # Con un total estimado la cantidad de páginas no se conoce
+        if self.estimado:
+            return None
+        return super().num_pages
+
+    def validate_number(self, number):
+        if not self.estimado:
+            return super().validate_number(number)
+        # Sin total exacto no hay última página conocida: solo se valida el inicio
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("El número de página no es un entero")
+        if number < 1:
+            raise EmptyPage("El número de página es menor que 1")
+        return number
+
+    def page(self, number):
+        if not self.estimado:
+            return super().page(number)
+        number = self.validate_number(number)
+        desde = (number - 1) * self.per_page
+        filas = list(self.object_list[desde:desde + self.per_page + 1])
+        if not filas and number > 1:
+            raise EmptyPage("La página no contiene resultados")
+        return PaginaEstimada(filas[:self.per_page], number, self, len(filas) > self.per_page)
+
+
+# ========================
+# SEÑALES
+# ========================
+
+def _invalidar_instancia(sender, instance, **kwargs):
+    invalidar(sender, instance._condominio_id)
+
+
+def conectar_senales(*modelos):
+    for modelo in modelos:
+        post_save.connect(_invalidar_instancia, sender=modelo, weak=False)
+        post_delete.connect(_invalidar_instancia, sender=modelo, weak=False)
@@ -0,0 +1,146 @@
+"""
+Perfilador por muestreo para requests marcadas.
+
+Mientras la request corre, un hilo aparte lee cada INTERVALO segundos la pila
+del hilo que la atiende (sys._current_frames) y cuenta cuántas veces aparece
+cada pila. No instrumenta funciones, así que el costo no depende de cuántas
+llamadas haga la vista y los tiempos no se distorsionan.
+
+Cada muestra se clasifica por el frame más interno que la explica:
+    orm        dentro de django.db (consultas y armado de querysets)
+    plantilla  dentro de django.template (renderizado)
+    python     el resto (vistas, formularios, modelos, middlewares)
+
+El resultado se guarda en PERFILADOR_DIR como "collapsed stacks" (una línea
+"categoria;frame;frame;... muestras" por pila, el formato de flamegraph.pl y
+speedscope) junto a un JSON con el resumen. Ver PerfiladorMiddleware.
+"""
+
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+INTERVALO = 0.005
+CATEGORIAS = ("orm", "plantilla", "python")
+
+
+def directorio():
+    return Path(settings.PERFILADOR_DIR)
+
+
+def _categoria(modulos):
+    """Categoría de una pila (lista de módulos, del más externo al más interno)."""
+    for modulo in reversed(modulos):
+        if modulo.startswith("django.db"):
+            return "orm"
+        if modulo.startswith("django.template"):
+            return "plantilla"
+    return "python"
+
+
+class Muestreador:
+    """Hilo que muestrea la pila de otro hilo hasta que se llama a detener()."""
+
+    def __init__(self, hilo_id, raiz, intervalo=INTERVALO):
+        self.hilo_id = hilo_id
+        # Código del frame desde el que se muestrea (los de más afuera se descartan)
+        self.raiz = raiz
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self.categorias = Counter()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, name="perfilador", daemon=True)
+
+    def iniciar(self):
+        self.inicio = time.perf_counter()
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        self._hilo.join()
+        self.duracion = time.perf_counter() - self.inicio
+
+    def _muestrear(self):
+        while not self._detener.wait(self.intervalo):
+            frame = sys._current_frames().get(self.hilo_id)
+            if frame is None:
+                continue
+            etiquetas, modulos = [], []
+            while frame is not None and frame.f_code is not self.raiz:
+                modulo = frame.f_globals.get("__name__", "?")
+                etiquetas.append(f"{modulo}:{frame.f_code.co_name}")
+                modulos.append(modulo)
+                frame = frame.f_back
+            etiquetas.reverse()
+            modulos.reverse()
+            categoria = _categoria(modulos)
+            self.categorias[categoria] += 1
+            self.pilas[";".join([categoria] + etiquetas)] += 1
+
+    def collapsed(self):
+        return "".join(f"{pila} {n}\n" for pila, n in self.pilas.most_common())
+
+
+# ========================
+# ARCHIVOS
+# ========================
+
+def guardar(muestreador, request, response):
+    """Escribe <id>.folded y <id>.json en PERFILADOR_DIR y poda los más antiguos."""
+    carpeta = directorio()
+    carpeta.mkdir(parents=True, exist_ok=True)
+    perfil_id = f"{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+    ruta = request.resolver_match
+    total = sum(muestreador.categorias.values())
+    resumen = {
+        "id": perfil_id,
+        "fecha": timezone.now().isoformat(),
+        # Sin query string: puede llevar búsquedas de vecinos (?q=) de cualquier condominio
+        "ruta": request.path,
+        "vista": ruta.view_name if ruta is not None else None,
+        "metodo": request.method,
+        "estado": response.status_code,
+        "usuario": request.user.username if request.user.is_authenticated else None,
+        "duracion_ms": round(muestreador.duracion * 1000, 1),
+        "muestras": total,
+        # Fracción del tiempo de la request que cae en cada categoría
+        "categorias": {c: (muestreador.categorias[c] / total if total else 0) for c in CATEGORIAS},
+    }
+    (carpeta / f"{perfil_id}.folded").write_text(muestreador.collapsed(), encoding="utf-8")
+    (carpeta / f"{perfil_id}.json").write_text(json.dumps(resumen), encoding="utf-8")
+    _podar(carpeta)
+    return perfil_id
+
+
+def _podar(carpeta):
+    resumenes = sorted(carpeta.glob("*.json"))
+    for viejo in resumenes[:-settings.PERFILADOR_MAXIMO]:
+        viejo.unlink(missing_ok=True)
+        viejo.with_suffix(".folded").unlink(missing_ok=True)
+
+
+def perfiles():
+    """Resúmenes guardados, del más reciente al más antiguo."""
+    resultado = []
+    for archivo in sorted(directorio().glob("*.json"), reverse=True):
+        try:
+            resultado.append(json.loads(archivo.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return resultado
+
+
+def archivo_collapsed(perfil_id):
+    """Ruta del .folded de un perfil, o None si el id no es válido o no existe."""
+    # El id viene de la URL: solo se aceptan nombres generados por guardar()
+    if not perfil_id.replace("-", "").isalnum():
+        return None
+    ruta = directorio() / f"{perfil_id}.folded"
+    return ruta if ruta.exists() else None
@@ -0,0 +1,201 @@
+"""
+Purga diferida de usuarios.
+
+Borrar un Usuario con un simple delete() hace que el collector de Django cargue
+en memoria todas sus publicaciones, reportes, multas, alertas, objetos y reservas
+y los elimine en una sola transacción, bloqueando las tablas hasta terminar.
+
+Aquí el flujo se divide en dos partes:
+    1. solicitar_purga(): desactiva al usuario y registra una PurgaUsuario.
+    2. ejecutar_purga(): recorre las tablas dependientes y borra en lotes de
+       tamaño fijo, cada lote en su propia transacción corta, guardando el
+       progreso en la solicitud. Las referencias a archivos de media las
+       liberan las señales de core/almacenamiento.py al borrar cada fila.
+
+La ejecución se lanza en un hilo daemon del worker al confirmar la solicitud.
+Si el worker se reinicia a mitad, el hilo muere y la purga queda 'EnProceso';
+`python manage.py procesar_purgas` (tras cada despliegue o desde cron) la
+retoma desde lo que quede en la base de datos, y con --fallidas reintenta las
+que terminaron con error.
+"""
+
+import logging
+import threading
+from collections import Counter
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import (
+    Usuario, PurgaUsuario, Publicacion, Reporte, Multa, BotonPanico,
+    ObjetoPerdido, ReservaArea, PerfilUsuario, EventoDominio
+)
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE = 500
+
+
+# ========================
+# PASOS DE LA PURGA
+# ========================
+
+class PasoPurga:
+    """
+    Una tabla dependiente del usuario.
+    `campo` es la FK que apunta al usuario; si `anular` es True la FK se pone en
+    NULL en lugar de borrar la fila (equivalente a on_delete=SET_NULL).
+    """
+
+    def __init__(self, nombre, modelo, campo, anular=False):
+        self.nombre = nombre
+        self.modelo = modelo
+        self.campo = campo
+        self.anular = anular
+
+    def queryset(self, id_usuario):
+        # _base_manager evita filtros de managers personalizados
+        return self.modelo._base_manager.filter(**{f"{self.campo}_id": id_usuario})
+
+    def procesar_lote(self, id_usuario, tamano_lote):
+        """Procesa un lote y retorna cuántas filas afectó (0 = paso terminado)."""
+        ids = list(
+            self.queryset(id_usuario).order_by("pk").values_list("pk", flat=True)[:tamano_lote]
+        )
+        if not ids:
+            return 0
+
+        lote = self.modelo._base_manager.filter(pk__in=ids)
+        with transaction.atomic():
+            self.antes_de_borrar(lote)
+            if self.anular:
+                lote.update(**{self.campo: None})
+            else:
+                lote.delete()
+        return len(ids)
+
+    def antes_de_borrar(self, lote):
+        """Gancho para mantener contadores desnormalizados dentro de la transacción del lote."""
+
+
+class PasoApoyos(PasoPurga):
+    """
+    Los apoyos son filas de la tabla intermedia: borrarlas no pasa por
+    Reporte.apoyar(), así que aquí se descuenta Reporte._apoyos a mano. Un
+    reporte fusionado sumó sus apoyos al principal (ver fusionar), que también
+    pierde uno.
+    """
+
+    def __init__(self):
+        super().__init__("apoyos", Reporte._apoyado_por.through, "usuario")
+
+    def antes_de_borrar(self, lote):
+        reportes = Reporte._base_manager.filter(pk__in=lote.values("reporte_id"))
+        descuentos = Counter()
+        for pk, principal in reportes.values_list("pk", "_duplicado_de"):
+            descuentos[pk] += 1
+            if principal is not None:
+                descuentos[principal] += 1
+        por_cantidad = {}
+        for pk, cantidad in descuentos.items():
+            por_cantidad.setdefault(cantidad, []).append(pk)
+        for cantidad, pks in por_cantidad.items():
+            Reporte._base_manager.filter(pk__in=pks).update(
+                _apoyos=Greatest(F("_apoyos") - cantidad, 0)
+            )
+
+
+def pasos_purga():
+    """
+    Orden de borrado: primero las tablas hoja y al final el perfil.
+    Si se agrega un modelo con FK a Usuario, debe registrarse aquí.
+    """
+    return [
+        PasoPurga("reservas", ReservaArea, "_usuario"),
+        PasoApoyos(),
+        PasoPurga("objetos_perdidos", ObjetoPerdido, "_usuario"),
+        PasoPurga("alertas_desactivadas", BotonPanico, "_desactivado_por", anular=True),
+        PasoPurga("alertas_panico", BotonPanico, "_usuario"),
+        PasoPurga("multas", Multa, "_vecino"),
+        PasoPurga("reportes", Reporte, "_vecino"),
+        PasoPurga("publicaciones", Publicacion, "_vecino"),
+        PasoPurga("purgas_solicitadas", PurgaUsuario, "_solicitado_por", anular=True),
+        PasoPurga("eventos", EventoDominio, "_actor", anular=True),
+        PasoPurga("perfil", PerfilUsuario, "_usuario"),
+    ]
+
+
+# ========================
+# API PÚBLICA
+# ========================
+
+def solicitar_purga(usuario, solicitado_por=None, en_segundo_plano=True):
+    """
+    Desactiva al usuario inmediatamente y registra la purga.
+    El borrado comienza en un hilo aparte cuando la transacción se confirma.
+    """
+    with transaction.atomic():
+        usuario.desactivar()
+        purga = PurgaUsuario.objects.create(
+            _condominio_id=usuario.condominio_id,
+            _id_usuario=usuario.pk,
+            _username=usuario.username,
+            _solicitado_por=solicitado_por,
+        )
+        if en_segundo_plano:
+            transaction.on_commit(lambda: iniciar_en_segundo_plano(purga.pk))
+    return purga
+
+
+def iniciar_en_segundo_plano(purga_id, tamano_lote=TAMANO_LOTE):
+    hilo = threading.Thread(
+        target=_ejecutar_en_hilo,
+        args=(purga_id, tamano_lote),
+        name=f"purga-{purga_id}",
+        daemon=True,
+    )
+    hilo.start()
+    return hilo
+
+
+def _ejecutar_en_hilo(purga_id, tamano_lote):
+    try:
+        ejecutar_purga(purga_id, tamano_lote)
+    finally:
+        # Cada hilo abre su propia conexión; se cierra al terminar
+        close_old_connections()
+
+
+def ejecutar_purga(purga_id, tamano_lote=TAMANO_LOTE):
+    """
+    Borra el contenido del usuario paso a paso. Es idempotente: si se interrumpe,
+    volver a ejecutarla continúa desde lo que quede en la base de datos.
+    """
+    purga = PurgaUsuario._base_manager.get(pk=purga_id)
+    if purga.terminada:
+        return purga
+
+    purga._estado = "EnProceso"
+    purga._error = None
+    purga.save(update_fields=["_estado", "_error", "_actualizado"])
+
+    try:
+        for paso in pasos_purga():
+            while True:
+                afectadas = paso.procesar_lote(purga.id_usuario, tamano_lote)
+                if not afectadas:
+                    break
+                purga._progreso[paso.nombre] = purga._progreso.get(paso.nombre, 0) + afectadas
+                purga.save(update_fields=["_progreso", "_actualizado"])
+
+        # Ya sin dependientes, el delete del usuario es una sola fila
+        Usuario._base_manager.filter(pk=purga.id_usuario).delete()
+        purga._estado = "Completada"
+    except Exception as e:
+        logger.exception("Falló la purga %s", purga_id)
+        purga._estado = "Fallida"
+        purga._error = str(e)
+
+    purga.save(update_fields=["_estado", "_error", "_actualizado"])
+    return purga
@@ -0,0 +1,42 @@
+"""
+Router de base de datos para la réplica de lectura.
+
+- Escrituras: siempre a "default" (primaria).
+- Lecturas: a "replica" solo dentro de en_replica() (listados y dashboards) y
+  solo si el alias existe en settings.DATABASES. Sin réplica todo va a default.
+- Read-your-writes: cualquier escritura fuerza la primaria por el resto del
+  request (solo de ese request: el estado lo abre y cierra ReplicaMiddleware),
+  y ReplicaMiddleware la mantiene unos segundos en los requests
+  siguientes del mismo navegador, para que el vecino vea su reporte nuevo
+  aunque la réplica todavía no lo tenga.
+"""
+
+from django.conf import settings
+
+from .contexto import lecturas_en_replica, marcar_escritura
+
+ALIAS_REPLICA = "replica"
+
+
+def hay_replica():
+    return ALIAS_REPLICA in settings.DATABASES
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if hay_replica() and lecturas_en_replica():
+            return ALIAS_REPLICA
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        marcar_escritura()
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Ambos alias contienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica es una copia de la primaria, nunca se migra directamente
+        return db != ALIAS_REPLICA
@@ -1,3 +1,519 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import date, time, timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import duplicados, limites
+from .eventos import ResumenDiario
+from .forms import ReservaAreaForm
+from .models import (
+    AreaComun, BlobMedia, BotonPanico, Condominio, EventoDominio, Multa, ObjetoPerdido,
+    Publicacion, PurgaUsuario, Reporte, ReservaArea, ResumenEventos, Usuario,
+)
+from .paginacion import PaginadorCacheado, conteo_por
+from .purga import ejecutar_purga, solicitar_purga
+
+
+# PBKDF2 tarda a propósito; los tests de login no lo necesitan
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BaseVizinhoTestCase(TestCase):
+    """Un condominio con un administrador y dos vecinos."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.condominio = Condominio.objects.create(_nombre="Los Pinos", _ubicacion="Zona 1")
+        cls.admin = Usuario.objects.create_user(
+            "admin", "admin@vizinho.test", "clave123", _rol="admin", _condominio=cls.condominio
+        )
+        cls.vecino = Usuario.objects.create_user(
+            "vecino", "vecino@vizinho.test", "clave123", _condominio=cls.condominio
+        )
+        cls.otro = Usuario.objects.create_user(
+            "otro", "otro@vizinho.test", "clave123", _condominio=cls.condominio
+        )
+
+    def crear_reporte(self, titulo="Fuga de agua", descripcion="Gotea el techo del pasillo",
+                      ubicacion="Bloque A", vecino=None):
+        return Reporte.objects.create(
+            _titulo=titulo, _descripcion=descripcion, _ubicacion=ubicacion,
+            _vecino=vecino or self.vecino,
+        )
+
+
+# ========================
+# PURGA DE USUARIOS
+# ========================
+
+class PurgaUsuarioTests(BaseVizinhoTestCase):
+
+    def test_solicitar_desactiva_de_inmediato(self):
+        purga = solicitar_purga(self.vecino, solicitado_por=self.admin, en_segundo_plano=False)
+        self.vecino.refresh_from_db()
+        self.assertFalse(self.vecino.is_active)
+        self.assertEqual(purga.estado, "Pendiente")
+        self.assertEqual(purga._condominio_id, self.condominio.pk)
+
+    def test_borra_por_pasos_y_guarda_progreso(self):
+        for i in range(3):
+            self.crear_reporte(titulo=f"Reporte {i}")
+        Publicacion.objects.create(_titulo="Venta", _contenido="Bicicleta", _vecino=self.vecino)
+        Multa.objects.create(_monto=50, _motivo="Ruido", _vecino=self.vecino)
+        BotonPanico.objects.create(_usuario=self.vecino)
+        purga = solicitar_purga(self.vecino, en_segundo_plano=False)
+
+        purga = ejecutar_purga(purga.pk, tamano_lote=2)
+
+        self.assertEqual(purga.estado, "Completada")
+        self.assertEqual(purga.progreso["reportes"], 3)
+        self.assertEqual(purga.progreso["publicaciones"], 1)
+        self.assertEqual(purga.progreso["multas"], 1)
+        self.assertEqual(purga.progreso["alertas_panico"], 1)
+        self.assertFalse(Usuario._base_manager.filter(pk=self.vecino.pk).exists())
+        self.assertFalse(Reporte._base_manager.filter(_vecino_id=self.vecino.pk).exists())
+
+    def test_descuenta_apoyos_del_reporte_y_del_principal(self):
+        principal = self.crear_reporte(vecino=self.otro)
+        fusionado = self.crear_reporte(titulo="Fuga en el techo", vecino=self.otro)
+        principal.apoyar(self.vecino)
+        fusionado.apoyar(self.vecino)
+        Reporte.objects.fusionar([principal.pk, fusionado.pk])
+        principal.refresh_from_db()
+        # Uno propio, más el apoyo del fusionado y el fusionado mismo
+        self.assertEqual(principal.apoyos, 3)
+
+        purga = solicitar_purga(self.vecino, en_segundo_plano=False)
+        purga = ejecutar_purga(purga.pk)
+
+        self.assertEqual(purga.progreso["apoyos"], 2)
+        principal.refresh_from_db()
+        fusionado.refresh_from_db()
+        self.assertEqual(principal.apoyos, 1)
+        self.assertEqual(fusionado.apoyos, 0)
+
+    def test_procesar_purgas_retoma_las_interrumpidas(self):
+        self.crear_reporte()
+        purga = solicitar_purga(self.vecino, en_segundo_plano=False)
+        PurgaUsuario._base_manager.filter(pk=purga.pk).update(_estado="EnProceso")
+
+        call_command("procesar_purgas", stdout=StringIO())
+
+        purga.refresh_from_db()
+        self.assertEqual(purga.estado, "Completada")
+        self.assertFalse(Usuario._base_manager.filter(pk=self.vecino.pk).exists())
+
+
+# ========================
+# RESERVAS RECURRENTES
+# ========================
+
+class ReservaSerieTests(BaseVizinhoTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.area = AreaComun.objects.create(
+            _nombre="Salón social", _descripcion="Salón", _condominio=cls.condominio
+        )
+
+    def formulario(self, **datos):
+        inicio = date.today() + timedelta(days=7)
+        datos = {
+            "_area": self.area.pk,
+            "_fecha": inicio,
+            "_hora_inicio": "10:00",
+            "_hora_fin": "12:00",
+            "_motivo": "Reunión",
+            "recurrencia": "semanal",
+            "intervalo": 1,
+            "repetir_hasta": inicio + timedelta(weeks=3),
+            **datos,
+        }
+        form = ReservaAreaForm(data=datos)
+        form.instance._usuario = self.vecino
+        return form
+
+    def reservar(self, fecha, inicio=time(10), fin=time(12)):
+        return ReservaArea.objects.create(
+            _area=self.area, _usuario=self.otro, _fecha=fecha,
+            _hora_inicio=inicio, _hora_fin=fin, _motivo="Ocupado",
+        )
+
+    def test_omite_y_reporta_los_choques(self):
+        form = self.formulario()
+        inicio = form.data["_fecha"]
+        self.reservar(inicio + timedelta(weeks=1), time(11), time(13))
+        self.assertTrue(form.is_valid(), form.errors)
+
+        creadas, conflictos = ReservaArea.objects.crear_serie(form.save(commit=False), form.fechas())
+
+        self.assertEqual(len(creadas), 3)
+        self.assertEqual(conflictos, [inicio + timedelta(weeks=1)])
+        self.assertEqual(len({reserva.serie for reserva in creadas}), 1)
+
+    def test_primera_fecha_identica_es_un_choque_y_no_un_error(self):
+        form = self.formulario()
+        inicio = form.data["_fecha"]
+        self.reservar(inicio)
+        self.assertTrue(form.is_valid(), form.errors)
+
+        creadas, conflictos = ReservaArea.objects.crear_serie(form.save(commit=False), form.fechas())
+
+        self.assertEqual(conflictos, [inicio])
+        self.assertEqual([r.fecha for r in creadas], [inicio + timedelta(weeks=i) for i in (1, 2, 3)])
+
+    def test_reserva_simple_identica_sigue_rechazada(self):
+        form = self.formulario(recurrencia="ninguna", repetir_hasta="")
+        self.reservar(form.data["_fecha"])
+        self.assertFalse(form.is_valid())
+
+    def test_rechaza_series_de_mas_de_max_ocurrencias(self):
+        inicio = date.today() + timedelta(days=1)
+        hasta = inicio + timedelta(days=ReservaArea.MAX_OCURRENCIAS)
+        form = self.formulario(_fecha=inicio, recurrencia="dias", repetir_hasta=hasta)
+
+        self.assertFalse(form.is_valid())
+        self.assertEqual(len(form.non_field_errors()), 1)
+        self.assertIn(str(ReservaArea.MAX_OCURRENCIAS + 1), form.non_field_errors()[0])
+        with self.assertRaises(ValueError):
+            ReservaArea.expandir_recurrencia(inicio, "dias", 1, hasta)
+
+    def test_serie_en_el_maximo_se_acepta(self):
+        inicio = date.today() + timedelta(days=1)
+        hasta = inicio + timedelta(days=ReservaArea.MAX_OCURRENCIAS - 1)
+        form = self.formulario(_fecha=inicio, recurrencia="dias", repetir_hasta=hasta)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(len(form.fechas()), ReservaArea.MAX_OCURRENCIAS)
+
+
+# ========================
+# TRANSICIONES Y FUSIÓN DE REPORTES
+# ========================
+
+class TransicionReportesTests(BaseVizinhoTestCase):
+
+    def test_transicionar_aplica_la_regla_de_estados(self):
+        recibido = self.crear_reporte()
+        resuelto = self.crear_reporte(titulo="Luz")
+        Reporte._base_manager.filter(pk=resuelto.pk).update(_estado="Resuelto")
+
+        resultados = Reporte.objects.transicionar(
+            [recibido.pk, resuelto.pk, 999_999], "EnProceso", usuario=self.admin
+        )
+
+        self.assertEqual(resultados[recibido.pk], ("actualizado", "Recibido"))
+        self.assertEqual(resultados[resuelto.pk], ("omitido", "Resuelto"))
+        self.assertEqual(resultados[999_999], ("no_encontrado", None))
+        recibido.refresh_from_db()
+        self.assertEqual(recibido.estado, "EnProceso")
+        self.assertIsNotNone(recibido._fecha_en_proceso)
+        eventos = EventoDominio._base_manager.filter(_tipo="reporte_en_proceso")
+        self.assertEqual(list(eventos.values_list("_objeto_id", flat=True)), [recibido.pk])
+        self.assertEqual(eventos.get()._actor_id, self.admin.pk)
+
+    def test_fusionar_deja_el_mas_antiguo_como_principal(self):
+        principal = self.crear_reporte()
+        copia = self.crear_reporte(titulo="Fuga de agua en el techo")
+        copia.apoyar(self.otro)
+
+        resultado, fusionados = Reporte.objects.fusionar([copia.pk, principal.pk], usuario=self.admin)
+
+        self.assertEqual((resultado.pk, fusionados), (principal.pk, 1))
+        self.assertEqual(resultado.apoyos, 2)
+        copia.refresh_from_db()
+        self.assertEqual(copia.estado, "Resuelto")
+        self.assertEqual(copia._duplicado_de_id, principal.pk)
+        self.assertTrue(EventoDominio._base_manager.filter(_tipo="reporte_fusionado", _objeto_id=copia.pk).exists())
+
+    def test_fusionar_ignora_resueltos_y_ya_fusionados(self):
+        abierto = self.crear_reporte()
+        cerrado = self.crear_reporte(titulo="Otro")
+        Reporte._base_manager.filter(pk=cerrado.pk).update(_estado="Resuelto")
+        self.assertEqual(Reporte.objects.fusionar([abierto.pk, cerrado.pk]), (None, 0))
+
+
+# ========================
+# DUPLICADOS (MinHash + LSH)
+# ========================
+
+class DuplicadosTests(BaseVizinhoTestCase):
+
+    def setUp(self):
+        # El índice vive en memoria por proceso y no sabe de las transacciones de cada test
+        duplicados._indices.clear()
+
+    def test_estima_la_similitud_de_jaccard(self):
+        a = "Fuga de agua en el pasillo del bloque B junto al ascensor"
+        b = "Fuga de agua en pasillo del bloque B, junto al ascensor principal"
+        c = "Perro suelto en el parque ladra toda la noche"
+        sa, sb = duplicados.shingles(a), duplicados.shingles(b)
+        exacta = len(sa & sb) / len(sa | sb)
+        self.assertAlmostEqual(duplicados.similitud(duplicados.firma(a), duplicados.firma(b)), exacta, delta=0.15)
+        self.assertLess(duplicados.similitud(duplicados.firma(a), duplicados.firma(c)), 0.15)
+
+    def test_encuentra_reportes_casi_iguales(self):
+        original = self.crear_reporte(
+            titulo="Fuga de agua en el pasillo",
+            descripcion="Sale agua de la tubería junto al ascensor del bloque B",
+            ubicacion="Bloque B",
+        )
+        self.crear_reporte(titulo="Perro suelto", descripcion="Ladra toda la noche en el parque", ubicacion="Parque")
+
+        encontrados = duplicados.posibles_duplicados(
+            self.condominio.pk, "Fuga de agua en pasillo",
+            "Sale agua de la tubería junto al ascensor del bloque B", "Bloque B",
+        )
+
+        self.assertEqual([r.pk for r in encontrados], [original.pk])
+        self.assertGreaterEqual(encontrados[0].similitud, duplicados.UMBRAL)
+
+    def test_ignora_reportes_sin_relacion_y_resueltos(self):
+        resuelto = self.crear_reporte(titulo="Fuga de agua", descripcion="Sale agua de la tubería")
+        Reporte._base_manager.filter(pk=resuelto.pk).update(_estado="Resuelto")
+        self.crear_reporte(titulo="Cámara rota", descripcion="La cámara del portón no graba")
+
+        self.assertEqual(
+            duplicados.posibles_duplicados(self.condominio.pk, "Fuga de agua", "Sale agua de la tubería", "Bloque A"),
+            [],
+        )
+
+    def test_agrupa_duplicados_del_condominio(self):
+        a = self.crear_reporte(titulo="Portón no cierra", descripcion="El portón eléctrico de la entrada no cierra")
+        b = self.crear_reporte(titulo="Portón no cierra bien", descripcion="El portón eléctrico de la entrada no cierra")
+        self.crear_reporte(titulo="Basura", descripcion="No pasó el camión de la basura")
+        self.assertEqual(duplicados.indice(self.condominio.pk).grupos(), [[a.pk, b.pk]])
+
+
+# ========================
+# REFERENCIAS DE BLOBS DE MEDIA
+# ========================
+
+class BlobMediaTests(BaseVizinhoTestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        ajuste = override_settings(MEDIA_ROOT=self.media)
+        ajuste.enable()
+        self.addCleanup(ajuste.disable)
+
+    def crear_objeto(self, contenido=b"foto", titulo="Llaves"):
+        objeto = ObjetoPerdido(_titulo=titulo, _descripcion="Con llavero azul", _usuario=self.vecino)
+        objeto._imagen.save("foto.jpg", ContentFile(contenido), save=False)
+        objeto.save()
+        return objeto
+
+    def referencias(self):
+        return list(BlobMedia.objects.values_list("_referencias", flat=True))
+
+    def test_el_mismo_contenido_comparte_blob(self):
+        a = self.crear_objeto()
+        b = self.crear_objeto(titulo="Otras llaves")
+        self.assertEqual(a._imagen.name, b._imagen.name)
+        self.assertEqual(self.referencias(), [2])
+
+    def test_guardar_sin_cambiar_el_archivo_no_suma(self):
+        objeto = self.crear_objeto()
+        objeto._titulo = "Llaves de casa"
+        objeto.save()
+        self.assertEqual(self.referencias(), [1])
+
+    def test_borrar_y_reemplazar_liberan_al_confirmar(self):
+        objeto = self.crear_objeto()
+        anterior = objeto._imagen.name
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            objeto._imagen.save("nueva.jpg", ContentFile(b"otra foto"), save=True)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(BlobMedia.objects.get(_nombre=anterior).referencias, 0)
+        self.assertEqual(BlobMedia.objects.get(_nombre=objeto._imagen.name).referencias, 1)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            objeto.delete()
+        # Hasta confirmar la transacción la referencia sigue contada
+        self.assertEqual(BlobMedia.objects.get(_nombre=objeto._imagen.name).referencias, 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.referencias(), [0, 0])
+
+    def test_limpiar_media_quita_el_archivo_despues_de_confirmar(self):
+        objeto = self.crear_objeto()
+        nombre = objeto._imagen.name
+        storage = objeto._imagen.storage
+        with self.captureOnCommitCallbacks(execute=True):
+            objeto.delete()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            call_command("limpiar_media", gracia_dias=-1, stdout=StringIO())
+        self.assertFalse(BlobMedia.objects.exists())
+        self.assertTrue(storage.exists(nombre))
+        for callback in callbacks:
+            callback()
+        self.assertFalse(storage.exists(nombre))
+
+
+# ========================
+# LÍMITES DE FRECUENCIA
+# ========================
+
+@override_settings(LIMITES_ACTIVOS=True, LIMITES_ALMACEN="local", LIMITES_PROXY_CONFIABLE=False)
+class LimitesTests(BaseVizinhoTestCase):
+
+    def setUp(self):
+        limites._local.limpiar()
+
+    def intentar_login(self, username, ip, clave="incorrecta"):
+        return self.client.post(reverse("login"), {"username": username, "password": clave}, REMOTE_ADDR=ip)
+
+    def test_login_por_ip_y_username(self):
+        for _ in range(limites.LOGIN_POR_USUARIO.capacidad):
+            self.assertEqual(self.intentar_login("vecino", "10.0.0.1").status_code, 200)
+        respuesta = self.intentar_login("vecino", "10.0.0.1")
+        self.assertEqual(respuesta.status_code, 429)
+        self.assertIn("Retry-After", respuesta)
+
+    def test_un_atacante_no_bloquea_a_la_victima(self):
+        for _ in range(limites.LOGIN_POR_USUARIO.capacidad + 1):
+            self.intentar_login("vecino", "10.0.0.66")
+        respuesta = self.intentar_login("vecino", "10.0.0.2", clave="clave123")
+        self.assertEqual(respuesta.status_code, 302)
+
+    def test_login_por_ip(self):
+        for i in range(limites.LOGIN_POR_IP.capacidad):
+            self.assertEqual(self.intentar_login(f"nadie{i}", "10.0.0.3").status_code, 200)
+        self.assertEqual(self.intentar_login("otro", "10.0.0.3").status_code, 429)
+
+    def test_proxy_no_confiable_cuenta_por_ip_y_username(self):
+        with self.assertLogs("core.limites", "WARNING"):
+            for i in range(limites.LOGIN_POR_IP.capacidad + 1):
+                respuesta = self.client.post(
+                    reverse("login"), {"username": f"nadie{i}", "password": "x"},
+                    REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR="203.0.113.9",
+                )
+                self.assertEqual(respuesta.status_code, 200)
+
+    def test_boton_de_panico_nunca_rechaza(self):
+        self.client.force_login(self.vecino)
+        for _ in range(15):
+            self.assertEqual(self.client.post(reverse("activar_panico")).status_code, 302)
+        alerta = BotonPanico.objects.get(_usuario=self.vecino)
+        self.assertEqual(alerta._pulsaciones, 15)
+
+    @override_settings(LIMITES_ACTIVOS=False)
+    def test_desactivados(self):
+        for _ in range(limites.LOGIN_POR_IP.capacidad + 1):
+            self.assertEqual(self.intentar_login("vecino", "10.0.0.4").status_code, 200)
+
+
+# ========================
+# PAGINACIÓN
+# ========================
+
+@override_settings(CONTEO_CACHE_COMPARTIDA=True, PAGINACION_CONTEO_MAXIMO=5)
+class PaginacionTests(BaseVizinhoTestCase):
+
+    def setUp(self):
+        cache.clear()
+        for i in range(8):
+            self.crear_reporte(titulo=f"Reporte {i}")
+
+    def paginador(self):
+        return PaginadorCacheado(Reporte.objects.order_by("pk"), 3)
+
+    def test_modo_estimado(self):
+        paginador = self.paginador()
+        self.assertTrue(paginador.estimado)
+        self.assertEqual(paginador.count, 5)
+        self.assertIsNone(paginador.num_pages)
+        self.assertTrue(paginador.page(2).has_next())
+        ultima = paginador.page(3)
+        self.assertEqual(len(ultima), 2)
+        self.assertFalse(ultima.has_next())
+
+    @override_settings(PAGINACION_CONTEO_MAXIMO=100)
+    def test_total_exacto(self):
+        paginador = self.paginador()
+        self.assertFalse(paginador.estimado)
+        self.assertEqual((paginador.count, paginador.num_pages), (8, 3))
+
+    @override_settings(PAGINACION_CONTEO_MAXIMO=100)
+    def test_una_escritura_invalida_el_conteo(self):
+        self.assertEqual(self.paginador().count, 8)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.paginador().count, 8)
+        self.crear_reporte(titulo="Nuevo")
+        self.assertEqual(self.paginador().count, 9)
+
+    def test_transicionar_invalida_las_facetas(self):
+        self.assertEqual(conteo_por(Reporte.objects.all(), "_estado"), {"Recibido": 8})
+        pk = Reporte.objects.order_by("pk").values_list("pk", flat=True).first()
+        Reporte.objects.transicionar([pk], "Resuelto")
+        self.assertEqual(conteo_por(Reporte.objects.all(), "_estado"), {"Recibido": 7, "Resuelto": 1})
+
+    @override_settings(CONTEO_CACHE_COMPARTIDA=False, PAGINACION_CONTEO_MAXIMO=100)
+    def test_sin_cache_compartida_cuenta_siempre(self):
+        self.assertEqual(self.paginador().count, 8)
+        Reporte._base_manager.filter(_titulo="Reporte 0").delete()
+        self.assertEqual(self.paginador().count, 7)
+
+
+# ========================
+# PROYECCIONES DE EVENTOS
+# ========================
+
+class ProyeccionesTests(BaseVizinhoTestCase):
+
+    def setUp(self):
+        self.proyeccion = ResumenDiario()
+
+    def transicionar(self, destino="EnProceso"):
+        reporte = self.crear_reporte()
+        Reporte.objects.transicionar([reporte.pk], destino)
+        return EventoDominio._base_manager.get(_objeto_id=reporte.pk, _tipo=Reporte.EVENTOS[destino])
+
+    def envejecer(self, *eventos):
+        hace_un_rato = timezone.now() - timedelta(minutes=5)
+        EventoDominio._base_manager.filter(pk__in=[e.pk for e in eventos]).update(_fecha=hace_un_rato)
+
+    def test_resume_por_tipo_y_avanza_la_posicion(self):
+        eventos = [self.transicionar(), self.transicionar(), self.transicionar("Resuelto")]
+        self.envejecer(*eventos)
+
+        self.assertEqual(self.proyeccion.avanzar(tamano_lote=2), 3)
+
+        self.assertEqual(self.proyeccion.posicion(), eventos[-1].pk)
+        self.assertEqual(
+            ResumenEventos.objects.ultimos_dias(1),
+            {"reporte_en_proceso": 2, "reporte_resuelto": 1},
+        )
+        # Sin eventos nuevos no se vuelve a aplicar nada
+        self.assertEqual(self.proyeccion.avanzar(), 0)
+        self.assertEqual(ResumenEventos.objects.ultimos_dias(1)["reporte_en_proceso"], 2)
+
+    def test_no_lee_eventos_dentro_del_margen(self):
+        antiguo = self.transicionar()
+        reciente = self.transicionar()
+        posterior = self.transicionar()
+        self.envejecer(antiguo, posterior)
+
+        # Se corta en el primer evento reciente aunque haya uno más antiguo después
+        self.assertEqual(self.proyeccion.avanzar(), 1)
+        self.assertEqual(self.proyeccion.posicion(), antiguo.pk)
+
+        self.envejecer(reciente)
+        self.assertEqual(self.proyeccion.avanzar(), 2)
+        self.assertEqual(self.proyeccion.posicion(), posterior.pk)
+
+    def test_reiniciar_reconstruye_desde_el_inicio(self):
+        self.envejecer(self.transicionar())
+        self.proyeccion.avanzar()
+        self.proyeccion.reiniciar()
+        self.assertEqual(self.proyeccion.posicion(), 0)
+        self.assertFalse(ResumenEventos._base_manager.exists())
+        self.proyeccion.avanzar()
+        self.assertEqual(ResumenEventos.objects.ultimos_dias(1), {"reporte_en_proceso": 1})
@@ -1,12 +1,16 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
-    DashboardView,
+    DashboardView, DashboardAsyncView, DashboardAdminAsyncView,
     # Reportes
     ReporteListView, ReporteCreateView, ReporteUpdateView, ReporteDeleteView,
+    TransicionReportesView, ReportesCercanosView, MapaCalorReportesView, AnaliticaReportesView,
+    ApoyarReporteView, DuplicadosReportesView, FusionarReportesView,
     # Publicaciones
     PublicacionListView, PublicacionCreateView, PublicacionUpdateView, PublicacionDeleteView,
     # Multas
     MultaListView, MultaCreateView, MultaUpdateView, MultaDeleteView, PagarMultaView,
+    BuscarVecinosView,
     # Auth
     LoginView, LogoutView, 
     # Perfiles
@@ -18,13 +22,19 @@ from .views import (
     # Objeto Perdido
     ListaObjetosPerdidosView, CrearObjetoPerdidoView, 
     #creacion de usuarios por admin
-    CrearUsuarioView,
+    ListaUsuariosView, CrearUsuarioView, EliminarUsuarioView, EstadoPurgaView,
     # Areas Comunes
     ListaAreasView, CrearAreaView, CrearReservaView,
+    # Métricas
+    MetricasView, ConsultasLentasView, PerfilesView, DescargarPerfilView,
 )
 
+# Bajo ASGI los dashboards ejecutan sus consultas en paralelo; WSGI usa la versión síncrona
+dashboard = DashboardAsyncView if settings.DASHBOARD_ASYNC else DashboardView
+dashboard_admin = DashboardAdminAsyncView if settings.DASHBOARD_ASYNC else DashboardAdminView
+
 urlpatterns = [
-    path("", DashboardView.as_view(), name="dashboard"),
+    path("", dashboard.as_view(), name="dashboard"),
     path("login/", LoginView.as_view(), name="login"),
     path("logout/", LogoutView.as_view(), name="logout"),
 
@@ -33,6 +43,13 @@ urlpatterns = [
     path("reportes/nuevo/", ReporteCreateView.as_view(), name="crear_reporte"),
     path("reportes/<int:pk>/editar/", ReporteUpdateView.as_view(), name="editar_reporte"),
     path("reportes/<int:pk>/eliminar/", ReporteDeleteView.as_view(), name="eliminar_reporte"),
+    path("reportes/transicion/", TransicionReportesView.as_view(), name="transicion_reportes"),
+    path("reportes/cercanos/", ReportesCercanosView.as_view(), name="reportes_cercanos"),
+    path("reportes/mapa-calor/", MapaCalorReportesView.as_view(), name="mapa_calor_reportes"),
+    path("reportes/analitica/", AnaliticaReportesView.as_view(), name="analitica_reportes"),
+    path("reportes/<int:pk>/apoyar/", ApoyarReporteView.as_view(), name="apoyar_reporte"),
+    path("reportes/duplicados/", DuplicadosReportesView.as_view(), name="duplicados_reportes"),
+    path("reportes/fusionar/", FusionarReportesView.as_view(), name="fusionar_reportes"),
 
     # Publicaciones
     path("publicaciones/", PublicacionListView.as_view(), name="lista_publicaciones"),
@@ -46,6 +63,7 @@ urlpatterns = [
     path("multas/<int:pk>/editar/", MultaUpdateView.as_view(), name="editar_multa"),
     path("multas/<int:pk>/eliminar/", MultaDeleteView.as_view(), name="eliminar_multa"),
     path("multas/<int:pk>/pagar/", PagarMultaView.as_view(), name="pagar_multa"),
+    path("vecinos/buscar/", BuscarVecinosView.as_view(), name="buscar_vecinos"),
 
     # Perfil usuario
     path("perfil/", ProfileDetailView.as_view(), name="ver_perfil"),
@@ -56,17 +74,26 @@ urlpatterns = [
     path("panico/historial/", HistorialBotonPanicoView.as_view(), name="historial_panico"),
 
     #Vista de administracion
-    path("administrador/dashboard/", DashboardAdminView.as_view(), name="dashboard_admin"),
+    path("administrador/dashboard/", dashboard_admin.as_view(), name="dashboard_admin"),
 
     ##Objetos Perdidos 
     path("objetos-perdidos/", ListaObjetosPerdidosView.as_view(), name="lista_objetos_perdidos"),
     path("objetos-perdidos/nuevo/", CrearObjetoPerdidoView.as_view(), name="crear_objeto_perdido"),
 
     #Creacion de usuarios por admin
+    path("administrador/usuarios/", ListaUsuariosView.as_view(), name="lista_usuarios"),
     path("administrador/crear-usuario/", CrearUsuarioView.as_view(), name="crear_usuario"),
+    path("administrador/usuarios/<int:pk>/eliminar/", EliminarUsuarioView.as_view(), name="eliminar_usuario"),
+    path("administrador/purgas/<int:pk>/", EstadoPurgaView.as_view(), name="estado_purga"),
 
     # Areas Comunes
     path("areas-comunes/", ListaAreasView.as_view(), name="lista_areas"),
     path("areas-comunes/nueva/", CrearAreaView.as_view(), name="crear_area"),
     path("reservar/", CrearReservaView.as_view(), name="crear_reserva"),
+
+    # Métricas (Prometheus)
+    path("metrics", MetricasView.as_view(), name="metricas"),
+    path("administrador/consultas-lentas/", ConsultasLentasView.as_view(), name="consultas_lentas"),
+    path("administrador/perfiles/", PerfilesView.as_view(), name="perfiles"),
+    path("administrador/perfiles/<str:perfil_id>/", DescargarPerfilView.as_view(), name="descargar_perfil"),
 ]
\ No newline at end of file
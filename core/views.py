@@ -17,12 +17,22 @@ Cada sección contiene los controladores específicos relacionados con su funcio
 Las vistas hacen uso extensivo de mixins personalizados para gestionar permisos
 y comportamientos comunes, asegurando así un código limpio y mantenible.
 """
+import hmac
+from abc import ABCMeta, abstractmethod
+from datetime import datetime, time, timedelta
+
 # Django imports
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponse, JsonResponse, Http404, FileResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.urls import reverse_lazy
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.views import View
 from django.views.generic import (
@@ -34,12 +44,27 @@ from django.views.generic import (
 from .models import (
     Reporte, PerfilUsuario, Publicacion, Multa, 
     BotonPanico, ObjetoPerdido, Usuario, DashboardService,
-    AreaComun, ReservaArea
+    AreaComun, ReservaArea, PurgaUsuario
+)
+from .purga import solicitar_purga
+from .analitica import tiempos_resolucion
+from .paginacion import PaginadorCacheado, conteo_por
+from .limites import LOGIN_POR_IP, LOGIN_POR_USUARIO, ip_cliente
+from . import metricas
+from .consultas_lentas import ranking as ranking_consultas_lentas
+from . import perfilador
+from .middleware import PerfiladorMiddleware
+from .coincidencias import actualizar_coincidencias, agregar_por_imagen, coincidencias_de
+from .imagenes import dhash, imagenes_similares
+from .contexto import condominio_actual, en_replica
+from .duplicados import (
+    posibles_duplicados, registrar as registrar_reporte, olvidar as olvidar_reportes,
+    indice as indice_duplicados,
 )
 from .forms import (
     LoginForm, ReporteForm, ProfileForm, PublicacionForm, 
     MultaForm, ObjetoPerdidoForm, CrearUsuarioForm,
-    AreaComunForm, ReservaAreaForm
+    AreaComunForm, ReservaAreaForm, FiltroListadoForm
 )
 
 
@@ -61,7 +86,44 @@ class SoloAdminMixin(UserPassesTestMixin):
         return redirect('dashboard')
 
 
-class PropietarioOAdminMixin(UserPassesTestMixin):
+class CondominioRequeridoMixin:
+    """
+    Para las vistas que crean contenido de un condominio a nombre del usuario.
+    Un superusuario sin condominio ve todo pero no puede crear: el contenido
+    quedaría sin condominio (ver ContenidoDeCondominio.save()).
+    """
+    def dispatch(self, request, *args, **kwargs):
+        if request.user.is_authenticated and request.user.condominio_id is None:
+            messages.error(request, "Necesitas un condominio asignado para crear contenido.")
+            return redirect('dashboard')
+        return super().dispatch(request, *args, **kwargs)
+
+
+class SoloSuperusuarioMixin(SoloAdminMixin):
+    """Páginas de diagnóstico con datos de todos los condominios."""
+    def test_func(self):
+        return self.request.user.is_superuser
+
+    def handle_no_permission(self):
+        messages.error(self.request, "No tienes permisos para acceder a esta página. Solo superusuarios.")
+        return redirect('dashboard')
+
+
+class ObjetoPorRequestMixin:
+    """
+    Memoriza get_object() durante el request (la vista se instancia por request).
+    test_func() de los mixins de permisos, UpdateView/DeleteView y el formulario
+    trabajan así sobre la misma instancia, cargada una sola vez.
+    """
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, "_objeto_request"):
+            self._objeto_request = super().get_object()
+        return self._objeto_request
+
+
+class PropietarioOAdminMixin(ObjetoPorRequestMixin, UserPassesTestMixin):
     """
     Habilita edición si el usuario es dueño del objeto o es administrador.
     """
@@ -77,12 +139,115 @@ class PropietarioOAdminMixin(UserPassesTestMixin):
         return redirect('dashboard')
 
 
+class LimiteMixin:
+    """
+    Aplica los límites de frecuencia (core/limites.py) a los POST antes de
+    llegar a la vista. Si alguno se agota responde con limite_excedido().
+    """
+    limites_post = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == "POST":
+            for limite in self.limites_post:
+                espera = limite.consumir(request)
+                if espera:
+                    response = self.limite_excedido(request, espera)
+                    response["Retry-After"] = str(int(espera) + 1)
+                    return response
+        return super().dispatch(request, *args, **kwargs)
+
+    def limite_excedido(self, request, espera):
+        return HttpResponse("Demasiadas solicitudes, intenta más tarde.", status=429)
+
+
+class LecturaReplicaMixin:
+    """
+    Los GET del listado leen de la réplica (si está configurada).
+    La respuesta se renderiza dentro del bloque porque la página del paginador
+    es un queryset perezoso que se evalúa recién al renderizar la plantilla.
+    """
+    def get(self, request, *args, **kwargs):
+        with en_replica():
+            response = super().get(request, *args, **kwargs)
+            if hasattr(response, "render"):
+                response.render()
+            return response
+
+
+class FiltrosListadoMixin:
+    """
+    Filtros por GET (estado, rango de fechas y, para administradores, vecino)
+    y conteo por estado para los botones del listado.
+
+    La vista arma su queryset y lo pasa por filtrar(). Las facetas salen de un
+    solo GROUP BY sobre el listado con todos los filtros salvo el de estado,
+    así cada botón muestra cuántos quedarían al elegirlo. Los filtros de estado
+    y vecino usan los índices (_condominio, _estado, -_fecha) y
+    (_condominio, _vecino, ...) de cada modelo.
+    """
+    def get_filtros(self):
+        if not hasattr(self, "_filtros"):
+            self._filtros = FiltroListadoForm(self.request.GET, estados=self.model.ESTADOS)
+        return self._filtros
+
+    def filtrar(self, queryset):
+        filtros = self.get_filtros()
+        desde, hasta = filtros.valor("desde"), filtros.valor("hasta")
+        # Rango sobre la columna (y no _fecha__date) para que use el índice
+        if desde:
+            queryset = queryset.filter(_fecha__gte=timezone.make_aware(datetime.combine(desde, time.min)))
+        if hasta:
+            queryset = queryset.filter(
+                _fecha__lt=timezone.make_aware(datetime.combine(hasta + timedelta(days=1), time.min))
+            )
+        if filtros.valor("vecino") and self.request.user.es_administrador():
+            queryset = queryset.filter(_vecino_id=filtros.valor("vecino"))
+        self.sin_estado = queryset
+        if filtros.valor("estado"):
+            queryset = queryset.filter(_estado=filtros.valor("estado"))
+        return queryset
+
+    def _query(self, **cambios):
+        """Query string actual sin la página y con `cambios` (None quita el parámetro)."""
+        params = self.request.GET.copy()
+        params.pop("page", None)
+        for clave, valor in cambios.items():
+            params.pop(clave, None)
+            if valor is not None:
+                params[clave] = valor
+        return params.urlencode()
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        filtros = self.get_filtros()
+        conteo = conteo_por(self.sin_estado, "_estado")
+        actual = filtros.valor("estado")
+        ctx["facetas"] = [{
+            "valor": None, "etiqueta": "todos", "total": sum(conteo.values()),
+            "query": self._query(estado=None), "activa": actual is None,
+        }] + [{
+            "valor": valor, "etiqueta": etiqueta, "total": conteo.get(valor, 0),
+            "query": self._query(estado=valor), "activa": actual == valor,
+        } for valor, etiqueta in self.model.ESTADOS]
+        ctx["conteo_estados"] = conteo
+        ctx["filtros"] = filtros
+        # Los enlaces del paginador conservan los filtros
+        ctx["filtros_query"] = self._query()
+        vecino = filtros.valor("vecino")
+        if vecino and self.request.user.es_administrador():
+            ctx["vecino_filtrado"] = Usuario.objects.vecinos().filter(pk=vecino).first()
+            ctx["sin_vecino_query"] = self._query(vecino=None)
+        return ctx
+
+
 # ========================
 # AUTENTICACIÓN
 # ========================
 
-class LoginView(View):
+class LoginView(LimiteMixin, View):
     template_name = "login.html"
+    # Se rechaza antes de authenticate(), que calcula el hash de la contraseña
+    limites_post = (LOGIN_POR_IP, LOGIN_POR_USUARIO)
 
     def get(self, request):
         # Redirigir si ya está autenticado para evitar doble login
@@ -104,6 +269,11 @@ class LoginView(View):
                 return self._redirect_to_dashboard(user)
             form.add_error(None, "Usuario o contraseña incorrectos")
         return render(request, self.template_name, {"form": form})
+
+    def limite_excedido(self, request, espera):
+        return render(
+            request, self.template_name, {"form": LoginForm(), "espera": int(espera) + 1}, status=429
+        )
     
     def _redirect_to_dashboard(self, user):
         # esta es una función interna para redirigir según rol
@@ -144,21 +314,69 @@ class DashboardAdminView(LoginRequiredMixin, SoloAdminMixin, TemplateView):
         return context
 
 
+class DashboardAsyncBase(View, metaclass=ABCMeta):
+    """
+    Versión ASGI de los dashboards: las consultas de DashboardService se lanzan
+    en paralelo. Los mixins de permisos son síncronos, por eso las mismas
+    reglas (login requerido, solo admin) se aplican aquí con request.auser().
+    Bajo WSGI se siguen usando DashboardView y DashboardAdminView.
+    Cada subclase define template_name y obtener_contexto().
+    """
+    template_name = None
+    solo_admin = False
+
+    async def get(self, request):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        if self.solo_admin and not user.es_administrador():
+            messages.error(
+                request,
+                "No tienes permisos para acceder a esta página. Solo administradores."
+            )
+            return redirect('dashboard')
+
+        context = await self.obtener_contexto(user)
+        # Renderizar en el hilo síncrono: las plantillas pueden tocar el ORM
+        return await sync_to_async(render)(request, self.template_name, context)
+
+    @abstractmethod
+    async def obtener_contexto(self, user):
+        """Contexto de la plantilla para `user`, ya autenticado y con permiso."""
+
+
+class DashboardAsyncView(DashboardAsyncBase):
+    template_name = "dashboard.html"
+
+    async def obtener_contexto(self, user):
+        return await DashboardService.aobtener_resumen_vecino(user)
+
+
+class DashboardAdminAsyncView(DashboardAsyncBase):
+    template_name = "administrador/dashboard_admin.html"
+    solo_admin = True
+
+    async def obtener_contexto(self, user):
+        return await DashboardService.aobtener_estadisticas_admin()
+
+
 # ========================
 # REPORTES
 # ========================
 
-class ReporteListView(LoginRequiredMixin, ListView):
+class ReporteListView(LoginRequiredMixin, LecturaReplicaMixin, FiltrosListadoMixin, ListView):
     model = Reporte
     template_name = "reportes/lista_reportes.html"
     context_object_name = "reportes"
     paginate_by = 10
+    paginator_class = PaginadorCacheado
 
     def get_queryset(self):
         user = self.request.user
         if user.es_administrador():
-            return Reporte.objects.all().order_by("-_fecha")
-        return Reporte.objects.del_usuario(user).order_by("-_fecha")
+            # La tabla de administración muestra el autor de cada reporte
+            return self.filtrar(Reporte.objects.select_related("_vecino").order_by("-_fecha"))
+        return self.filtrar(Reporte.objects.del_usuario(user).order_by("-_fecha"))
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -166,7 +384,7 @@ class ReporteListView(LoginRequiredMixin, ListView):
         return ctx
 
 
-class ReporteCreateView(LoginRequiredMixin, CreateView):
+class ReporteCreateView(LoginRequiredMixin, CondominioRequeridoMixin, CreateView):
     model = Reporte
     form_class = ReporteForm
     template_name = "reportes/crear_reporte.html"
@@ -175,8 +393,25 @@ class ReporteCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         # El autor del reporte siempre es el usuario autenticado.
         form.instance._vecino = self.request.user
+
+        # Antes de crear, se ofrece apoyar un reporte abierto casi igual;
+        # "crear_igual" indica que el vecino ya lo vio y quiere crearlo de todos modos
+        if not self.request.POST.get("crear_igual"):
+            duplicados = posibles_duplicados(
+                self.request.user.condominio_id,
+                form.cleaned_data["_titulo"],
+                form.cleaned_data["_descripcion"],
+                form.cleaned_data["_ubicacion"],
+            )
+            if duplicados:
+                return self.render_to_response(
+                    self.get_context_data(form=form, duplicados=duplicados)
+                )
+
         messages.success(self.request, "Reporte creado exitosamente")
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        registrar_reporte(self.object)
+        return response
     
     def form_invalid(self, form):
         messages.error(
@@ -185,6 +420,33 @@ class ReporteCreateView(LoginRequiredMixin, CreateView):
         )
         return super().form_invalid(form)
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        # Valores ya ingresados, para no perderlos al volver a mostrar el formulario
+        datos = ctx["form"].data
+        ctx["valores"] = {
+            "titulo": datos.get("_titulo", ""),
+            "descripcion": datos.get("_descripcion", ""),
+            "ubicacion": datos.get("_ubicacion", ""),
+            "categoria": datos.get("_categoria", ""),
+            "latitud": datos.get("_latitud", ""),
+            "longitud": datos.get("_longitud", ""),
+        }
+        ctx["categorias"] = Reporte.CATEGORIAS
+        return ctx
+
+
+class ApoyarReporteView(LoginRequiredMixin, View):
+    """"+1" a un reporte existente en vez de crear uno repetido."""
+
+    def post(self, request, pk):
+        reporte = get_object_or_404(Reporte.objects.all(), pk=pk)
+        if reporte.apoyar(request.user):
+            messages.success(request, f"Sumaste tu apoyo a '{reporte.titulo}' ({reporte.apoyos} apoyos)")
+        else:
+            messages.info(request, "Ya apoyabas este reporte")
+        return redirect("lista_reportes")
+
 
 class ReporteUpdateView(LoginRequiredMixin, PropietarioOAdminMixin, UpdateView): 
     model = Reporte
@@ -196,6 +458,11 @@ class ReporteUpdateView(LoginRequiredMixin, PropietarioOAdminMixin, UpdateView):
         messages.success(self.request, "Reporte actualizado exitosamente")
         return super().form_valid(form)
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["categorias"] = Reporte.CATEGORIAS
+        return ctx
+
 
 class ReporteDeleteView(LoginRequiredMixin, PropietarioOAdminMixin, DeleteView):
     model = Reporte
@@ -211,21 +478,166 @@ class ReporteDeleteView(LoginRequiredMixin, PropietarioOAdminMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
+class TransicionReportesView(LoginRequiredMixin, SoloAdminMixin, View):
+    """
+    Acción masiva del listado de reportes: mueve los seleccionados a
+    'EnProceso' o 'Resuelto' con un solo UPDATE (ver ReporteManager.transicionar).
+    """
+    ACCIONES = {
+        "en_proceso": "EnProceso",
+        "resuelto": "Resuelto",
+    }
+
+    def post(self, request):
+        destino = self.ACCIONES.get(request.POST.get("accion"))
+        ids = [pk for pk in request.POST.getlist("reportes") if pk.isdigit()]
+        if destino is None or not ids:
+            messages.error(request, "Selecciona al menos un reporte y una acción válida")
+            return redirect("lista_reportes")
+
+        resultados = Reporte.objects.transicionar(ids, destino, usuario=request.user)
+        actualizados = [pk for pk, (r, _) in resultados.items() if r == "actualizado"]
+        omitidos = [pk for pk, (r, _) in resultados.items() if r != "actualizado"]
+
+        if actualizados:
+            messages.success(request, f"{len(actualizados)} reportes actualizados")
+        if omitidos:
+            messages.warning(
+                request,
+                f"{len(omitidos)} reportes omitidos porque su estado no permite el cambio: "
+                + ", ".join(f"#{pk}" for pk in omitidos)
+            )
+        volver = request.POST.get("volver")
+        if volver and url_has_allowed_host_and_scheme(volver, allowed_hosts={request.get_host()}):
+            return redirect(volver)
+        return redirect("lista_reportes")
+
+
+class DuplicadosReportesView(LoginRequiredMixin, SoloAdminMixin, TemplateView):
+    """Grupos de reportes abiertos casi iguales, para fusionarlos de una vez."""
+    template_name = "reportes/duplicados.html"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        grupos = indice_duplicados(condominio_actual()).grupos()
+        reportes = (
+            Reporte.objects.select_related("_vecino")
+            .filter(_duplicado_de__isnull=True)
+            .exclude(_estado="Resuelto")
+            .in_bulk([pk for grupo in grupos for pk in grupo])
+        )
+        # Descarta los cerrados o fusionados desde la última reconstrucción del índice
+        grupos = ([reportes[pk] for pk in grupo if pk in reportes] for grupo in grupos)
+        ctx["grupos"] = [g for g in grupos if len(g) > 1]
+        return ctx
+
+
+class FusionarReportesView(LoginRequiredMixin, SoloAdminMixin, View):
+    """Fusiona los reportes seleccionados en el más antiguo (ver ReporteManager.fusionar)."""
+
+    def post(self, request):
+        ids = [pk for pk in request.POST.getlist("reportes") if pk.isdigit()]
+        principal, fusionados = Reporte.objects.fusionar(ids, usuario=request.user)
+        if principal is None:
+            messages.error(request, "Selecciona al menos dos reportes abiertos para fusionar")
+        else:
+            olvidar_reportes(principal._condominio_id, [int(pk) for pk in ids if int(pk) != principal.pk])
+            messages.success(
+                request,
+                f"{fusionados} reportes fusionados en '{principal.titulo}' ({principal.apoyos} apoyos)"
+            )
+        volver = request.POST.get("volver")
+        if volver and url_has_allowed_host_and_scheme(volver, allowed_hosts={request.get_host()}):
+            return redirect(volver)
+        return redirect("duplicados_reportes")
+
+
+class ReportesCercanosView(LoginRequiredMixin, View):
+    """
+    Reportes abiertos cerca de un punto (?lat=&lon=&radio=metros), en JSON.
+    El formulario de nuevo reporte lo consulta para avisar de posibles duplicados.
+    """
+    RADIO_MAXIMO = 1000
+
+    def get(self, request):
+        try:
+            lat = float(request.GET["lat"])
+            lon = float(request.GET["lon"])
+            radio = min(float(request.GET.get("radio", 100)), self.RADIO_MAXIMO)
+        except (KeyError, ValueError):
+            return JsonResponse({"error": "Parámetros lat y lon requeridos"}, status=400)
+
+        with en_replica():
+            cercanos = [r for r in Reporte.objects.cercanos(lat, lon, radio) if r.estado != "Resuelto"]
+        return JsonResponse({"reportes": [
+            {
+                "id": r.pk,
+                "titulo": r.titulo,
+                "estado": r.get__estado_display(),
+                "distancia_m": round(r.distancia_m),
+            }
+            for r in cercanos[:10]
+        ]})
+
+
+class MapaCalorReportesView(LoginRequiredMixin, SoloAdminMixin, View):
+    """Conteo de reportes por celda y estado (?precision=4..9), en JSON."""
+
+    def get(self, request):
+        try:
+            precision = int(request.GET.get("precision", 7))
+        except ValueError:
+            precision = 7
+        precision = max(4, min(precision, 9))
+
+        with en_replica():
+            celdas = Reporte.objects.mapa_calor(precision)
+        return JsonResponse({"precision": precision, "celdas": celdas})
+
+
+class AnaliticaReportesView(LoginRequiredMixin, SoloAdminMixin, LecturaReplicaMixin, TemplateView):
+    """
+    Percentiles del tiempo hasta 'EnProceso' y hasta 'Resuelto' por categoría,
+    mes y celda (?meses=1..60, ?precision=4..9). Ver core/analitica.py.
+    """
+    template_name = "reportes/analitica.html"
+
+    def _entero(self, nombre, defecto, minimo, maximo):
+        try:
+            valor = int(self.request.GET.get(nombre, defecto))
+        except ValueError:
+            valor = defecto
+        return max(minimo, min(valor, maximo))
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["meses"] = self._entero("meses", 12, 1, 60)
+        ctx["precision"] = self._entero("precision", 6, 4, 9)
+        analitica = ctx["analitica"] = tiempos_resolucion(ctx["meses"], ctx["precision"])
+        ctx["secciones"] = [
+            ("por categoría", analitica["categorias"]),
+            ("por mes", analitica["meses"]),
+            ("por celda", analitica["celdas"][:50]),
+        ]
+        return ctx
+
+
 # ========================
 # MULTAS
 # ========================
 
-class MultaListView(LoginRequiredMixin, ListView):
+class MultaListView(LoginRequiredMixin, LecturaReplicaMixin, FiltrosListadoMixin, ListView):
     model = Multa
     template_name = "multas/lista_multas.html"
     context_object_name = "multas"
     paginate_by = 10 
+    paginator_class = PaginadorCacheado
 
     def get_queryset(self):
         user = self.request.user
         if user.es_administrador():
-            return Multa.objects.all().order_by("-_fecha")
-        return Multa.objects.del_usuario(user).order_by("-_fecha")
+            return self.filtrar(Multa.objects.select_related("_vecino").order_by("-_fecha"))
+        return self.filtrar(Multa.objects.del_usuario(user).order_by("-_fecha"))
     
     def get_context_data(self, **kwargs):
         """
@@ -238,6 +650,9 @@ class MultaListView(LoginRequiredMixin, ListView):
             context["total_pendiente"] = Multa.objects.total_pendiente_usuario(
                 self.request.user
             )
+            # Las tarjetas salen del mismo conteo por estado de los filtros
+            context["multas_pendientes"] = context["conteo_estados"].get("Pendiente", 0)
+            context["multas_pagadas"] = context["conteo_estados"].get("Pagada", 0)
         return context
 
 
@@ -252,10 +667,23 @@ class MultaCreateView(LoginRequiredMixin, SoloAdminMixin, CreateView):
         messages.success(self.request, "Multa creada exitosamente")
         return super().form_valid(form)
 
-    def get_context_data(self, **kwargs):   
-        ctx = super().get_context_data(**kwargs)
-        ctx["vecinos"] = Usuario.objects.filter(_rol="vecino").order_by("username")
-        return ctx
+
+class BuscarVecinosView(LoginRequiredMixin, SoloAdminMixin, View):
+    """Autocompletado de vecinos: los 20 primeros por prefijo de username, nombre o unidad."""
+    def get(self, request):
+        vecinos = Usuario.objects.buscar_vecinos(request.GET.get("q", "")[:50])
+        return JsonResponse({
+            "resultados": [
+                {
+                    "id": v.pk,
+                    "username": v.username,
+                    "nombre": v.get_full_name(),
+                    "unidad": v.unidad,
+                    "email": v.email,
+                }
+                for v in vecinos
+            ]
+        })
 
 class MultaUpdateView(LoginRequiredMixin, SoloAdminMixin, UpdateView):
     model = Multa
@@ -309,7 +737,7 @@ class PagarMultaView(LoginRequiredMixin, View):
 # PUBLICACIONES
 # ========================
 
-class PublicacionListView(LoginRequiredMixin, ListView):
+class PublicacionListView(LoginRequiredMixin, LecturaReplicaMixin, ListView):
     model = Publicacion
     template_name = "publicaciones/lista_publicaciones.html"
     context_object_name = "publicaciones"
@@ -321,7 +749,7 @@ class PublicacionListView(LoginRequiredMixin, ListView):
         ctx["es_admin"] = self.request.user.es_administrador()
         return ctx
 
-class PublicacionCreateView(LoginRequiredMixin, CreateView):
+class PublicacionCreateView(LoginRequiredMixin, CondominioRequeridoMixin, CreateView):
     model = Publicacion
     form_class = PublicacionForm
     template_name = "publicaciones/crear_publicacion.html"
@@ -396,20 +824,30 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
 # BOTÓN DE PÁNICO
 # ========================
 
-class ActivarBotonPanicoView(LoginRequiredMixin, View):
-    """Crea una alerta de pánico y notifica a administradores vía canal existente."""
+class ActivarBotonPanicoView(LoginRequiredMixin, CondominioRequeridoMixin, View):
+    """
+    Crea una alerta de pánico y notifica a administradores vía canal existente.
+    Sin límite de frecuencia: ninguna pulsación se rechaza, las repetidas se
+    suman a la alerta activa (BotonPanicoManager.activar).
+    """
+
     def get(self, request):
         return render(request, "panico/activar_panico.html")
     
     def post(self, request):
         try:
-            # Crear alerta
-            BotonPanico.objects.create(_usuario=request.user)
-            messages.success(
-                request, 
-                "¡Alerta de pánico activada correctamente! "
-                "Los administradores han sido notificados."
+            # Un botón trabado o un doble toque no crean alertas nuevas
+            alerta, creada = BotonPanico.objects.activar(
+                request.user, settings.PANICO_VENTANA_SEGUNDOS
             )
+            if creada:
+                messages.success(
+                    request, 
+                    "¡Alerta de pánico activada correctamente! "
+                    "Los administradores han sido notificados."
+                )
+            else:
+                messages.info(request, "Tu alerta de pánico sigue activa. Los administradores ya fueron notificados.")
             return redirect("historial_panico")
         except Exception as e:
             messages.error(
@@ -418,11 +856,12 @@ class ActivarBotonPanicoView(LoginRequiredMixin, View):
             )
             return redirect("dashboard")
 
-class HistorialBotonPanicoView(LoginRequiredMixin, ListView):
+class HistorialBotonPanicoView(LoginRequiredMixin, LecturaReplicaMixin, ListView):
     model = BotonPanico
     template_name = "panico/historial_panico.html"
     context_object_name = "alertas"
     paginate_by = 10
+    paginator_class = PaginadorCacheado
 
     def get_queryset(self):
         """
@@ -437,7 +876,7 @@ class HistorialBotonPanicoView(LoginRequiredMixin, ListView):
 # OBJETOS PERDIDOS
 # ========================
 
-class ListaObjetosPerdidosView(LoginRequiredMixin, ListView):
+class ListaObjetosPerdidosView(LoginRequiredMixin, LecturaReplicaMixin, ListView):
     
     model = ObjetoPerdido
     template_name = "objeto-perdido/lista_objetos.html"
@@ -446,27 +885,81 @@ class ListaObjetosPerdidosView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         # Ordena por encontrados primero, luego por fecha descendente
-        return ObjetoPerdido.objects.all().order_by("_encontrado", "-_fecha")
+        return ObjetoPerdido.objects.select_related("_usuario").order_by("_encontrado", "-_fecha")
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        # Cada dueño ve, en sus propios objetos, los candidatos del tipo contrario
+        coincidencias = coincidencias_de(self.request.user)
+        objetos = list(ctx["objetos"])
+        for objeto in objetos:
+            objeto.coincidencias = coincidencias.get(objeto.pk, [])
+        ctx["objetos"] = objetos
+        return ctx
 
-class CrearObjetoPerdidoView(LoginRequiredMixin, CreateView):
+class CrearObjetoPerdidoView(LoginRequiredMixin, CondominioRequeridoMixin, CreateView):
     model = ObjetoPerdido
     template_name = "objeto-perdido/crear_objeto.html"
     form_class = ObjetoPerdidoForm
     success_url = reverse_lazy("lista_objetos_perdidos")
 
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        # Las plantillas no pueden acceder a atributos que empiezan con "_"
+        form = ctx["form"]
+        ctx["form_safe"] = {
+            "tipo": form["_tipo"],
+            "titulo": form["_titulo"],
+            "descripcion": form["_descripcion"],
+            "imagen": form["_imagen"],
+        }
+        return ctx
+
     def form_valid(self, form):
         form.instance._usuario = self.request.user
-        messages.success(
-            self.request, 
-            "Objeto reportado exitosamente. Esperamos que lo encuentres pronto."
-        )
-        return super().form_valid(form)
+        if form.instance.es_hallazgo:
+            messages.success(self.request, "Objeto registrado. Gracias por avisar a la comunidad.")
+        else:
+            messages.success(
+                self.request, 
+                "Objeto reportado exitosamente. Esperamos que lo encuentres pronto."
+            )
+        imagen = form.cleaned_data.get("_imagen")
+        if imagen:
+            form.instance._phash = dhash(imagen)
+        response = super().form_valid(form)
+
+        similares = imagenes_similares(self.object)
+        repetidas = [o for o, _ in similares if o.tipo == self.object.tipo]
+        if repetidas:
+            messages.warning(
+                self.request,
+                "Ya hay una foto muy parecida publicada: "
+                + ", ".join(f"{o.titulo} ({o.usuario.username})" for o in repetidas[:3])
+            )
+        nuevas = actualizar_coincidencias(self.object) + agregar_por_imagen(self.object, similares)
+        if nuevas:
+            messages.info(
+                self.request,
+                "Hay posibles coincidencias con tu objeto; revísalas en la lista."
+            )
+        return response
 
 
 # ========================
 # GESTIÓN DE USUARIOS
 # ========================
 
+class ListaUsuariosView(LoginRequiredMixin, SoloAdminMixin, ListView):
+    """Usuarios activos del condominio; desde aquí se llega a eliminar cada uno."""
+    template_name = "crear-usuario/lista_usuarios.html"
+    context_object_name = "usuarios"
+    paginate_by = 20
+
+    def get_queryset(self):
+        return Usuario.objects.del_condominio_actual().filter(is_active=True).order_by("username")
+
+
 class CrearUsuarioView(LoginRequiredMixin, SoloAdminMixin, CreateView):
     model = Usuario
     form_class = CrearUsuarioForm
@@ -488,18 +981,61 @@ class CrearUsuarioView(LoginRequiredMixin, SoloAdminMixin, CreateView):
         return super().form_invalid(form)
 
 
+class EliminarUsuarioView(LoginRequiredMixin, SoloAdminMixin, View):
+    """
+    Desactiva al usuario de inmediato y agenda la purga de su contenido.
+    El borrado se hace en segundo plano por lotes (ver core/purga.py).
+    """
+    template_name = "crear-usuario/eliminar_usuario.html"
+
+    def get(self, request, pk):
+        usuario = get_object_or_404(Usuario.objects.del_condominio_actual(), pk=pk, is_active=True)
+        return render(request, self.template_name, {"usuario_objetivo": usuario})
+
+    def post(self, request, pk):
+        usuario = get_object_or_404(Usuario.objects.del_condominio_actual(), pk=pk, is_active=True)
+        if usuario.pk == request.user.pk:
+            messages.error(request, "No puedes eliminar tu propia cuenta")
+            return redirect("lista_usuarios")
+
+        purga = solicitar_purga(usuario, solicitado_por=request.user)
+        messages.success(
+            request,
+            f"Usuario '{usuario.username}' desactivado. Su contenido se está eliminando."
+        )
+        return redirect("estado_purga", pk=purga.pk)
+
+
+class EstadoPurgaView(LoginRequiredMixin, SoloAdminMixin, DetailView):
+    """Progreso de una purga; con ?formato=json responde solo los contadores."""
+    model = PurgaUsuario
+    template_name = "crear-usuario/estado_purga.html"
+    context_object_name = "purga"
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get("formato") == "json":
+            purga = self.object
+            return JsonResponse({
+                "usuario": purga.username,
+                "estado": purga.estado,
+                "progreso": purga.progreso,
+                "error": purga.error,
+            })
+        return super().render_to_response(context, **response_kwargs)
+
+
 # ========================
 # ÁREAS COMUNES (ADMIN)
 # ========================
 
-class ListaAreasView(LoginRequiredMixin, ListView):
+class ListaAreasView(LoginRequiredMixin, LecturaReplicaMixin, ListView):
     model = AreaComun
     template_name = "areas-comunes/lista_areas.html"
     context_object_name = "areas"
     success_url = reverse_lazy("lista_areas")
 
 
-class CrearAreaView(LoginRequiredMixin, SoloAdminMixin, CreateView):
+class CrearAreaView(LoginRequiredMixin, SoloAdminMixin, CondominioRequeridoMixin, CreateView):
     model = AreaComun
     form_class = AreaComunForm
     template_name = "areas-comunes/crear_area.html"
@@ -510,11 +1046,99 @@ class CrearAreaView(LoginRequiredMixin, SoloAdminMixin, CreateView):
         return super().form_valid(form)
 
 
+# ========================
+# MÉTRICAS
+# ========================
+
+class MetricasView(View):
+    """
+    /metrics en formato de texto de Prometheus (ver core/metricas.py).
+    Lo leen los administradores o el scraper, con settings.METRICAS_TOKEN como
+    bearer token o desde una IP de settings.METRICAS_IPS.
+    """
+    def get(self, request):
+        es_admin = request.user.is_authenticated and request.user.es_administrador()
+        if not (es_admin or self._token_valido(request) or ip_cliente(request) in settings.METRICAS_IPS):
+            raise Http404
+        medidores = [
+            (
+                "vizinho_purgas_pendientes",
+                "Purgas de usuarios en cola o en proceso.",
+                PurgaUsuario._base_manager.filter(_estado__in=["Pendiente", "EnProceso"]).count(),
+            ),
+            (
+                "vizinho_alertas_panico_activas",
+                "Alertas de pánico sin atender.",
+                BotonPanico._base_manager.filter(_activo=True).count(),
+            ),
+        ]
+        return HttpResponse(
+            metricas.exponer(medidores), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    def _token_valido(self, request):
+        if not settings.METRICAS_TOKEN:
+            return False
+        esquema, _, token = request.headers.get("Authorization", "").partition(" ")
+        return esquema.lower() == "bearer" and hmac.compare_digest(
+            token.strip().encode(), settings.METRICAS_TOKEN.encode()
+        )
+
+
+class ConsultasLentasView(LoginRequiredMixin, SoloSuperusuarioMixin, TemplateView):
+    """
+    Consultas lentas agrupadas por huella, ordenadas por tiempo total.
+    El log es de todo el servidor, así que solo lo ven los superusuarios.
+    """
+    template_name = "administrador/consultas_lentas.html"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["consultas"] = ranking_consultas_lentas()
+        ctx["umbral_ms"] = settings.CONSULTAS_LENTAS_MS
+        return ctx
+
+
+class PerfilesView(LoginRequiredMixin, SoloSuperusuarioMixin, TemplateView):
+    """
+    Perfiles de requests guardados por PerfiladorMiddleware. El POST activa o
+    desactiva el perfilado de todas las requests de este superusuario.
+    Los perfiles son de todo el servidor, así que solo los ven los superusuarios.
+    """
+    template_name = "administrador/perfiles.html"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["perfiles"] = perfilador.perfiles()
+        ctx["perfilando"] = bool(self.request.COOKIES.get(PerfiladorMiddleware.COOKIE))
+        return ctx
+
+    def post(self, request):
+        response = redirect("perfiles")
+        if request.COOKIES.get(PerfiladorMiddleware.COOKIE):
+            response.delete_cookie(PerfiladorMiddleware.COOKIE)
+            messages.info(request, "Perfilado desactivado.")
+        else:
+            # Dura poco: perfilar cada request del superusuario tiene costo
+            response.set_cookie(PerfiladorMiddleware.COOKIE, "1", max_age=30 * 60, httponly=True, samesite="Lax")
+            messages.info(request, "Tus requests se perfilarán durante los próximos 30 minutos.")
+        return response
+
+
+class DescargarPerfilView(LoginRequiredMixin, SoloSuperusuarioMixin, View):
+    """Descarga el archivo collapsed de un perfil (flamegraph.pl, speedscope)."""
+    def get(self, request, perfil_id):
+        ruta = perfilador.archivo_collapsed(perfil_id)
+        if ruta is None:
+            raise Http404
+        return FileResponse(ruta.open("rb"), as_attachment=True, filename=ruta.name, content_type="text/plain")
+
+
 # ========================
 # RESERVAS (VECINOS)
 # ========================
 
-class CrearReservaView(LoginRequiredMixin, CreateView):
+class CrearReservaView(LoginRequiredMixin, CondominioRequeridoMixin, CreateView):
     model = ReservaArea
     form_class = ReservaAreaForm
     template_name = "areas-comunes/crear_reserva.html"
@@ -522,5 +1146,25 @@ class CrearReservaView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         form.instance._usuario = self.request.user
+        if form.es_recurrente():
+            return self._crear_serie(form)
         messages.success(self.request, "Reserva registrada correctamente.")
-        return super().form_valid(form)
\ No newline at end of file
+        return super().form_valid(form)
+
+    def _crear_serie(self, form):
+        """Expande la recurrencia, descarta los choques en una consulta y crea el resto en bloque."""
+        plantilla = form.save(commit=False)
+        creadas, conflictos = ReservaArea.objects.crear_serie(plantilla, form.fechas())
+
+        if not creadas:
+            form.add_error(None, "Todas las fechas de la serie chocan con reservas existentes.")
+            return self.form_invalid(form)
+
+        messages.success(self.request, f"Se registraron {len(creadas)} reservas.")
+        if conflictos:
+            messages.warning(
+                self.request,
+                "No se reservaron estas fechas por choque de horario: "
+                + ", ".join(fecha.strftime("%d/%m/%Y") for fecha in conflictos)
+            )
+        return redirect(self.success_url)
\ No newline at end of file
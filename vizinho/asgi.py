@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vizinho.settings')
+# Bajo ASGI los dashboards ejecutan sus consultas en paralelo
+os.environ.setdefault('VIZINHO_DASHBOARD_ASYNC', '1')
 
 application = get_asgi_application()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,11 +42,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricasMiddleware',
+    'core.middleware.ConsultasLentasMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.PerfiladorMiddleware',
+    'core.middleware.CondominioMiddleware',
+    'core.middleware.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,6 +86,125 @@ DATABASES = {
     }
 }
 
+# SQLite en modo producción: WAL permite lectores concurrentes con un escritor,
+# synchronous=NORMAL es seguro con WAL y evita un fsync por commit, y
+# busy_timeout hace que un escritor espere el lock en vez de fallar con
+# "database is locked". Las transacciones de escritura empiezan IMMEDIATE para
+# tomar el lock al inicio (una transacción DEFERRED que intenta escribir
+# después de leer falla sin esperar si otro proceso ya escribe).
+# Se desactiva con VIZINHO_SQLITE_AJUSTES=0 (ver `manage.py benchmark_sqlite`).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,  # negativo = KiB, unos 20 MB por conexión
+    'temp_store': 'MEMORY',
+}
+
+
+def opciones_sqlite(pragmas=SQLITE_PRAGMAS):
+    return {
+        'init_command': ';'.join(f'PRAGMA {k}={v}' for k, v in pragmas.items()),
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': pragmas.get('busy_timeout', 5000) / 1000,
+    }
+
+
+if os.environ.get('VIZINHO_SQLITE_AJUSTES', '1') == '1':
+    DATABASES['default']['OPTIONS'] = opciones_sqlite()
+
+# Réplica de lectura opcional. En local puede ser una copia de db.sqlite3
+# mantenida por `python manage.py sincronizar_replica --cada 5`.
+if os.environ.get('VIZINHO_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['VIZINHO_REPLICA_DB'],
+        # En pruebas la réplica apunta a la misma base que default
+        'TEST': {'MIRROR': 'default'},
+    }
+    if os.environ.get('VIZINHO_SQLITE_AJUSTES', '1') == '1':
+        # La réplica se reemplaza por copia completa: sin WAL para no dejar
+        # archivos -wal/-shm de una copia anterior
+        DATABASES['replica']['OPTIONS'] = opciones_sqlite(
+            {k: v for k, v in SQLITE_PRAGMAS.items() if k != 'journal_mode'}
+        )
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Segundos que un usuario lee de la primaria después de escribir
+REPLICA_VENTANA_PRIMARIA = 5
+
+# Dashboards asíncronos (consultas en paralelo). asgi.py lo activa por defecto;
+# bajo WSGI quedan las vistas síncronas.
+DASHBOARD_ASYNC = os.environ.get('VIZINHO_DASHBOARD_ASYNC', '0') == '1'
+
+# Caché compartida entre workers (feed de publicaciones, etc.).
+# Con VIZINHO_REDIS_URL se usa Redis (requiere el paquete redis); sin ella,
+# una caché en memoria por proceso, suficiente para desarrollo.
+if os.environ.get('VIZINHO_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['VIZINHO_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Publicaciones que guarda el feed cacheado de cada condominio
+FEED_PUBLICACIONES = 20
+
+# Paginación (core/paginacion.py): segundos que vive un conteo cacheado y
+# filas que se cuentan como máximo antes de mostrar el total como estimado.
+# Los conteos solo se cachean con una caché compartida: la invalidación al
+# escribir sube una generación en la caché y, con LocMemCache, los demás
+# workers no la verían y servirían conteos viejos.
+CONTEO_CACHE_COMPARTIDA = bool(os.environ.get('VIZINHO_REDIS_URL'))
+CONTEO_CACHE_SEGUNDOS = 60
+PAGINACION_CONTEO_MAXIMO = 5000
+
+# Límites de frecuencia (core/limites.py). "local" cuenta por proceso; "cache"
+# usa CACHES y, con Redis, comparte la cuenta entre workers.
+LIMITES_ALMACEN = 'cache' if os.environ.get('VIZINHO_REDIS_URL') else 'local'
+LIMITES_ACTIVOS = os.environ.get('VIZINHO_LIMITES', '1') != '0'
+# Usar X-Forwarded-For solo si la app está detrás de un proxy propio. Detrás de
+# un proxy y sin esto, todos los clientes comparten la IP del proxy: el límite de
+# login por IP pasa a ser por (IP, username) y se avisa en el log (ver README).
+LIMITES_PROXY_CONFIABLE = os.environ.get('VIZINHO_PROXY_CONFIABLE') == '1'
+
+# Métricas (core/metricas.py). Con varios workers, cada uno vuelca su registro
+# a METRICAS_DIR y /metrics los suma; sin directorio cada worker informa lo suyo.
+METRICAS_DIR = os.environ.get('VIZINHO_METRICAS_DIR', str(BASE_DIR / 'metricas'))
+METRICAS_VOLCADO_SEGUNDOS = 5
+# Además de los administradores, pueden leer /metrics (Prometheus) las peticiones
+# con "Authorization: Bearer <VIZINHO_METRICAS_TOKEN>" y las IPs de
+# VIZINHO_METRICAS_IPS (separadas por comas; vacío por defecto). Detrás de un
+# proxy local todas las peticiones llegan desde 127.0.0.1: para filtrar por IP
+# hay que activar VIZINHO_PROXY_CONFIABLE=1, o usar el token.
+METRICAS_TOKEN = os.environ.get('VIZINHO_METRICAS_TOKEN', '')
+METRICAS_IPS = [ip.strip() for ip in os.environ.get('VIZINHO_METRICAS_IPS', '').split(',') if ip.strip()]
+
+# Consultas SQL lentas (core/consultas_lentas.py): umbral en milisegundos
+# (VIZINHO_CONSULTAS_LENTAS_MS=off para desactivar) y log JSONL rotativo
+_consultas_lentas = os.environ.get('VIZINHO_CONSULTAS_LENTAS_MS', '200')
+CONSULTAS_LENTAS_MS = None if _consultas_lentas == 'off' else float(_consultas_lentas)
+CONSULTAS_LENTAS_LOG = BASE_DIR / 'logs' / 'consultas_lentas.jsonl'
+CONSULTAS_LENTAS_BYTES = 5 * 1024 * 1024
+
+# Perfilador por muestreo (core/perfilador.py): fracción de requests que se
+# perfilan al azar, además de las marcadas por un administrador
+PERFILADOR_MUESTRA = float(os.environ.get('VIZINHO_PERFILADOR_MUESTRA', '0.001'))
+PERFILADOR_DIR = BASE_DIR / 'logs' / 'perfiles'
+PERFILADOR_MAXIMO = 200
+
+# Pulsaciones del botón de pánico dentro de esta ventana se suman a la alerta activa
+PANICO_VENTANA_SEGUNDOS = 120
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -133,3 +258,23 @@ LOGOUT_REDIRECT_URL = 'login'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Las subidas se guardan por hash de contenido en MEDIA_ROOT/blobs/ (ver
+# core/almacenamiento.py). Esas URLs nunca cambian de contenido: en producción
+# el servidor web puede servir /media/blobs/ con
+# "Cache-Control: public, max-age=31536000, immutable".
+STORAGES = {
+    'default': {
+        'BACKEND': 'core.almacenamiento.AlmacenamientoPorContenido',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Días que un blob sin referencias se conserva antes de que `limpiar_media` lo borre
+MEDIA_GRACIA_DIAS = 1
+
+# Proyecciones de eventos (core/eventos.py): solo se aplican eventos con esta
+# antigüedad, para no saltar ids de transacciones que aún no se confirmaron
+EVENTOS_MARGEN_SEGUNDOS = 5
@@ -19,6 +19,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.almacenamiento import servir_blob
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("", include("core.urls")),
@@ -26,4 +28,4 @@ urlpatterns = [
 
 # si se esta en el modo de desarrollo, servir archivos estaticos
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT) 
\ No newline at end of file
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT, view=servir_blob) 
\ No newline at end of file